@@ -3,6 +3,7 @@ Talyn decision: Finite Markov Decision Process representation.
 """
 from typing import Dict, Tuple, List, Any
 import random
+from ..distributions.alias import AliasTable
 
 State = Any
 Action = Any
@@ -29,18 +30,16 @@ class MDP:
         self.gamma = gamma
         self.states = sorted({s for s, _ in transitions.keys()} | {s for lst in transitions.values() for s, _ in lst})
         self.actions = {s: sorted({a for (s0,a) in transitions if s0==s}) for s in self.states}
+        # Alias tables per (s,a), built on first use: O(|S'|) once, then O(1) per draw.
+        self._samplers: Dict[Tuple[State, Action], AliasTable] = {}
 
     def next_state_reward(self, state: State, action: Action) -> Tuple[State, float]:
         """Sample next state and reward given current state and action."""
         probs = self.P[(state, action)]
-        r = random.random()
-        cumulative = 0.0
-        for s_prime, p in probs:
-            cumulative += p
-            if r <= cumulative:
-                reward = self.R.get((state, action, s_prime), 0.0)
-                return s_prime, reward
-        # fallback last
-        s_prime, _ = probs[-1]
+        sampler = self._samplers.get((state, action))
+        if sampler is None:
+            sampler = AliasTable([p for _, p in probs], rng_func=random.random)
+            self._samplers[(state, action)] = sampler
+        s_prime, _ = probs[sampler.sample()]
         reward = self.R.get((state, action, s_prime), 0.0)
         return s_prime, reward
@@ -8,26 +8,17 @@ def crp(alpha: float, n_customers: int) -> List[int]:
     """
     Chinese Restaurant Process seating for n_customers.
     Returns list of table assignments (0-indexed).
+    Customer i joins table t with probability count_t / (alpha + i), which is
+    the same as copying the table of a uniformly chosen earlier customer, so
+    each seating costs O(1) instead of a scan over all tables.
     """
     assignments: List[int] = []
-    tables: List[int] = []  # counts per table
+    n_tables = 0
     for i in range(n_customers):
-        if i == 0:
-            assignments.append(0)
-            tables.append(1)
+        u = random.random() * (alpha + i)
+        if u < i:
+            assignments.append(assignments[int(u)])
         else:
-            total = alpha + i
-            probs = [count / total for count in tables] + [alpha / total]
-            r = random.random()
-            cum = 0.0
-            for idx, p in enumerate(probs):
-                cum += p
-                if r < cum:
-                    if idx < len(tables):
-                        assignments.append(idx)
-                        tables[idx] += 1
-                    else:
-                        assignments.append(idx)
-                        tables.append(1)
-                    break
+            assignments.append(n_tables)
+            n_tables += 1
     return assignments
@@ -3,7 +3,20 @@ Talyn distributions: discrete and continuous distribution classes.
 """
 import math
 import random
+from array import array
 from typing import Optional, Iterable, List, Set
+from talyn.distributions.binomial import Binomial as _BinomialSampler
+from talyn.distributions.poisson import Poisson as _PoissonSampler
+from talyn.distributions.batch import pointwise, uniform_block
+from talyn.distributions.ziggurat import (
+    ziggurat_exponential, ziggurat_exponential_block, ziggurat_normal,
+    ziggurat_normal_block,
+)
+from talyn.distributions.special import (
+    check_probability, discrete_quantile, log_comb, log_factorial, log_ndtr,
+    ndtri, xlogy, xlog1py,
+)
+
 
 class Bernoulli:
     """
@@ -15,9 +28,15 @@ class Bernoulli:
         self.p = p
         self.rng = rng_func or random.random
 
-    def sample(self) -> int:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
         return 1 if self.rng() < self.p else 0
 
+    def sample_n(self, n: int) -> array:
+        p = self.p
+        return array('q', [1 if u < p else 0 for u in uniform_block(self.rng, n)])
+
     def pmf(self, k: int) -> float:
         if k == 1:
             return self.p
@@ -27,6 +46,15 @@ class Bernoulli:
 
     prob = pmf
 
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        if k == 1:
+            return xlogy(1, self.p)
+        if k == 0:
+            return xlog1py(1, -self.p)
+        return -math.inf
+
+    @pointwise
     def cdf(self, k: int) -> float:
         if k < 0:
             return 0.0
@@ -34,6 +62,20 @@ class Bernoulli:
             return 1 - self.p
         return 1.0
 
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        if k < 0:
+            return -math.inf
+        if k < 1:
+            return xlog1py(1, -self.p)
+        return 0.0
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        return 0 if check_probability(q) <= 1 - self.p else 1
+
+    quantile = ppf
+
 class Binomial:
     """
     Binomial(n, p) distribution.
@@ -46,13 +88,14 @@ class Binomial:
         self.n = n
         self.p = p
         self.rng = rng_func or random.random
+        # Inversion for small n*p, BTPE otherwise: O(1) expected per draw.
+        self._sampler = _BinomialSampler(n, p, rng_func=self.rng)
 
-    def sample(self) -> int:
-        count = 0
-        for _ in range(self.n):
-            if self.rng() < self.p:
-                count += 1
-        return count
+    def sample(self, size: Optional[int] = None):
+        return self._sampler.sample(size)
+
+    def sample_n(self, n: int) -> array:
+        return self._sampler.sample_n(n)
 
     def pmf(self, k: int) -> float:
         if k < 0 or k > self.n:
@@ -62,11 +105,23 @@ class Binomial:
 
     prob = pmf
 
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        if k < 0 or k > self.n:
+            return -math.inf
+        return log_comb(self.n, k) + xlogy(k, self.p) + xlog1py(self.n - k, -self.p)
+
     def cdf(self, k: int) -> float:
-        total = 0.0
-        for i in range(0, k + 1):
-            total += self.pmf(i)
-        return total
+        # Regularized incomplete beta: O(1) in k.
+        return self._sampler.cdf(k)
+
+    def log_cdf(self, k: int) -> float:
+        return self._sampler.log_cdf(k)
+
+    def ppf(self, q: float) -> int:
+        return self._sampler.ppf(q)
+
+    quantile = ppf
 
 class DiscreteUniform:
     """
@@ -78,14 +133,25 @@ class DiscreteUniform:
         self.n = n
         self.rng = rng_func or random.random
 
-    def sample(self) -> int:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
         return int(self.rng() * self.n) + 1
 
+    def sample_n(self, n: int) -> array:
+        m = self.n
+        return array('q', [int(u * m) + 1 for u in uniform_block(self.rng, n)])
+
     def pmf(self, k: int) -> float:
         return 1.0 / self.n if 1 <= k <= self.n else 0.0
 
     prob = pmf
 
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        return -math.log(self.n) if 1 <= k <= self.n else -math.inf
+
+    @pointwise
     def cdf(self, k: int) -> float:
         if k < 1:
             return 0.0
@@ -93,6 +159,20 @@ class DiscreteUniform:
             return 1.0
         return k / self.n
 
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        if k < 1:
+            return -math.inf
+        if k >= self.n:
+            return 0.0
+        return math.log(math.floor(k) / self.n)
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        return min(max(math.ceil(check_probability(q) * self.n), 1), self.n)
+
+    quantile = ppf
+
 class Geometric:
     """
     Geometric(p) distribution: trials until first success (support 1,2,...).
@@ -103,13 +183,22 @@ class Geometric:
         self.p = p
         self.rng = rng_func or random.random
 
-    def sample(self) -> int:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
         count = 1
         while True:
             if self.rng() < self.p:
                 return count
             count += 1
 
+    def sample_n(self, n: int) -> array:
+        block = uniform_block(self.rng, n)
+        if self.p >= 1.0:
+            return array('q', [1] * len(block))
+        log, scale = math.log, 1.0 / math.log(1 - self.p)
+        return array('q', [1 + int(log(1 - u) * scale) for u in block])
+
     def pmf(self, k: int) -> float:
         if k < 1:
             return 0.0
@@ -117,11 +206,35 @@ class Geometric:
 
     prob = pmf
 
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        if k < 1:
+            return -math.inf
+        return xlog1py(k - 1, -self.p) + math.log(self.p)
+
+    @pointwise
     def cdf(self, k: int) -> float:
         if k < 1:
             return 0.0
         return 1 - (1 - self.p) ** k
 
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        if k < 1:
+            return -math.inf
+        tail = xlog1py(math.floor(k), -self.p)
+        return math.log(-math.expm1(tail)) if tail < 0 else -math.inf
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        check_probability(q)
+        if self.p >= 1.0:
+            return 1
+        guess = math.log1p(-q) / math.log1p(-self.p) if q < 1.0 else math.inf
+        return discrete_quantile(self.cdf, q, guess, lower=1)
+
+    quantile = ppf
+
 class Poisson:
     """
     Poisson(lambda) distribution.
@@ -131,15 +244,14 @@ class Poisson:
             raise ValueError("lambda must be non-negative")
         self.lam = lam
         self.rng = rng_func or random.random
+        # Knuth/inversion for small lambda, PTRS otherwise: O(1) expected per draw.
+        self._sampler = _PoissonSampler(lam, rng_func=self.rng)
 
-    def sample(self) -> int:
-        L = math.exp(-self.lam)
-        k = 0
-        p = 1.0
-        while p > L:
-            p *= self.rng()
-            k += 1
-        return k - 1
+    def sample(self, size: Optional[int] = None):
+        return self._sampler.sample(size)
+
+    def sample_n(self, n: int) -> array:
+        return self._sampler.sample_n(n)
 
     def pmf(self, k: int) -> float:
         if k < 0:
@@ -148,34 +260,76 @@ class Poisson:
 
     prob = pmf
 
-    def cdf(self, k: int) -> float:
+    @pointwise
+    def log_pmf(self, k: int) -> float:
         if k < 0:
-            return 0.0
-        total = 0.0
-        for i in range(0, k + 1):
-            total += self.pmf(i)
-        return total
+            return -math.inf
+        return xlogy(k, self.lam) - self.lam - log_factorial(k)
+
+    def cdf(self, k: int) -> float:
+        # Regularized upper incomplete gamma: O(1) in k.
+        return self._sampler.cdf(k)
+
+    def log_cdf(self, k: int) -> float:
+        return self._sampler.log_cdf(k)
+
+    def ppf(self, q: float) -> int:
+        return self._sampler.ppf(q)
+
+    quantile = ppf
 
 class Exponential:
     """
     Exponential(lambda) continuous distribution.
+    method: "inversion" (default) or "ziggurat".
     """
-    def __init__(self, lam: float, rng_func: Optional[callable] = None):
+    def __init__(self, lam: float, rng_func: Optional[callable] = None, method: str = "inversion"):
         if lam <= 0:
             raise ValueError("lambda must be positive")
+        if method not in ("inversion", "ziggurat"):
+            raise ValueError("method must be 'inversion' or 'ziggurat'")
         self.lam = lam
         self.rng = rng_func or random.random
+        self.method = method
 
-    def sample(self) -> float:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
+        if self.method == "ziggurat":
+            return ziggurat_exponential(self.rng) / self.lam
         u = self.rng()
         return -math.log(1 - u) / self.lam
 
+    def sample_n(self, n: int) -> array:
+        if self.method == "ziggurat":
+            scale = 1.0 / self.lam
+            return array('d', [scale * e for e in ziggurat_exponential_block(self.rng, n)])
+        log, scale = math.log, -1.0 / self.lam
+        return array('d', [scale * log(1 - u) for u in uniform_block(self.rng, n)])
+
     def pdf(self, x: float) -> float:
         return self.lam * math.exp(-self.lam * x) if x >= 0 else 0.0
 
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        return math.log(self.lam) - self.lam * x if x >= 0 else -math.inf
+
+    @pointwise
     def cdf(self, x: float) -> float:
         return 1 - math.exp(-self.lam * x) if x >= 0 else 0.0
 
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        return math.log(-math.expm1(-self.lam * x)) if x > 0 else -math.inf
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        if check_probability(q) >= 1.0:
+            return math.inf
+        return -math.log1p(-q) / self.lam if q > 0.0 else 0.0
+
+    quantile = ppf
+
 class ContinuousUniform:
     """
     Continuous uniform distribution on [a, b].
@@ -187,12 +341,23 @@ class ContinuousUniform:
         self.b = b
         self.rng = rng_func or random.random
 
-    def sample(self) -> float:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
         return self.a + (self.b - self.a) * self.rng()
 
+    def sample_n(self, n: int) -> array:
+        a, w = self.a, self.b - self.a
+        return array('d', [a + w * u for u in uniform_block(self.rng, n)])
+
     def pdf(self, x: float) -> float:
         return 1.0 / (self.b - self.a) if self.a <= x <= self.b else 0.0
 
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        return -math.log(self.b - self.a) if self.a <= x <= self.b else -math.inf
+
+    @pointwise
     def cdf(self, x: float) -> float:
         if x < self.a:
             return 0.0
@@ -200,15 +365,37 @@ class ContinuousUniform:
             return 1.0
         return (x - self.a) / (self.b - self.a)
 
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        if x <= self.a:
+            return -math.inf
+        if x >= self.b:
+            return 0.0
+        return math.log((x - self.a) / (self.b - self.a))
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        return self.a + check_probability(q) * (self.b - self.a)
+
+    quantile = ppf
+
 class Normal:
     """
-    Standard normal distribution via Box-Muller.
+    Standard normal distribution via the ziggurat (default) or Box-Muller.
+    method: "ziggurat" or "box_muller".
     """
-    def __init__(self, rng_func: Optional[callable] = None):
+    def __init__(self, rng_func: Optional[callable] = None, method: str = "ziggurat"):
+        if method not in ("ziggurat", "box_muller"):
+            raise ValueError("method must be 'ziggurat' or 'box_muller'")
         self.rng = rng_func or random.random
+        self.method = method
         self._cache: Optional[float] = None
 
-    def sample(self) -> float:
+    def sample(self, size: Optional[int] = None):
+        if size is not None:
+            return self.sample_n(size)
+        if self.method == "ziggurat":
+            return ziggurat_normal(self.rng)
         if self._cache is not None:
             z = self._cache
             self._cache = None
@@ -222,8 +409,41 @@ class Normal:
         self._cache = z1
         return z0
 
+    def sample_n(self, n: int) -> array:
+        """
+        Draw n samples with the ziggurat, or Box-Muller using both outputs of every uniform pair.
+        """
+        if self.method == "ziggurat":
+            return ziggurat_normal_block(self.rng, n)
+        block = uniform_block(self.rng, n + (n & 1))
+        log, sqrt, cos, sin, tau = math.log, math.sqrt, math.cos, math.sin, 2 * math.pi
+        out = array('d', bytes(8 * len(block)))
+        for i in range(0, len(block), 2):
+            r = sqrt(-2 * log(1 - block[i]))
+            theta = tau * block[i + 1]
+            out[i] = r * cos(theta)
+            out[i + 1] = r * sin(theta)
+        if n & 1:
+            out.pop()
+        return out
+
     def pdf(self, x: float) -> float:
         return (1.0 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * x * x)
 
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        return -0.5 * x * x - 0.5 * math.log(2 * math.pi)
+
+    @pointwise
     def cdf(self, x: float) -> float:
         return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        return log_ndtr(x)
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        return ndtri(check_probability(q))
+
+    quantile = ppf
@@ -9,8 +9,9 @@ from .poisson import Poisson
 from .exponential import Exponential
 from .continuous_uniform import ContinuousUniform
 from .normal import Normal
+from .alias import AliasTable
 
 __all__ = [
     "Bernoulli", "Binomial", "DiscreteUniform", "Geometric", "Poisson",
-    "Exponential", "ContinuousUniform", "Normal",
+    "Exponential", "ContinuousUniform", "Normal", "AliasTable",
 ]
@@ -0,0 +1,81 @@
+"""
+Walker/Vose alias table for categorical sampling in O(1) per draw.
+"""
+import math
+import random
+from array import array
+from typing import Callable, Optional, Sequence
+from .batch import check_size, uniform_block
+
+
+class AliasTable:
+    """
+    Categorical distribution over indices 0..n-1 with probabilities
+    proportional to `weights`, prepared once in O(n) with Vose's method.
+    Each draw then costs a single uniform and one table lookup.
+    Args:
+        weights: Sequence[float], non-negative weights (not necessarily normalized)
+        rng_func: Optional[Callable[[], float]], RNG function returning float in [0,1) (default: random.random)
+    Raises:
+        ValueError: if weights is empty, has a negative entry or sums to zero
+    """
+    def __init__(self, weights: Sequence[float], rng_func: Optional[Callable[[], float]] = None):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("weights must be non-empty")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative")
+        total = math.fsum(weights)
+        if total <= 0:
+            raise ValueError("Sum of weights must be positive")
+        self.n = n
+        self.probs = array('d', [w / total for w in weights])
+        self.rng = rng_func or random.random
+
+        scaled = [p * n for p in self.probs]
+        prob = array('d', [1.0] * n)
+        alias = array('q', range(n))
+        small = [i for i, s in enumerate(scaled) if s < 1.0]
+        large = [i for i, s in enumerate(scaled) if s >= 1.0]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            prob[lo] = scaled[lo]
+            alias[lo] = hi
+            scaled[hi] = (scaled[hi] + scaled[lo]) - 1.0
+            if scaled[hi] < 1.0:
+                small.append(hi)
+            else:
+                large.append(hi)
+        # Leftovers are 1 up to rounding error and keep prob 1 with no alias.
+        self._prob = prob
+        self._alias = alias
+
+    def pmf(self, i: int) -> float:
+        """Probability of index i."""
+        return self.probs[i] if 0 <= i < self.n else 0.0
+
+    def sample(self, size: Optional[int] = None):
+        """Draw one index in O(1), or an array of `size` indices."""
+        if size is not None:
+            return self.sample_n(size)
+        n = self.n
+        u = self.rng() * n
+        i = int(u)
+        if i >= n:
+            i = n - 1
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def sample_n(self, k: int) -> array:
+        """Draw k indices from one block of uniforms."""
+        n, prob, alias = self.n, self._prob, self._alias
+        out = array('q', bytes(8 * check_size(k)))
+        j = 0
+        for u in uniform_block(self.rng, k):
+            u *= n
+            i = int(u)
+            if i >= n:
+                i = n - 1
+            out[j] = i if u - i < prob[i] else alias[i]
+            j += 1
+        return out
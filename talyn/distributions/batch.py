@@ -0,0 +1,54 @@
+"""
+Batched sampling and evaluation helpers shared by the Talyn distribution classes.
+"""
+import functools
+from array import array
+from itertools import repeat, starmap
+from numbers import Number
+from typing import Callable
+
+
+def check_size(size: int) -> int:
+    """
+    Validate a batch size and return it as an int.
+    Raises:
+        ValueError: if size is negative
+    """
+    n = int(size)
+    if n < 0:
+        raise ValueError("size must be non-negative")
+    return n
+
+
+def uniform_block(rng: Callable[[], float], n: int) -> array:
+    """
+    Draw n uniforms in [0,1) from rng as one contiguous array('d') block.
+    When rng is the bound `random` method of a generator that offers
+    `random_block` (the Talyn LCG and XORShift32), the block is filled in one call.
+    Args:
+        rng: Callable[[], float], RNG function returning float in [0,1)
+        n: int, number of uniforms
+    Returns:
+        array('d'): n uniforms
+    Raises:
+        ValueError: if n is negative
+    """
+    n = check_size(n)
+    block = getattr(getattr(rng, '__self__', None), 'random_block', None)
+    if block is not None and getattr(rng, '__name__', None) == 'random':
+        return block(n)
+    return array('d', list(starmap(rng, repeat((), n))))
+
+
+def pointwise(method: Callable) -> Callable:
+    """
+    Let a scalar density method also accept an iterable of points.
+    A scalar argument returns a float; an iterable returns an array('d')
+    with one value per point, so a dataset is evaluated in a single call.
+    """
+    @functools.wraps(method)
+    def wrapper(self, x):
+        if isinstance(x, Number):
+            return method(self, x)
+        return array('d', [method(self, xi) for xi in x])
+    return wrapper
@@ -2,6 +2,10 @@
 Bernoulli distribution module.
 """
 import random
+import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability, xlogy, xlog1py
 
 class Bernoulli:
     """
@@ -13,9 +17,16 @@ class Bernoulli:
         self.p = p
         self.rng = rng_func or random.random
 
-    def sample(self) -> int:
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
         return 1 if self.rng() < self.p else 0
 
+    def sample_n(self, n: int) -> array:
+        """Draw n samples at once by thresholding a block of uniforms."""
+        p = self.p
+        return array('q', [1 if u < p else 0 for u in uniform_block(self.rng, check_size(n))])
+
     def pmf(self, k: int) -> float:
         if k == 1:
             return self.p
@@ -25,9 +36,33 @@ class Bernoulli:
 
     prob = pmf
 
+    @pointwise
     def cdf(self, k: int) -> float:
         if k < 0:
             return 0.0
         if k < 1:
             return 1 - self.p
         return 1.0
+
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        if k == 1:
+            return xlogy(1, self.p)
+        if k == 0:
+            return xlog1py(1, -self.p)
+        return -math.inf
+
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        if k < 0:
+            return -math.inf
+        if k < 1:
+            return xlog1py(1, -self.p)
+        return 0.0
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        """Smallest k in {0,1} with cdf(k) >= q."""
+        return 0 if check_probability(q) <= 1 - self.p else 1
+
+    quantile = ppf
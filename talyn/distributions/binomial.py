@@ -1,16 +1,61 @@
 """
 Binomial distribution for Talyn.
+
+Sampling cost does not depend on n: small n*min(p, 1-p) uses inversion by
+sequential search from 0, larger values use the BTPE rejection algorithm
+(Kachitvichyanukul & Schmeiser, 1988).
 """
 import random
+import math
+import sys
+from array import array
 from math import comb
+from .batch import check_size, pointwise
+from .special import (
+    betainc, check_probability, discrete_quantile, log_comb, log_sum_exp, ndtri,
+    xlogy, xlog1py,
+)
+
+# Means n*min(p, 1-p) at or below this use inversion, above it BTPE.
+INVERSION_MEAN_THRESHOLD = 30.0
+
 
 class Binomial:
     """
     Binomial(n, p): number of successes in n Bernoulli(p) trials.
     """
-    def __init__(self, n: int, p: float):
+    def __init__(self, n: int, p: float, rng_func=None):
         self.n = n
         self.p = p
+        self.rng = rng_func or random.random
+        self._setup()
+
+    def _setup(self) -> None:
+        """Precompute the constants of the inversion or BTPE sampler for (n, p)."""
+        n = self.n
+        r = min(self.p, 1.0 - self.p)
+        q = 1.0 - r
+        self._r = r
+        self._use_btpe = n * r > INVERSION_MEAN_THRESHOLD
+        if not self._use_btpe:
+            self._qn = math.exp(n * math.log(q)) if q > 0.0 else 0.0
+            self._bound = min(n, n * r + 10.0 * math.sqrt(n * r * q + 1))
+            return
+        fm = n * r + r
+        m = int(math.floor(fm))
+        p1 = math.floor(2.195 * math.sqrt(n * r * q) - 4.6 * q) + 0.5
+        xm = m + 0.5
+        xl = xm - p1
+        xr = xm + p1
+        c = 0.134 + 20.5 / (15.3 + m)
+        a = (fm - xl) / (fm - xl * r)
+        laml = a * (1.0 + a / 2.0)
+        a = (xr - fm) / (xr * q)
+        lamr = a * (1.0 + a / 2.0)
+        p2 = p1 * (1.0 + 2.0 * c)
+        p3 = p2 + c / laml
+        p4 = p3 + c / lamr
+        self._btpe = (q, m, p1, xm, xl, xr, c, laml, lamr, p2, p3, p4, n * r * q)
 
     def pmf(self, k: int) -> float:
         """Probability of k successes."""
@@ -18,7 +63,156 @@ class Binomial:
             return 0.0
         return comb(self.n, k) * (self.p ** k) * ((1 - self.p) ** (self.n - k))
 
-    def sample(self) -> int:
-        """Draw a sample from Binomial(n, p)."""
-        return sum(1 if random.random() < self.p else 0 for _ in range(self.n))
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        """Log-probability of k successes, stable for large n and k."""
+        if not (0 <= k <= self.n):
+            return -math.inf
+        return log_comb(self.n, k) + xlogy(k, self.p) + xlog1py(self.n - k, -self.p)
+
+    @pointwise
+    def cdf(self, k: int) -> float:
+        """P(X <= k) = I_{1-p}(n - k, k + 1), O(1) in k via the incomplete beta function."""
+        if k < 0:
+            return 0.0
+        if k >= self.n:
+            return 1.0
+        k = math.floor(k)
+        return betainc(self.n - k, k + 1, 1.0 - self.p)
+
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        """Log-probability of at most k successes."""
+        c = self.cdf(k)
+        if c > sys.float_info.min or k < 0:
+            return math.log(c) if c > 0.0 else -math.inf
+        # Underflowed far lower tail: sum the few dominant terms in log space.
+        return log_sum_exp(self.log_pmf(i) for i in range(int(k) + 1))
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        """Smallest k with cdf(k) >= q, by guided search from the normal approximation."""
+        check_probability(q)
+        mean = self.n * self.p
+        sd = math.sqrt(mean * (1 - self.p))
+        return discrete_quantile(self.cdf, q, mean + sd * ndtri(q), 0, self.n)
+
+    quantile = ppf
+
+    def sample(self, size=None):
+        """Draw a sample from Binomial(n, p), or an array of `size` samples."""
+        if size is not None:
+            return self.sample_n(size)
+        y = self._sample_btpe() if self._use_btpe else self._sample_inversion()
+        return self.n - y if self.p > 0.5 else y
+
+    def sample_n(self, n: int) -> array:
+        """Draw n samples; each draw costs O(1) expected uniforms regardless of self.n."""
+        draw = self._sample_btpe if self._use_btpe else self._sample_inversion
+        out = array('q', [draw() for _ in range(check_size(n))])
+        if self.p > 0.5:
+            trials = self.n
+            for i in range(len(out)):
+                out[i] = trials - out[i]
+        return out
+
+    def _sample_inversion(self) -> int:
+        """Inversion by sequential search for Binomial(n, r), r <= 0.5."""
+        n, r = self.n, self._r
+        q = 1.0 - r
+        qn, bound = self._qn, self._bound
+        x = 0
+        px = qn
+        u = self.rng()
+        while u > px:
+            x += 1
+            if x > bound:
+                x = 0
+                px = qn
+                u = self.rng()
+            else:
+                u -= px
+                px = ((n - x + 1) * r * px) / (x * q)
+        return x
+
+    def _sample_btpe(self) -> int:
+        """BTPE triangle/parallelogram/exponential rejection for Binomial(n, r), r <= 0.5."""
+        n, r, rng = self.n, self._r, self.rng
+        q, m, p1, xm, xl, xr, c, laml, lamr, p2, p3, p4, nrq = self._btpe
+        log = math.log
+        while True:
+            u = rng() * p4
+            v = rng()
+            if u <= p1:
+                # Triangular region: accept immediately.
+                return int(math.floor(xm - p1 * v + u))
+            if u <= p2:
+                x = xl + (u - p1) / c
+                v = v * c + 1.0 - abs(m - x + 0.5) / p1
+                if v > 1.0:
+                    continue
+                y = int(math.floor(x))
+            elif u <= p3:
+                if v == 0.0:
+                    continue
+                y = int(math.floor(xl + log(v) / laml))
+                if y < 0:
+                    continue
+                v = v * (u - p2) * laml
+            else:
+                if v == 0.0:
+                    continue
+                y = int(math.floor(xr - log(v) / lamr))
+                if y > n:
+                    continue
+                v = v * (u - p3) * lamr
+
+            k = abs(y - m)
+            if k <= 20 or k >= nrq / 2.0 - 1:
+                # Explicit evaluation of f(y)/f(m) by recursion.
+                s = r / q
+                a = s * (n + 1)
+                f = 1.0
+                if m < y:
+                    for i in range(m + 1, y + 1):
+                        f *= a / i - s
+                elif m > y:
+                    for i in range(y + 1, m + 1):
+                        f /= a / i - s
+                if v <= f:
+                    return y
+                continue
+
+            # Squeeze on log(f(y)/f(m)), then the Stirling-corrected final test.
+            rho = (k / nrq) * ((k * (k / 3.0 + 0.625) + 0.16666666666666666) / nrq + 0.5)
+            t = -k * k / (2 * nrq)
+            big_a = log(v) if v > 0.0 else -math.inf
+            if big_a < t - rho:
+                return y
+            if big_a > t + rho:
+                continue
+            if big_a <= _btpe_log_ratio(n, r, m, y):
+                return y
+
+
+def _btpe_log_ratio(n: int, r: float, m: int, y: int) -> float:
+    """
+    log(f(y) / f(m)) for the Binomial(n, r) pmf f, by Stirling's formula with
+    series corrections: those of m! and (n - m)! (numerator) are added, those
+    of y! and (n - y)! (denominator) subtracted.
+    """
+    q = 1.0 - r
+    x1 = y + 1
+    f1 = m + 1
+    z = n + 1 - m
+    w = n - y + 1
+    return ((m + 0.5) * math.log(f1 / x1) + (n - m + 0.5) * math.log(z / w)
+            + (y - m) * math.log(w * r / (x1 * q))
+            + _stirling_tail(f1) + _stirling_tail(z)
+            - _stirling_tail(x1) - _stirling_tail(w))
+
 
+def _stirling_tail(x: float) -> float:
+    """Series correction term of Stirling's formula used by the BTPE final test."""
+    x2 = x * x
+    return (13860. - (462. - (132. - (99. - 140. / x2) / x2) / x2) / x2) / x / 166320.
@@ -2,20 +2,59 @@
 Continuous Uniform distribution for Talyn.
 """
 import random
+import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability
 
 class ContinuousUniform:
     """
     ContinuousUniform(a, b): Uniform distribution on [a, b]
     """
-    def __init__(self, a: float, b: float):
+    def __init__(self, a: float, b: float, rng_func=None):
         self.a = a
         self.b = b
+        self.rng = rng_func or random.random
 
     def pdf(self, x: float) -> float:
         if self.a <= x <= self.b:
             return 1.0 / (self.b - self.a)
         return 0.0
 
-    def sample(self) -> float:
-        return random.uniform(self.a, self.b)
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        if self.a <= x <= self.b:
+            return -math.log(self.b - self.a)
+        return -math.inf
+
+    @pointwise
+    def cdf(self, x: float) -> float:
+        if x <= self.a:
+            return 0.0
+        if x >= self.b:
+            return 1.0
+        return (x - self.a) / (self.b - self.a)
+
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        if x <= self.a:
+            return -math.inf
+        if x >= self.b:
+            return 0.0
+        return math.log((x - self.a) / (self.b - self.a))
+
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
+        return self.a + (self.b - self.a) * self.rng()
+
+    def sample_n(self, n: int) -> array:
+        """Draw n samples by an affine map of a block of uniforms."""
+        a, w = self.a, self.b - self.a
+        return array('d', [a + w * u for u in uniform_block(self.rng, check_size(n))])
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        return self.a + check_probability(q) * (self.b - self.a)
 
+    quantile = ppf
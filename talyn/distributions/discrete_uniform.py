@@ -2,20 +2,61 @@
 DiscreteUniform distribution for Talyn.
 """
 import random
+import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability
 
 class DiscreteUniform:
     """
     DiscreteUniform(a, b): Uniform integer in [a, b] inclusive.
     """
-    def __init__(self, a: int, b: int):
+    def __init__(self, a: int, b: int, rng_func=None):
         self.a = a
         self.b = b
+        self.rng = rng_func or random.random
 
     def pmf(self, x: int) -> float:
         if self.a <= x <= self.b:
             return 1 / (self.b - self.a + 1)
         return 0.0
 
-    def sample(self) -> int:
-        return random.randint(self.a, self.b)
+    @pointwise
+    def log_pmf(self, x: int) -> float:
+        if self.a <= x <= self.b:
+            return -math.log(self.b - self.a + 1)
+        return -math.inf
+
+    @pointwise
+    def cdf(self, x: int) -> float:
+        if x < self.a:
+            return 0.0
+        if x >= self.b:
+            return 1.0
+        return (math.floor(x) - self.a + 1) / (self.b - self.a + 1)
+
+    @pointwise
+    def log_cdf(self, x: int) -> float:
+        if x < self.a:
+            return -math.inf
+        if x >= self.b:
+            return 0.0
+        return math.log((math.floor(x) - self.a + 1) / (self.b - self.a + 1))
+
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
+        return self.a + int(self.rng() * (self.b - self.a + 1))
+
+    def sample_n(self, n: int) -> array:
+        """Draw n samples by scaling and truncating a block of uniforms."""
+        a, width = self.a, self.b - self.a + 1
+        return array('q', [a + int(u * width) for u in uniform_block(self.rng, check_size(n))])
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        """Smallest x in [a, b] with cdf(x) >= q."""
+        check_probability(q)
+        return min(max(self.a + math.ceil(q * (self.b - self.a + 1)) - 1, self.a), self.b)
 
+    quantile = ppf
@@ -3,20 +3,69 @@ Exponential distribution for Talyn.
 """
 import random
 import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability
+from .ziggurat import ziggurat_exponential, ziggurat_exponential_block
+
+# Sampling methods: "inversion" (default, one log per draw) or "ziggurat".
+EXPONENTIAL_METHODS = ("inversion", "ziggurat")
 
 class Exponential:
     """
     Exponential(lam): waiting time between Poisson events, lam > 0.
     """
-    def __init__(self, lam: float):
+    def __init__(self, lam: float, rng_func=None, method: str = "inversion"):
+        if method not in EXPONENTIAL_METHODS:
+            raise ValueError(f"method must be one of {EXPONENTIAL_METHODS}")
         self.lam = lam
+        self.rng = rng_func or random.random
+        self.method = method
 
     def pdf(self, x: float) -> float:
         if x < 0:
             return 0.0
         return self.lam * math.exp(-self.lam * x)
 
-    def sample(self) -> float:
-        u = random.random()
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        if x < 0:
+            return -math.inf
+        return math.log(self.lam) - self.lam * x
+
+    @pointwise
+    def cdf(self, x: float) -> float:
+        if x <= 0:
+            return 0.0
+        return -math.expm1(-self.lam * x)
+
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        if x <= 0:
+            return -math.inf
+        return math.log(-math.expm1(-self.lam * x))
+
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
+        if self.method == "ziggurat":
+            return ziggurat_exponential(self.rng) / self.lam
+        u = self.rng()
         return -math.log(1-u) / self.lam
 
+    def sample_n(self, n: int) -> array:
+        """Draw n samples by inversion of a block of uniforms, or with the ziggurat."""
+        n = check_size(n)
+        if self.method == "ziggurat":
+            scale = 1.0 / self.lam
+            return array('d', [scale * e for e in ziggurat_exponential_block(self.rng, n)])
+        log, scale = math.log, -1.0 / self.lam
+        return array('d', [scale * log(1 - u) for u in uniform_block(self.rng, n)])
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        if check_probability(q) >= 1.0:
+            return math.inf
+        return -math.log1p(-q) / self.lam if q > 0.0 else 0.0
+
+    quantile = ppf
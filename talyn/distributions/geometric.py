@@ -3,21 +3,64 @@ Geometric distribution for Talyn.
 """
 import random
 import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability, discrete_quantile, xlog1py
 
 class Geometric:
     """
     Geometric(p): number of failures before first success (support: 0,1,2,...)
     """
-    def __init__(self, p: float):
+    def __init__(self, p: float, rng_func=None):
         self.p = p
+        self.rng = rng_func or random.random
 
     def pmf(self, k: int) -> float:
         if k < 0:
             return 0.0
         return (1 - self.p) ** k * self.p
 
-    def sample(self) -> int:
-        """Draw a sample from Geometric(p)."""
-        u = random.random()
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        if k < 0:
+            return -math.inf
+        return xlog1py(k, -self.p) + math.log(self.p)
+
+    @pointwise
+    def cdf(self, k: int) -> float:
+        if k < 0:
+            return 0.0
+        return -math.expm1(xlog1py(math.floor(k) + 1, -self.p))
+
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        if k < 0:
+            return -math.inf
+        tail = xlog1py(math.floor(k) + 1, -self.p)
+        return math.log(-math.expm1(tail)) if tail < 0 else -math.inf
+
+    def sample(self, size=None):
+        """Draw a sample from Geometric(p), or an array of `size` samples."""
+        if size is not None:
+            return self.sample_n(size)
+        u = self.rng()
         return int(math.log(1 - u) / math.log(1 - self.p))
 
+    def sample_n(self, n: int) -> array:
+        """Draw n samples by inversion of a block of uniforms."""
+        n = check_size(n)
+        if self.p >= 1.0:
+            return array('q', bytes(8 * n))
+        log, scale = math.log, 1.0 / math.log(1 - self.p)
+        return array('q', [int(log(1 - u) * scale) for u in uniform_block(self.rng, n)])
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        """Smallest k with cdf(k) >= q; closed-form inversion checked against cdf."""
+        check_probability(q)
+        if self.p >= 1.0:
+            return 0
+        guess = math.log1p(-q) / math.log1p(-self.p) - 1 if q < 1.0 else math.inf
+        return discrete_quantile(self.cdf, q, guess)
+
+    quantile = ppf
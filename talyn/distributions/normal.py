@@ -3,23 +3,79 @@ Normal distribution for Talyn.
 """
 import random
 import math
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import check_probability, log_ndtr, ndtri
+from .ziggurat import ziggurat_normal, ziggurat_normal_block
+
+# Sampling methods: "ziggurat" (default, one uniform per draw on the fast
+# path) or "box_muller".
+NORMAL_METHODS = ("ziggurat", "box_muller")
 
 class Normal:
     """
     Normal(mu, sigma): Gaussian distribution with mean mu and std sigma.
     """
-    def __init__(self, mu: float, sigma: float):
+    def __init__(self, mu: float, sigma: float, rng_func=None, method: str = "ziggurat"):
+        if method not in NORMAL_METHODS:
+            raise ValueError(f"method must be one of {NORMAL_METHODS}")
         self.mu = mu
         self.sigma = sigma
+        self.rng = rng_func or random.random
+        self.method = method
 
     def pdf(self, x: float) -> float:
         z = (x - self.mu) / self.sigma
         return math.exp(-0.5 * z * z) / (self.sigma * math.sqrt(2 * math.pi))
 
-    def sample(self) -> float:
+    @pointwise
+    def log_pdf(self, x: float) -> float:
+        z = (x - self.mu) / self.sigma
+        return -0.5 * z * z - math.log(self.sigma) - 0.5 * math.log(2 * math.pi)
+
+    @pointwise
+    def cdf(self, x: float) -> float:
+        return 0.5 * math.erfc(-(x - self.mu) / (self.sigma * math.sqrt(2)))
+
+    @pointwise
+    def log_cdf(self, x: float) -> float:
+        return log_ndtr((x - self.mu) / self.sigma)
+
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
+        if self.method == "ziggurat":
+            return self.mu + self.sigma * ziggurat_normal(self.rng)
         # Box-Muller transform
-        u1 = random.random()
-        u2 = random.random()
-        z0 = math.sqrt(-2.0 * math.log(u1)) * math.cos(2 * math.pi * u2)
+        u1 = self.rng()
+        u2 = self.rng()
+        z0 = math.sqrt(-2.0 * math.log(1 - u1)) * math.cos(2 * math.pi * u2)
         return self.mu + self.sigma * z0
 
+    def sample_n(self, n: int) -> array:
+        """Draw n samples with the ziggurat, or Box-Muller using both outputs of every pair."""
+        n = check_size(n)
+        if self.method == "ziggurat":
+            out = ziggurat_normal_block(self.rng, n)
+            if self.mu == 0 and self.sigma == 1:
+                return out
+            mu, sigma = self.mu, self.sigma
+            return array('d', [mu + sigma * z for z in out])
+        block = uniform_block(self.rng, n + (n & 1))
+        mu, sigma = self.mu, self.sigma
+        log, sqrt, cos, sin, tau = math.log, math.sqrt, math.cos, math.sin, 2 * math.pi
+        out = array('d', bytes(8 * len(block)))
+        for i in range(0, len(block), 2):
+            r = sigma * sqrt(-2.0 * log(1 - block[i]))
+            theta = tau * block[i + 1]
+            out[i] = mu + r * cos(theta)
+            out[i + 1] = mu + r * sin(theta)
+        if n & 1:
+            out.pop()
+        return out
+
+    @pointwise
+    def ppf(self, q: float) -> float:
+        return self.mu + self.sigma * ndtri(check_probability(q))
+
+    quantile = ppf
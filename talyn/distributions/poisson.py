@@ -1,28 +1,132 @@
 """
 Poisson distribution for Talyn.
+
+Small rates use Knuth's product-of-uniforms method (inversion in batches);
+rates at or above PTRS_THRESHOLD use Hormann's transformed rejection with
+squeeze (PTRS), which is O(1) expected and never evaluates exp(-lam).
 """
 import random
 import math
+import sys
+from array import array
+from .batch import check_size, pointwise, uniform_block
+from .special import (
+    check_probability, discrete_quantile, gammaincc, log_factorial, log_sum_exp,
+    ndtri, xlogy,
+)
+
+# Rates at or above this use PTRS; below it the O(lam) methods are cheaper.
+PTRS_THRESHOLD = 10.0
+
 
 class Poisson:
     """
     Poisson(lam): counts of events in fixed interval with rate lam.
     """
-    def __init__(self, lam: float):
+    def __init__(self, lam: float, rng_func=None):
         self.lam = lam
+        self.rng = rng_func or random.random
+        self._setup()
+
+    def _setup(self) -> None:
+        """Precompute the PTRS constants for large rates."""
+        lam = self.lam
+        self._use_ptrs = lam >= PTRS_THRESHOLD
+        if not self._use_ptrs:
+            return
+        slam = math.sqrt(lam)
+        b = 0.931 + 2.53 * slam
+        a = -0.059 + 0.02483 * b
+        inv_alpha = 1.1239 + 1.1328 / (b - 3.4)
+        vr = 0.9277 - 3.6224 / (b - 2)
+        self._ptrs = (a, b, vr, math.log(inv_alpha), math.log(lam))
 
     def pmf(self, k: int) -> float:
         if k < 0:
             return 0.0
         return math.exp(-self.lam) * (self.lam ** k) / math.factorial(k)
 
-    def sample(self) -> int:
+    @pointwise
+    def log_pmf(self, k: int) -> float:
+        """Log-probability of k events, stable for large k and lam."""
+        if k < 0:
+            return -math.inf
+        return xlogy(k, self.lam) - self.lam - log_factorial(k)
+
+    @pointwise
+    def cdf(self, k: int) -> float:
+        """P(X <= k) = Q(k + 1, lam), O(1) in k via the incomplete gamma function."""
+        if k < 0:
+            return 0.0
+        return gammaincc(math.floor(k) + 1, self.lam)
+
+    @pointwise
+    def log_cdf(self, k: int) -> float:
+        """Log-probability of at most k events."""
+        c = self.cdf(k)
+        if c > sys.float_info.min or k < 0:
+            return math.log(c) if c > 0.0 else -math.inf
+        # Underflowed far lower tail: sum the few dominant terms in log space.
+        return log_sum_exp(self.log_pmf(i) for i in range(int(k) + 1))
+
+    @pointwise
+    def ppf(self, q: float) -> int:
+        """Smallest k with cdf(k) >= q, by guided search from the normal approximation."""
+        check_probability(q)
+        return discrete_quantile(self.cdf, q, self.lam + math.sqrt(self.lam) * ndtri(q))
+
+    quantile = ppf
+
+    def sample(self, size=None):
+        if size is not None:
+            return self.sample_n(size)
+        if self._use_ptrs:
+            return self._sample_ptrs()
         # Knuth's algorithm
         L = math.exp(-self.lam)
         k = 0
         p = 1.0
         while p > L:
             k += 1
-            p *= random.random()
+            p *= self.rng()
         return k - 1
 
+    def sample_n(self, n: int) -> array:
+        """Draw n samples: PTRS for large rates, one-uniform inversion otherwise."""
+        n = check_size(n)
+        if self._use_ptrs:
+            draw = self._sample_ptrs
+            return array('q', [draw() for _ in range(n)])
+        lam = self.lam
+        p0 = math.exp(-lam)
+        out = array('q')
+        for u in uniform_block(self.rng, n):
+            k, p = 0, p0
+            cdf = p
+            while u > cdf and p > 0.0:
+                k += 1
+                p *= lam / k
+                cdf += p
+            out.append(k)
+        return out
+
+    def _sample_ptrs(self) -> int:
+        """Transformed rejection with squeeze (Hormann, 1993) for lam >= PTRS_THRESHOLD."""
+        a, b, vr, log_inv_alpha, log_lam = self._ptrs
+        lam, rng = self.lam, self.rng
+        log, lgamma = math.log, math.lgamma
+        while True:
+            u = rng() - 0.5
+            v = rng()
+            us = 0.5 - abs(u)
+            if us == 0.0:
+                continue
+            k = int(math.floor((2 * a / us + b) * u + lam + 0.43))
+            if us >= 0.07 and v <= vr:
+                return k
+            if k < 0 or (us < 0.013 and v > us):
+                continue
+            if v == 0.0:
+                return k
+            if log(v) + log_inv_alpha - log(a / (us * us) + b) <= -lam + k * log_lam - lgamma(k + 1):
+                return k
@@ -0,0 +1,302 @@
+"""
+Special functions for Talyn distributions: log-factorials, log-binomial
+coefficients, log-sum-exp, regularized incomplete beta/gamma functions and
+quantile search, all pure stdlib.
+"""
+import math
+from statistics import NormalDist
+from typing import Callable, Iterable, List, Optional
+
+# Relative tolerance and tiny-value guard for the continued fractions.
+CF_EPS = 1e-15
+CF_TINY = 1e-300
+
+# Log-factorials below this are served from a memoized lgamma table.
+LOG_FACTORIAL_TABLE_SIZE = 1 << 16
+
+_log_factorials: List[float] = [0.0]
+
+
+def log_factorial(k: int) -> float:
+    """
+    log(k!) for integer k >= 0, memoized for k < LOG_FACTORIAL_TABLE_SIZE.
+    Raises:
+        ValueError: if k is negative
+    """
+    k = int(k)
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    table = _log_factorials
+    if k < len(table):
+        return table[k]
+    if k >= LOG_FACTORIAL_TABLE_SIZE:
+        return math.lgamma(k + 1)
+    lgamma = math.lgamma
+    table.extend(lgamma(i + 1) for i in range(len(table), k + 1))
+    return table[k]
+
+
+def log_comb(n: int, k: int) -> float:
+    """
+    log C(n, k) for integers 0 <= k <= n.
+    """
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
+
+
+def xlogy(x: float, y: float) -> float:
+    """
+    x * log(y) with the convention 0 * log(0) = 0.
+    """
+    if x == 0:
+        return 0.0
+    return x * math.log(y) if y > 0 else -math.inf
+
+
+def xlog1py(x: float, y: float) -> float:
+    """
+    x * log1p(y) with the convention 0 * log(0) = 0.
+    """
+    if x == 0:
+        return 0.0
+    return x * math.log1p(y) if y > -1 else -math.inf
+
+
+def log_sum_exp(values: Iterable[float]) -> float:
+    """
+    log(sum(exp(v) for v in values)) without overflow or underflow.
+    Returns -inf for an empty input.
+    """
+    values = list(values)
+    m = max(values, default=-math.inf)
+    if m == -math.inf or m == math.inf:
+        return m
+    return m + math.log(math.fsum(math.exp(v - m) for v in values))
+
+
+def log_ndtr(z: float) -> float:
+    """
+    log of the standard normal CDF, accurate far into the lower tail.
+    """
+    if z > 0.0:
+        return math.log1p(-0.5 * math.erfc(z / math.sqrt(2.0)))
+    if z > -30.0:
+        return math.log(0.5 * math.erfc(-z / math.sqrt(2.0)))
+    # Asymptotic series of the Mills ratio for the far lower tail.
+    z2 = z * z
+    series = 1.0 - 1.0 / z2 + 3.0 / (z2 * z2) - 15.0 / (z2 * z2 * z2)
+    return -0.5 * z2 - math.log(-z) - 0.5 * math.log(2 * math.pi) + math.log(series)
+
+
+def _stirling_corr(z: float) -> float:
+    """lgamma(z) minus its Stirling approximation (z - 0.5) * log(z) - z + log(2 * pi) / 2."""
+    if z < 10.0:
+        return math.lgamma(z) - (z - 0.5) * math.log(z) + z - 0.5 * math.log(2 * math.pi)
+    z2 = z * z
+    return (1.0 / 12.0 - (1.0 / 360.0 - (1.0 / 1260.0 - 1.0 / (1680.0 * z2)) / z2) / z2) / z
+
+
+def _log_beta_front(a: float, b: float, x: float) -> float:
+    """
+    log(x**a * (1 - x)**b / B(a, b)), arranged so the O(a + b) terms cancel
+    analytically instead of in floating point (Loader's saddle-point form).
+    """
+    x0 = a / (a + b)
+    y0 = b / (a + b)
+    return (a * math.log1p((x - x0) / x0) + b * math.log1p((x0 - x) / y0)
+            + 0.5 * math.log(a * y0) - 0.5 * math.log(2 * math.pi)
+            - _stirling_corr(a) - _stirling_corr(b) + _stirling_corr(a + b))
+
+
+def _log_gamma_front(a: float, x: float) -> float:
+    """log(x**a * exp(-x) / Gamma(a)) in the same cancellation-free form."""
+    t = (x - a) / a
+    return (a * (math.log1p(t) - t) + 0.5 * math.log(a)
+            - 0.5 * math.log(2 * math.pi) - _stirling_corr(a))
+
+
+def _cf_max_iter(a: float) -> int:
+    """Iteration cap for the continued fractions; convergence takes O(sqrt(a)) terms."""
+    return 200 + int(10 * math.sqrt(a))
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta function (modified Lentz)."""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    if abs(d) < CF_TINY:
+        d = CF_TINY
+    d = 1.0 / d
+    h = d
+    for m in range(1, _cf_max_iter(max(a, b)) + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        if abs(d) < CF_TINY:
+            d = CF_TINY
+        c = 1.0 + aa / c
+        if abs(c) < CF_TINY:
+            c = CF_TINY
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        if abs(d) < CF_TINY:
+            d = CF_TINY
+        c = 1.0 + aa / c
+        if abs(c) < CF_TINY:
+            c = CF_TINY
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < CF_EPS:
+            break
+    return h
+
+
+def betainc(a: float, b: float, x: float) -> float:
+    """
+    Regularized incomplete beta function I_x(a, b) for a, b > 0.
+    """
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = _log_beta_front(a, b, x)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def _gamma_series(a: float, x: float) -> float:
+    """Series for the lower regularized incomplete gamma P(a, x), x < a + 1."""
+    ap = a
+    total = term = 1.0 / a
+    for _ in range(_cf_max_iter(a)):
+        ap += 1.0
+        term *= x / ap
+        total += term
+        if abs(term) < abs(total) * CF_EPS:
+            break
+    return total * math.exp(_log_gamma_front(a, x))
+
+
+def _gamma_cf(a: float, x: float) -> float:
+    """Continued fraction for the upper regularized incomplete gamma Q(a, x), x >= a + 1."""
+    b = x + 1.0 - a
+    c = 1.0 / CF_TINY
+    d = 1.0 / b
+    h = d
+    for i in range(1, _cf_max_iter(a) + 1):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        if abs(d) < CF_TINY:
+            d = CF_TINY
+        c = b + an / c
+        if abs(c) < CF_TINY:
+            c = CF_TINY
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < CF_EPS:
+            break
+    return math.exp(_log_gamma_front(a, x)) * h
+
+
+def gammainc(a: float, x: float) -> float:
+    """
+    Lower regularized incomplete gamma function P(a, x) for a > 0.
+    """
+    if x <= 0.0:
+        return 0.0
+    if x < a + 1.0:
+        return _gamma_series(a, x)
+    return 1.0 - _gamma_cf(a, x)
+
+
+def gammaincc(a: float, x: float) -> float:
+    """
+    Upper regularized incomplete gamma function Q(a, x) = 1 - P(a, x) for a > 0.
+    """
+    if x <= 0.0:
+        return 1.0
+    if x < a + 1.0:
+        return 1.0 - _gamma_series(a, x)
+    return _gamma_cf(a, x)
+
+
+def ndtri(q: float) -> float:
+    """
+    Inverse of the standard normal CDF, with ndtri(0) = -inf and ndtri(1) = inf.
+    """
+    if q <= 0.0:
+        return -math.inf
+    if q >= 1.0:
+        return math.inf
+    return NormalDist().inv_cdf(q)
+
+
+def check_probability(q: float) -> float:
+    """
+    Validate a quantile level.
+    Raises:
+        ValueError: if q is outside [0, 1]
+    """
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("q must be in [0,1]")
+    return q
+
+
+def discrete_quantile(
+    cdf: Callable[[int], float],
+    q: float,
+    guess: float,
+    lower: int = 0,
+    upper: Optional[int] = None,
+) -> int:
+    """
+    Smallest integer k in [lower, upper] with cdf(k) >= q.
+    Gallops outward from `guess` to bracket the answer, then bisects, so a
+    good guess costs O(1) CDF evaluations and a poor one O(log distance).
+    q = 1 returns `upper`, or math.inf when the support is unbounded above.
+    """
+    if q <= 0.0:
+        return lower
+    if q >= 1.0:
+        return math.inf if upper is None else upper
+    if not math.isfinite(guess):
+        guess = lower if guess < 0 else (upper if upper is not None else lower)
+    k = max(int(math.floor(guess)), lower)
+    if upper is not None:
+        k = min(k, upper)
+    step = 1
+    if cdf(k) >= q:
+        hi = k
+        while True:
+            lo = hi - step
+            if lo < lower:
+                lo = lower - 1
+                break
+            if cdf(lo) < q:
+                break
+            hi = lo
+            step *= 2
+    else:
+        lo = k
+        while True:
+            hi = lo + step
+            if upper is not None and hi >= upper:
+                hi = upper
+                break
+            if cdf(hi) >= q:
+                break
+            lo = hi
+            step *= 2
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if cdf(mid) >= q:
+            hi = mid
+        else:
+            lo = mid
+    return hi
@@ -0,0 +1,164 @@
+"""
+Ziggurat samplers for the standard normal and standard exponential
+distributions (Marsaglia & Tsang, 2000, in Doornik's 2005 floating-point
+form).
+
+The density is covered by equal-area horizontal layers. Almost every draw
+lands strictly inside a layer and costs one uniform, one table lookup and
+one multiply; only the thin wedges and the tail need exp/log. The layer
+index and the in-layer position are both taken from a single uniform.
+"""
+import math
+from array import array
+from typing import Callable, Tuple
+from .batch import uniform_block
+
+NORMAL_LAYERS = 128
+NORMAL_R = 3.442619855899
+NORMAL_V = 9.91256303526217e-3
+
+EXPONENTIAL_LAYERS = 256
+EXPONENTIAL_R = 7.69711747013104972
+EXPONENTIAL_V = 3.949659822581572e-3
+
+
+def _normal_tables() -> Tuple[array, array, array]:
+    """Layer edges X[i], inner edges X[i+1] and densities exp(-X^2/2)."""
+    c, r, v = NORMAL_LAYERS, NORMAL_R, NORMAL_V
+    f = math.exp(-0.5 * r * r)
+    x = array('d', bytes(8 * (c + 1)))
+    x[0] = v / f
+    x[1] = r
+    for i in range(2, c):
+        x[i] = math.sqrt(-2.0 * math.log(v / x[i - 1] + f))
+        f = math.exp(-0.5 * x[i] * x[i])
+    inner = array('d', x[1:])
+    dens = array('d', [math.exp(-0.5 * xi * xi) for xi in x])
+    return x, inner, dens
+
+
+def _exponential_tables() -> Tuple[array, array, array]:
+    """Layer edges X[i], inner edges X[i+1] and densities exp(-X)."""
+    c, r, v = EXPONENTIAL_LAYERS, EXPONENTIAL_R, EXPONENTIAL_V
+    f = math.exp(-r)
+    x = array('d', bytes(8 * (c + 1)))
+    x[0] = v / f
+    x[1] = r
+    for i in range(2, c):
+        x[i] = -math.log(v / x[i - 1] + f)
+        f = math.exp(-x[i])
+    inner = array('d', x[1:])
+    dens = array('d', [math.exp(-xi) for xi in x])
+    return x, inner, dens
+
+
+_NX, _NINNER, _NDENS = _normal_tables()
+_EX, _EINNER, _EDENS = _exponential_tables()
+
+
+def ziggurat_normal(rng: Callable[[], float]) -> float:
+    """
+    Draw one standard normal variate with the ziggurat method.
+    Args:
+        rng: Callable[[], float], RNG function returning float in [0,1)
+    """
+    s = rng() * NORMAL_LAYERS
+    i = int(s)
+    x = (2.0 * (s - i) - 1.0) * _NX[i]
+    if abs(x) < _NINNER[i]:
+        return x
+    return _normal_edge(rng, i, x)
+
+
+def _normal_edge(rng: Callable[[], float], i: int, x: float) -> float:
+    """Resolve a point outside the inner rectangle of layer i: tail, wedge or retry."""
+    while True:
+        if i == 0:
+            return _normal_tail(rng, x < 0)
+        dens = _NDENS
+        if dens[i] + rng() * (dens[i + 1] - dens[i]) < math.exp(-0.5 * x * x):
+            return x
+        s = rng() * NORMAL_LAYERS
+        i = int(s)
+        x = (2.0 * (s - i) - 1.0) * _NX[i]
+        if abs(x) < _NINNER[i]:
+            return x
+
+
+def _normal_tail(rng: Callable[[], float], negative: bool) -> float:
+    """Marsaglia's method for the normal tail beyond NORMAL_R."""
+    while True:
+        x = math.log(1.0 - rng()) / NORMAL_R
+        y = math.log(1.0 - rng())
+        if -2.0 * y >= x * x:
+            return x - NORMAL_R if negative else NORMAL_R - x
+
+
+def ziggurat_exponential(rng: Callable[[], float]) -> float:
+    """
+    Draw one standard exponential variate with the ziggurat method.
+    Args:
+        rng: Callable[[], float], RNG function returning float in [0,1)
+    """
+    s = rng() * EXPONENTIAL_LAYERS
+    i = int(s)
+    x = (s - i) * _EX[i]
+    if x < _EINNER[i]:
+        return x
+    return _exponential_edge(rng, i, x)
+
+
+def _exponential_edge(rng: Callable[[], float], i: int, x: float) -> float:
+    """Resolve a point outside the inner rectangle of layer i: tail, wedge or retry."""
+    offset = 0.0
+    while True:
+        if i == 0:
+            # Memoryless tail: restart the draw shifted by R.
+            offset += EXPONENTIAL_R
+        else:
+            dens = _EDENS
+            if dens[i] + rng() * (dens[i + 1] - dens[i]) < math.exp(-x):
+                return offset + x
+        s = rng() * EXPONENTIAL_LAYERS
+        i = int(s)
+        x = (s - i) * _EX[i]
+        if x < _EINNER[i]:
+            return offset + x
+
+
+def ziggurat_normal_block(rng: Callable[[], float], n: int) -> array:
+    """
+    Draw n standard normal variates into an array('d') from one block of
+    uniforms; the rare edge cases draw extra uniforms from rng.
+    """
+    xs, inner, layers = _NX, _NINNER, float(NORMAL_LAYERS)
+    out = []
+    append = out.append
+    for u in uniform_block(rng, n):
+        s = u * layers
+        i = int(s)
+        x = (2.0 * (s - i) - 1.0) * xs[i]
+        if abs(x) < inner[i]:
+            append(x)
+        else:
+            append(_normal_edge(rng, i, x))
+    return array('d', out)
+
+
+def ziggurat_exponential_block(rng: Callable[[], float], n: int) -> array:
+    """
+    Draw n standard exponential variates into an array('d') from one block
+    of uniforms; the rare edge cases draw extra uniforms from rng.
+    """
+    xs, inner, layers = _EX, _EINNER, float(EXPONENTIAL_LAYERS)
+    out = []
+    append = out.append
+    for u in uniform_block(rng, n):
+        s = u * layers
+        i = int(s)
+        x = (s - i) * xs[i]
+        if x < inner[i]:
+            append(x)
+        else:
+            append(_exponential_edge(rng, i, x))
+    return array('d', out)
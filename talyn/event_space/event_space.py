@@ -2,16 +2,26 @@
 EventSpace and powerset utilities for Talyn probabilistic kernel.
 Pure Python, no dependencies.
 """
-from typing import List, Set, Dict, Optional
+from typing import Any, Callable, List, Set, Dict, Optional
 import itertools
+import random
+from ..distributions.alias import AliasTable
 
 class EventSpace:
-    def __init__(self, omega: List[str], prob: Optional[Dict[str, float]] = None):
+    def __init__(
+        self,
+        omega: List[str],
+        prob: Optional[Dict[str, float]] = None,
+        rng_func: Optional[Callable[[], float]] = None,
+    ):
         self.space = type('Space', (), {})()
         self.space.omega = set(omega)
         self.prob_map = prob if prob is not None else {k: 1.0/len(omega) for k in omega}
         if abs(sum(self.prob_map.values()) - 1.0) > 1e-8:
             raise ValueError("Probabilities must sum to 1.")
+        self.rng = rng_func if rng_func is not None else random.random
+        self._outcomes: Optional[List[str]] = None
+        self._alias: Optional[AliasTable] = None
 
     def prob(self, event: Set[str]) -> float:
         return sum(self.prob_map[k] for k in event if k in self.prob_map)
@@ -25,6 +35,20 @@ class EventSpace:
     def complement(self, A: Set[str]) -> Set[str]:
         return self.space.omega - set(A)
 
+    def draw(self, size: Optional[int] = None) -> Any:
+        """
+        Sample a random outcome according to prob, or a list of `size`
+        outcomes. The alias table is built on the first draw, after which
+        each draw is O(1).
+        """
+        if self._alias is None:
+            self._outcomes = list(self.prob_map)
+            self._alias = AliasTable(list(self.prob_map.values()), rng_func=self.rng)
+        outcomes = self._outcomes
+        if size is not None:
+            return [outcomes[i] for i in self._alias.sample_n(size)]
+        return outcomes[self._alias.sample()]
+
 def powerset(s: Set[str]) -> List[Set[str]]:
     """Return the list of all subsets of set s."""
     l = list(s)
@@ -2,14 +2,26 @@
 Talyn Monte Carlo package: integration and sampling methods.
 """
 from .integrate import integrate
+from .bounds import normalize_bounds
 from .estimate_pi import estimate_pi
 from .rejection_sampling import rejection_sampling
-from .importance_sampling import importance_sampling
+from .adaptive_rejection import adaptive_rejection_sampling
+from .importance_sampling import importance_sampling, self_normalized_importance_sampling, WeightedSample
 from .antithetic import antithetic_variates
 from .stratified import stratified_sampling
 from .control_variates import control_variates
+from .qmc import Sobol, Halton
+from .parallel import parallel_mean, run_parallel
+from .adaptive import adaptive_mean, RunningStats
+from .latin_hypercube import latin_hypercube
+from .miser import miser
+from .vegas import vegas
+from .mlmc import mlmc, euler_maruyama_levels
 
 __all__ = [
-    "integrate", "estimate_pi", "rejection_sampling", "importance_sampling",
-    "antithetic_variates", "stratified_sampling", "control_variates"
+    "integrate", "normalize_bounds", "estimate_pi", "rejection_sampling", "adaptive_rejection_sampling", "importance_sampling",
+    "antithetic_variates", "stratified_sampling", "control_variates",
+    "Sobol", "Halton", "parallel_mean", "run_parallel", "adaptive_mean",
+    "RunningStats", "latin_hypercube", "miser", "vegas",
+    "self_normalized_importance_sampling", "WeightedSample", "mlmc", "euler_maruyama_levels",
 ]
@@ -0,0 +1,169 @@
+"""
+Talyn Monte Carlo: sequential estimation to a target precision.
+
+Samples are drawn in batches and folded into Welford/Chan running moments;
+sampling stops once the confidence-interval half-width meets an absolute or
+relative tolerance, or the sample budget runs out.
+"""
+import math
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Optional, Sequence
+from ..distributions.special import betainc
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_SAMPLES = 10_000_000
+
+
+class RunningStats:
+    """
+    Running count, mean and sum of squared deviations (Welford), with
+    batch updates merged by Chan's pairwise formula so a batch costs one
+    pass and stays numerically stable.
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float) -> None:
+        """Add one observation."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def update(self, values: Sequence[float]) -> None:
+        """Add a batch of observations."""
+        nb = len(values)
+        if nb == 0:
+            return
+        mb = math.fsum(values) / nb
+        m2b = math.fsum((v - mb) ** 2 for v in values)
+        self.merge(nb, mb, m2b)
+
+    def merge(self, nb: int, mb: float, m2b: float) -> None:
+        """Merge the moments (count, mean, M2) of another sample."""
+        na = self.n
+        n = na + nb
+        if n == 0:
+            return
+        delta = mb - self.mean
+        self.mean += delta * nb / n
+        self.m2 += m2b + delta * delta * na * nb / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        """Unbiased sample variance (0 for fewer than two observations)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the mean."""
+        return math.sqrt(self.variance / self.n) if self.n > 0 else math.inf
+
+
+def normal_critical_value(confidence: float) -> float:
+    """Two-sided standard normal critical value z with P(|Z| <= z) = confidence."""
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be in (0,1)")
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def t_critical_value(confidence: float, df: int) -> float:
+    """
+    Two-sided Student-t critical value for df degrees of freedom, found by
+    bisection on P(|T| > t) = I_{df/(df+t^2)}(df/2, 1/2).
+    """
+    if df <= 0:
+        return math.inf
+    alpha = 1.0 - confidence
+    lo = normal_critical_value(confidence)
+    hi = lo
+    while betainc(df / 2.0, 0.5, df / (df + hi * hi)) > alpha:
+        hi *= 2.0
+    for _ in range(100):
+        mid = 0.5 * (lo + hi)
+        if betainc(df / 2.0, 0.5, df / (df + mid * mid)) > alpha:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def check_tolerances(abs_tol: Optional[float], rel_tol: Optional[float]) -> None:
+    """
+    Raises:
+        ValueError: if neither tolerance is given or one is not positive
+    """
+    if abs_tol is None and rel_tol is None:
+        raise ValueError("abs_tol or rel_tol must be given")
+    if (abs_tol is not None and abs_tol <= 0) or (rel_tol is not None and rel_tol <= 0):
+        raise ValueError("tolerances must be positive")
+
+
+def target_half_width(estimate: float, abs_tol: Optional[float], rel_tol: Optional[float]) -> float:
+    """The loosest half-width that satisfies either tolerance."""
+    targets = []
+    if abs_tol is not None:
+        targets.append(abs_tol)
+    if rel_tol is not None:
+        targets.append(rel_tol * abs(estimate))
+    return max(targets)
+
+
+def adaptive_mean(
+    sample_batch: Callable[[int], Sequence[float]],
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+) -> Dict[str, Any]:
+    """
+    Estimate a mean from batches of i.i.d. samples until the normal
+    confidence interval is narrow enough.
+    After each batch the number of samples still needed is predicted from
+    the current variance, so the next batch is sized to finish in one step
+    (at most doubling the sample count, so an early low variance cannot
+    cause a large overshoot).
+    Args:
+        sample_batch: Callable[[int], Sequence[float]], returns m samples
+        abs_tol: Optional[float], target absolute half-width
+        rel_tol: Optional[float], target half-width relative to |estimate|
+        confidence: float, confidence level of the interval
+        batch_size: int, first and minimum batch size (at least 2)
+        max_samples: int, sample budget
+    Returns:
+        Dict with "estimate", "std_error", "half_width", "n" (samples
+        used) and "converged" (False if the budget ran out first)
+    Raises:
+        ValueError: if no tolerance is given, or for invalid sizes
+    """
+    check_tolerances(abs_tol, rel_tol)
+    if batch_size < 2 or max_samples < 2:
+        raise ValueError("batch_size and max_samples must be at least 2")
+    z = normal_critical_value(confidence)
+    stats = RunningStats()
+    m = min(batch_size, max_samples)
+    converged = False
+    while True:
+        stats.update(sample_batch(m))
+        half = z * stats.std_error
+        target = target_half_width(stats.mean, abs_tol, rel_tol)
+        if half <= target:
+            converged = True
+            break
+        remaining = max_samples - stats.n
+        if remaining <= 0:
+            break
+        needed = stats.n * (half / target) ** 2 - stats.n if target > 0 else math.inf
+        m = int(min(max(needed, batch_size), stats.n, remaining))
+    return {
+        "estimate": stats.mean,
+        "std_error": stats.std_error,
+        "half_width": half,
+        "n": stats.n,
+        "converged": converged,
+    }
@@ -2,22 +2,76 @@
 Talyn Monte Carlo: antithetic variates variance reduction.
 """
 import random
-from typing import Callable
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from .adaptive import DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean, check_tolerances
+from .parallel import DEFAULT_CHUNK_SIZE, parallel_mean
+
+
+def _antithetic_chunk(f: Callable[[float], float], m: int, chunk_seed: int) -> Tuple[float, float]:
+    """(sum, sum of squares) of m antithetic pair averages from the chunk's own stream."""
+    rand = random.Random(chunk_seed).random
+    total = total_sq = 0.0
+    for _ in range(m):
+        u = rand()
+        y = (f(u) + f(1 - u)) / 2
+        total += y
+        total_sq += y * y
+    return total, total_sq
+
 
 def antithetic_variates(
     f: Callable[[float], float], 
-    n_samples: int = 1000
-) -> float:
+    n_samples: int = 1000,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Union[float, Dict[str, Any]]:
     """
     Estimate E[f(X)] using antithetic variates.
     Args:
-        f: Function to estimate expectation of
+        f: Function to estimate expectation of (picklable when workers > 1)
         n_samples: Number of sample pairs
+        workers: Processes to split the pairs across (default 1)
+        chunk_size: Pairs per independently seeded chunk
+        seed: Optional base seed; with a seed the result does not depend on workers
+        return_stats: Return the parallel_mean result dict (estimate,
+            std_error, elapsed, per-worker timings) instead of a float
+        abs_tol, rel_tol: Adaptive mode: draw pairs until the confidence
+            half-width meets either tolerance, with n_samples as the budget
+            (single process); returns the adaptive_mean dict whatever
+            return_stats says
+        confidence: Confidence level for the adaptive stopping rule
     Returns:
         Estimated expectation
+    Raises:
+        ValueError: in adaptive mode with workers > 1
     """
-    total = 0.0
-    for _ in range(n_samples):
-        u = random.random()
-        total += (f(u) + f(1 - u)) / 2
-    return total / n_samples
+    if abs_tol is not None or rel_tol is not None:
+        check_tolerances(abs_tol, rel_tol)
+        if workers != 1:
+            raise ValueError("adaptive mode runs in a single process")
+        rand = random.random if seed is None else random.Random(seed).random
+
+        def sample_batch(m: int):
+            pairs = []
+            for _ in range(m):
+                u = rand()
+                pairs.append((f(u) + f(1 - u)) / 2)
+            return pairs
+
+        return adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                             batch_size=max(2, min(DEFAULT_BATCH_SIZE, n_samples)),
+                             max_samples=max(2, n_samples))
+    if workers == 1 and seed is None and not return_stats:
+        total = 0.0
+        for _ in range(n_samples):
+            u = random.random()
+            total += (f(u) + f(1 - u)) / 2
+        return total / n_samples
+    stats = parallel_mean(_antithetic_chunk, n_samples, args=(f,), workers=workers,
+                          chunk_size=chunk_size, seed=seed)
+    return stats if return_stats else stats["estimate"]
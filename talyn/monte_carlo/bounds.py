@@ -0,0 +1,28 @@
+"""
+Talyn Monte Carlo: integration domains given as scalar or per-axis bounds.
+"""
+from numbers import Number
+from typing import List, Sequence, Tuple, Union
+
+Bound = Union[float, Sequence[float]]
+
+
+def normalize_bounds(a: Bound, b: Bound) -> Tuple[List[float], List[float], bool]:
+    """
+    Normalize scalar or per-axis bounds of a box [a, b] to lists.
+    Args:
+        a: Lower bound (float for 1-D, or one value per axis)
+        b: Upper bound, in the same form as a
+    Returns:
+        (lower bounds, upper bounds, scalar), where scalar is True for 1-D scalar bounds
+    Raises:
+        ValueError: if a and b differ in length, are empty, or b <= a on some axis
+    """
+    scalar = isinstance(a, Number) and isinstance(b, Number)
+    lo = [float(a)] if scalar else [float(x) for x in a]
+    hi = [float(b)] if scalar else [float(x) for x in b]
+    if len(lo) != len(hi) or not lo:
+        raise ValueError("a and b must have the same, non-zero length")
+    if any(h <= l for l, h in zip(lo, hi)):
+        raise ValueError("b must be greater than a")
+    return lo, hi, scalar
@@ -1,49 +1,153 @@
 """
 Talyn Monte Carlo: control variates variance reduction.
 """
+import math
 import random
-from typing import Callable, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from .adaptive import DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean, check_tolerances
+
+Control = Union[Callable[[float], float], Sequence[Callable[[float], float]]]
+
+
+def _solve(a: List[List[float]], b: List[float]) -> List[float]:
+    """Solve a x = b by Gaussian elimination with partial pivoting; singular directions get 0."""
+    k = len(b)
+    m = [row[:] + [bi] for row, bi in zip(a, b)]
+    scale = max((abs(m[i][i]) for i in range(k)), default=0.0)
+    tiny = 1e-12 * scale if scale > 0 else 0.0
+    pivots = []
+    row = 0
+    for col in range(k):
+        p = max(range(row, k), key=lambda r: abs(m[r][col]), default=None)
+        if p is None or abs(m[p][col]) <= tiny:
+            continue
+        m[row], m[p] = m[p], m[row]
+        for r in range(k):
+            if r != row and m[r][col] != 0.0:
+                factor = m[r][col] / m[row][col]
+                for c in range(col, k + 1):
+                    m[r][c] -= factor * m[row][c]
+        pivots.append((row, col))
+        row += 1
+    x = [0.0] * k
+    for r, col in pivots:
+        x[col] = m[r][k] / m[r][col]
+    return x
+
+
+def _comoments(f, controls, draw, n_samples: int) -> Tuple[List[float], List[List[float]]]:
+    """Means and co-moment matrix of z = (f, g_1, ..., g_k) over n_samples draws (Welford)."""
+    dim = len(controls) + 1
+    mean = [0.0] * dim
+    comoment = [[0.0] * dim for _ in range(dim)]
+    for n in range(1, n_samples + 1):
+        x = draw()
+        z = [f(x)] + [gi(x) for gi in controls]
+        delta = [zi - mi for zi, mi in zip(z, mean)]
+        mean = [mi + di / n for mi, di in zip(mean, delta)]
+        after = [zi - mi for zi, mi in zip(z, mean)]
+        for i in range(dim):
+            row, di = comoment[i], delta[i]
+            for j in range(i, dim):
+                row[j] += di * after[j]
+    for i in range(dim):
+        for j in range(i):
+            comoment[i][j] = comoment[j][i]
+    return mean, comoment
+
 
 def control_variates(
-    f: Callable[[float], float], 
-    g: Callable[[float], float],
-    g_expectation: float,
-    n_samples: int = 1000
-) -> Tuple[float, float]:
+    f: Callable[[float], float],
+    g: Control,
+    g_expectation: Union[float, Sequence[float]],
+    n_samples: int = 1000,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Union[Tuple[float, float], Dict[str, Any]]:
     """
-    Estimate E[f(X)] using control variate g with known E[g].
+    Estimate E[f(X)], X ~ U(0,1), using one or more control variates with known means.
+    A single pass accumulates the means and the joint co-moment matrix of
+    (f, g_1..g_k) with Welford updates, so cost is O(n k^2) and memory
+    O(k^2). The optimal coefficients solve the regression normal equations
+    Cov(g, g) beta = Cov(g, f).
     Args:
         f: Target function
-        g: Control variate function with known expectation
-        g_expectation: Known E[g(X)]
-        n_samples: Number of samples
+        g: Control variate function, or a sequence of k of them
+        g_expectation: Known E[g(X)], or a sequence of the k known means
+        n_samples: Number of samples (the budget in adaptive mode)
+        seed: Optional RNG seed (default: global random module)
+        return_stats: Return a dict with "estimate", "std_error",
+            "coefficients", "variance_reduction", "r_squared" (the fraction of
+            Var[f(X)] removed by the controls, 1 - variance_reduction),
+            "variance_ratio" and "n"
+        abs_tol, rel_tol: Adaptive mode: fit the coefficients on a pilot
+            batch, then draw controlled samples with them frozen until the
+            confidence half-width meets either tolerance; returns the
+            adaptive_mean dict plus "coefficients" and "pilot" (pilot samples,
+            counted in the budget but not in the estimate)
+        confidence: Confidence level for the adaptive stopping rule
     Returns:
-        (estimate, variance_reduction_factor)
+        (estimate, variance_reduction), where variance_reduction is the
+        fraction of Var[f(X)] that remains with the controls (1 - R^2 of f on g)
+    Raises:
+        ValueError: if the numbers of controls and expectations differ or
+            n_samples < 2 (in adaptive mode, too small for the pilot and two samples)
     """
-    # First pass: estimate covariance
-    cov_sum = 0.0
-    var_g_sum = 0.0
-    f_samples = []
-    g_samples = []
-    
-    for _ in range(n_samples):
-        x = random.random()
-        fx = f(x)
-        gx = g(x)
-        f_samples.append(fx)
-        g_samples.append(gx)
-        cov_sum += (fx - sum(f_samples)/len(f_samples)) * (gx - sum(g_samples)/len(g_samples))
-        var_g_sum += (gx - g_expectation)**2
-    
-    # Calculate optimal coefficient
-    b = cov_sum / var_g_sum if var_g_sum > 0 else 0
-    
-    # Second pass: apply control variate
-    controlled_sum = 0.0
-    for fx, gx in zip(f_samples, g_samples):
-        controlled_sum += fx - b * (gx - g_expectation)
-    
-    estimate = controlled_sum / n_samples
-    variance_reduction = 1 - (cov_sum**2) / (sum((fx - sum(f_samples)/n_samples)**2 for fx in f_samples) * var_g_sum) if var_g_sum > 0 else 0
-    
-    return estimate, variance_reduction
+    controls = [g] if callable(g) else list(g)
+    mus = [float(g_expectation)] if callable(g) else [float(mu) for mu in g_expectation]
+    if len(controls) != len(mus) or not controls:
+        raise ValueError("g and g_expectation must have the same, non-zero length")
+    if n_samples < 2:
+        raise ValueError("n_samples must be at least 2")
+    k = len(controls)
+    dim = k + 1
+    draw = random.random if seed is None else random.Random(seed).random
+    adaptive = abs_tol is not None or rel_tol is not None
+    n = n_samples
+    if adaptive:
+        check_tolerances(abs_tol, rel_tol)
+        # The pilot fits beta; later samples use it frozen, so they are i.i.d. and unbiased.
+        n = max(k + 2, min(DEFAULT_BATCH_SIZE, n_samples // 10))
+        if n_samples < n + 2:
+            raise ValueError("n_samples is too small for the pilot batch")
+
+    mean, comoment = _comoments(f, controls, draw, n)
+    cov = [[c / (n - 1) for c in row] for row in comoment]
+    var_f = cov[0][0]
+    cov_gg = [row[1:] for row in cov[1:]]
+    cov_gf = [cov[i][0] for i in range(1, dim)]
+    beta = _solve(cov_gg, cov_gf)
+    if adaptive:
+        def sample_batch(m: int) -> List[float]:
+            values = []
+            for _ in range(m):
+                x = draw()
+                values.append(f(x) - math.fsum(b * (gi(x) - mu) for b, gi, mu in zip(beta, controls, mus)))
+            return values
+
+        result = adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                               batch_size=max(2, min(DEFAULT_BATCH_SIZE, n_samples - n)),
+                               max_samples=n_samples - n)
+        result["coefficients"] = beta
+        result["pilot"] = n
+        return result
+
+    estimate = mean[0] - math.fsum(b * (mg - mu) for b, mg, mu in zip(beta, mean[1:], mus))
+    explained = math.fsum(b * c for b, c in zip(beta, cov_gf))
+    r2 = min(max(explained / var_f, 0.0), 1.0) if var_f > 0 else 0.0
+    # Residual variance with k fitted coefficients.
+    resid_var = var_f * (1.0 - r2) * (n - 1) / (n - k - 1) if n > k + 1 else math.inf
+    if not return_stats:
+        return estimate, 1.0 - r2
+    return {
+        "estimate": estimate,
+        "std_error": math.sqrt(resid_var / n),
+        "coefficients": beta,
+        "variance_reduction": 1.0 - r2,
+        "r_squared": r2,
+        "variance_ratio": 1.0 / (1.0 - r2) if r2 < 1.0 else math.inf,
+        "n": n,
+    }
@@ -3,26 +3,87 @@ Monte Carlo π estimation for Talyn: pure Python, no dependencies.
 """
 import random
 import time
+from itertools import repeat
+from typing import Any, Dict, Optional, Tuple, Union
+from .adaptive import DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean, check_tolerances
+from .parallel import DEFAULT_CHUNK_SIZE, parallel_mean
 
 # No magic numbers: all constants defined at top if needed
 
 
-def estimate_pi(n: int = 1000000) -> (float, float):
+def _count_inside(m: int, rand) -> int:
+    """Number of m uniform points of [0,1]^2 inside the quarter unit circle."""
+    inside = 0
+    for _ in repeat(None, m):
+        x = rand()
+        y = rand()
+        if x * x + y * y <= 1.0:
+            inside += 1
+    return inside
+
+
+def _pi_chunk(m: int, chunk_seed: int) -> Tuple[float, float]:
+    """(sum, sum of squares) of m samples of 4 * 1{inside}, from the chunk's own stream."""
+    inside = _count_inside(m, random.Random(chunk_seed).random)
+    return 4.0 * inside, 16.0 * inside
+
+
+def estimate_pi(
+    n: int = 1000000,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Union[Tuple[float, float], Dict[str, Any]]:
     """
     Estimate π using Monte Carlo sampling of the unit circle.
     Args:
         n: int, number of samples
+        workers: int, processes to split the samples across (default 1)
+        chunk_size: int, samples per independently seeded chunk
+        seed: Optional[int], base seed; None with workers=1 uses the global random module
+        return_stats: bool, return the full result dict instead of a tuple
+        abs_tol, rel_tol: Optional[float], adaptive mode: stop once the
+            confidence-interval half-width meets either tolerance, with n as
+            the sample budget (single process; the dict is returned
+            whatever return_stats says)
+        confidence: float, confidence level for the adaptive stopping rule
     Returns:
-        (float, float): (pi_estimate, elapsed_time_seconds)
+        (float, float): (pi_estimate, elapsed_time_seconds), or with
+        return_stats a dict with "estimate", "std_error", "n", "elapsed"
+        and per-worker timings under "workers"; in adaptive mode the
+        adaptive_mean dict ("estimate", "std_error", "half_width", "n",
+        "converged") plus "elapsed"
+    Raises:
+        ValueError: in adaptive mode with workers > 1
     Scientific contract:
         Returns unbiased estimate of π as n→∞ using rejection sampling in [0,1]^2.
+        For a fixed seed the estimate does not depend on the number of workers.
     """
-    inside = 0
-    t0 = time.perf_counter()  # high-precision timing
-    for _ in range(n):
-        x, y = random.random(), random.random()
+    if abs_tol is not None or rel_tol is not None:
+        check_tolerances(abs_tol, rel_tol)
+        if workers != 1:
+            raise ValueError("adaptive mode runs in a single process")
+        rand = random.random if seed is None else random.Random(seed).random
+
+        def sample_batch(m: int):
+            return [4.0 if rand() ** 2 + rand() ** 2 <= 1.0 else 0.0 for _ in repeat(None, m)]
+
+        t0 = time.perf_counter()
+        result = adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                               batch_size=max(2, min(DEFAULT_BATCH_SIZE, n)), max_samples=max(2, n))
+        result["elapsed"] = time.perf_counter() - t0
+        return result
+    if workers == 1 and seed is None and not return_stats:
+        t0 = time.perf_counter()  # high-precision timing
         # Accept if inside unit circle (x^2 + y^2 ≤ 1)
-        if x*x + y*y <= 1.0:
-            inside += 1
-    t1 = time.perf_counter()
-    return 4 * inside / n, t1 - t0
+        inside = _count_inside(n, random.random)
+        t1 = time.perf_counter()
+        return 4 * inside / n, t1 - t0
+    stats = parallel_mean(_pi_chunk, n, workers=workers, chunk_size=chunk_size, seed=seed)
+    if return_stats:
+        return stats
+    return stats["estimate"], stats["elapsed"]
@@ -1,16 +1,29 @@
 """
 Talyn Monte Carlo: importance sampling implementation.
 """
+import math
 import random
-from typing import Callable, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from ..distributions.special import log_sum_exp
+from .adaptive import DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean
+
+# Proposals drawn and evaluated per batch in the self-normalized estimator.
+IS_BLOCK_SIZE = 4096
+# Pareto-k above this means the weight tail is too heavy to trust the estimate (Vehtari et al.).
+PARETO_K_THRESHOLD = 0.7
+# Tail sizes below this give no Pareto-k fit.
+PARETO_MIN_TAIL = 5
 
 def importance_sampling(
     target_pdf: Callable[[float], float],
     proposal_pdf: Callable[[float], float],
     proposal_sampler: Callable[[], float],
     f: Callable[[float], float],
-    n_samples: int = 1000
-) -> float:
+    n_samples: int = 1000,
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Union[float, Dict[str, Any]]:
     """
     Estimate E[f(X)] where X ~ target_pdf using importance sampling.
     Args:
@@ -18,13 +31,215 @@ def importance_sampling(
         proposal_pdf: Proposal probability density function
         proposal_sampler: Function to sample from proposal distribution
         f: Function whose expectation we want to estimate
-        n_samples: Number of samples
+        n_samples: Number of samples (the budget in adaptive mode)
+        abs_tol, rel_tol: Adaptive mode: sample until the confidence
+            half-width meets either tolerance; returns the adaptive_mean dict
+        confidence: Confidence level for the adaptive stopping rule
     Returns:
         Estimated expectation
     """
+    if abs_tol is not None or rel_tol is not None:
+        def sample_batch(m: int) -> List[float]:
+            values = []
+            for _ in range(m):
+                x = proposal_sampler()
+                values.append(f(x) * target_pdf(x) / proposal_pdf(x))
+            return values
+
+        return adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                             batch_size=max(2, min(DEFAULT_BATCH_SIZE, n_samples)),
+                             max_samples=max(2, n_samples))
     total = 0.0
     for _ in range(n_samples):
         x = proposal_sampler()
         weight = target_pdf(x) / proposal_pdf(x)
         total += f(x) * weight
     return total / n_samples
+
+
+def _gpd_shape(exceedances: List[float]) -> float:
+    """
+    Shape k of a generalized Pareto fit to sorted positive exceedances, by
+    the Zhang & Stephens (2009) profile-likelihood estimator with the weakly
+    informative prior of Vehtari et al. (PSIS).
+    """
+    n = len(exceedances)
+    m = 30 + int(math.sqrt(n))
+    quartile = exceedances[int(n / 4 + 0.5) - 1]
+    bs = [1.0 / exceedances[-1] + (1.0 - math.sqrt(m / (j - 0.5))) / (3.0 * quartile) for j in range(1, m + 1)]
+    ks = [math.fsum(math.log1p(-b * x) for x in exceedances) / n for b in bs]
+    profile = [n * (math.log(-b / k) - k - 1.0) for b, k in zip(bs, ks)]
+    top = max(profile)
+    weights = [math.exp(lp - top) for lp in profile]
+    total = math.fsum(weights)
+    b_post = math.fsum(b * w for b, w in zip(bs, weights)) / total
+    k = math.fsum(math.log1p(-b_post * x) for x in exceedances) / n
+    return (n * k + 10 * 0.5) / (n + 10)
+
+
+def pareto_k(log_weights: Sequence[float]) -> float:
+    """
+    Pareto-k diagnostic of importance weights: the generalized Pareto shape
+    of their upper tail. Below 0.5 the estimator has finite variance;
+    above 0.7 (PARETO_K_THRESHOLD) it is unreliable. Returns inf when the
+    tail is too short to fit.
+    """
+    n = len(log_weights)
+    tail = int(math.ceil(min(0.2 * n, 3.0 * math.sqrt(n))))
+    if tail < PARETO_MIN_TAIL or tail >= n:
+        return math.inf
+    ordered = sorted(log_weights)
+    top = ordered[-1]
+    cutoff = math.exp(ordered[-tail - 1] - top)
+    exceedances = [math.exp(lw - top) - cutoff for lw in ordered[-tail:]]
+    if exceedances[-1] <= 0.0:
+        return 0.0
+    # Ties at the cutoff give zero exceedances, which the fit cannot use.
+    exceedances = [x for x in exceedances if x > 0.0]
+    if len(exceedances) < PARETO_MIN_TAIL:
+        return 0.0
+    return _gpd_shape(exceedances)
+
+
+class WeightedSample:
+    """
+    Proposal draws with self-normalized importance weights, reusable for
+    any number of expectations without re-sampling.
+    Attributes:
+        samples: the proposal draws
+        log_weights: unnormalized log weights log p~(x) - log q(x)
+        weights: normalized weights (sum to 1)
+        log_normalizer: log of the mean raw weight, an estimate of log Z
+            when the target is p~ = Z p and the proposal is normalized
+        ess: effective sample size 1 / sum(w^2)
+        pareto_k: tail diagnostic of the weights (see pareto_k)
+    """
+    def __init__(self, samples: List, log_weights: List[float]):
+        if not samples:
+            raise ValueError("at least one sample is required")
+        finite = [lw for lw in log_weights if lw > -math.inf]
+        if not finite:
+            raise ValueError("all importance weights are zero")
+        if any(math.isnan(lw) or lw == math.inf for lw in log_weights):
+            raise ValueError("log weights must not be nan or +inf")
+        self.samples = samples
+        self.log_weights = log_weights
+        log_total = log_sum_exp(finite)
+        self.weights = [math.exp(lw - log_total) for lw in log_weights]
+        self.log_normalizer = log_total - math.log(len(samples))
+        self.ess = 1.0 / math.fsum(w * w for w in self.weights)
+        self.pareto_k = pareto_k(finite)
+
+    def expectation(self, f: Callable, vectorized: bool = False, return_error: bool = False):
+        """
+        Self-normalized estimate of E_p[f(X)].
+        Args:
+            f: Function of one sample (of the sample list if vectorized)
+            vectorized: Whether f maps the whole sample list to a list of values
+            return_error: Also return the delta-method standard error
+        Returns:
+            The estimate, or (estimate, standard_error) if return_error
+        """
+        values = list(f(self.samples)) if vectorized else [f(x) for x in self.samples]
+        estimate = math.fsum(w * v for w, v in zip(self.weights, values))
+        if not return_error:
+            return estimate
+        error = math.sqrt(math.fsum((w * (v - estimate)) ** 2 for w, v in zip(self.weights, values)))
+        return estimate, error
+
+    def summary(self) -> Dict[str, Any]:
+        """Weight diagnostics: "n", "ess", "ess_fraction", "pareto_k", "max_weight", "log_normalizer"."""
+        n = len(self.samples)
+        return {
+            "n": n,
+            "ess": self.ess,
+            "ess_fraction": self.ess / n,
+            "pareto_k": self.pareto_k,
+            "max_weight": max(self.weights),
+            "log_normalizer": self.log_normalizer,
+        }
+
+
+def self_normalized_importance_sampling(
+    log_target: Callable,
+    proposal_log_pdf: Union[Callable, Sequence[Callable]],
+    proposal_sampler: Union[Callable, Sequence[Callable]],
+    f: Optional[Callable] = None,
+    n_samples: int = 1000,
+    mixture_weights: Optional[Sequence[float]] = None,
+    vectorized: bool = False,
+) -> Dict[str, Any]:
+    """
+    Estimate E_p[f(X)] from an unnormalized log target with log-space,
+    self-normalized importance weights, so densities far below the
+    floating-point range (high dimensions, unnormalized posteriors) do not
+    underflow.
+    Several proposals form a multiple-importance-sampling mixture: each
+    contributes its share of n_samples and every draw is weighted against
+    the whole mixture (the balance heuristic).
+    Args:
+        log_target: Log of the target density, up to an additive constant
+        proposal_log_pdf: Normalized log proposal density, or one per mixture component
+        proposal_sampler: Zero-argument sampler, or one per mixture component
+        f: Optional function whose expectation is estimated
+        n_samples: Total number of proposal draws
+        mixture_weights: Component probabilities (default: equal)
+        vectorized: Samplers take a count m and return m draws, and the log
+            densities map a list of draws to a list of values; draws are
+            taken in blocks of IS_BLOCK_SIZE
+    Returns:
+        Dict with the weight summary ("n", "ess", "ess_fraction",
+        "pareto_k", "max_weight", "log_normalizer"), "sample" (a
+        WeightedSample for further expectations) and, if f is given,
+        "estimate" and "std_error"
+    Raises:
+        ValueError: for mismatched or invalid mixture specifications, or n_samples < 1
+    """
+    single = callable(proposal_sampler)
+    samplers = [proposal_sampler] if single else list(proposal_sampler)
+    log_pdfs = [proposal_log_pdf] if callable(proposal_log_pdf) else list(proposal_log_pdf)
+    if len(samplers) != len(log_pdfs) or not samplers:
+        raise ValueError("proposal_log_pdf and proposal_sampler must have the same, non-zero length")
+    if n_samples < 1:
+        raise ValueError("n_samples must be positive")
+    k = len(samplers)
+    alphas = [1.0 / k] * k if mixture_weights is None else [float(a) for a in mixture_weights]
+    if len(alphas) != k or any(a < 0 for a in alphas) or sum(alphas) <= 0:
+        raise ValueError("mixture_weights must be non-negative, one per component, with a positive sum")
+    total = math.fsum(alphas)
+    alphas = [a / total for a in alphas]
+    # Deterministic allocation: largest remainder, so the counts sum to n_samples.
+    shares = [a * n_samples for a in alphas]
+    counts = [int(x) for x in shares]
+    for j in sorted(range(k), key=lambda j: shares[j] - counts[j], reverse=True)[:n_samples - sum(counts)]:
+        counts[j] += 1
+
+    samples: List = []
+    log_weights: List[float] = []
+    log_alphas = [math.log(a) if a > 0 else -math.inf for a in alphas]
+    for sampler, count in zip(samplers, counts):
+        done = 0
+        while done < count:
+            m = min(IS_BLOCK_SIZE, count - done) if vectorized else count
+            xs = list(sampler(m)) if vectorized else [sampler() for _ in range(m)]
+            if vectorized:
+                target = list(log_target(xs))
+                components = [list(lq(xs)) for lq in log_pdfs]
+            else:
+                target = [log_target(x) for x in xs]
+                components = [[lq(x) for x in xs] for lq in log_pdfs]
+            for i, x in enumerate(xs):
+                if single:
+                    log_q = components[0][i]
+                else:
+                    log_q = log_sum_exp(la + comp[i] for la, comp in zip(log_alphas, components) if la > -math.inf)
+                samples.append(x)
+                log_weights.append(target[i] - log_q)
+            done += m
+
+    weighted = WeightedSample(samples, log_weights)
+    result = weighted.summary()
+    result["sample"] = weighted
+    if f is not None:
+        result["estimate"], result["std_error"] = weighted.expectation(f, vectorized=vectorized, return_error=True)
+    return result
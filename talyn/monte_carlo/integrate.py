@@ -1,24 +1,215 @@
 """
 Talyn Monte Carlo: numerical integration.
 """
+import math
 import random
-from typing import Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .adaptive import (
+    DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean, check_tolerances,
+    t_critical_value, target_half_width,
+)
+from .bounds import Bound, normalize_bounds
+from .parallel import DEFAULT_CHUNK_SIZE, parallel_mean, run_parallel
+from .latin_hypercube import latin_hypercube
+from .qmc import Halton, Sobol
 
-def integrate(f: Callable[[float], float], a: float, b: float, n: int = 10000) -> float:
+INTEGRATION_METHODS = ("mc", "sobol", "halton", "lhs")
+# Independent scramblings used for the randomized-QMC error estimate.
+DEFAULT_RANDOMIZATIONS = 8
+# Points generated and evaluated per batch; bounds memory for large n.
+INTEGRATION_BLOCK_SIZE = 4096
+# Initial points per randomization in adaptive QMC (a power of two suits Sobol).
+ADAPTIVE_QMC_START = 128
+
+
+def _evaluate(f: Callable, points: List, vectorized: bool) -> List[float]:
+    values = f(points) if vectorized else [f(x) for x in points]
+    if len(values) != len(points):
+        raise ValueError("vectorized integrand must return one value per point")
+    return values
+
+
+def _to_domain(unit_points: List[List[float]], lo: List[float], widths: List[float], scalar: bool) -> List:
+    if scalar:
+        return [lo[0] + widths[0] * p[0] for p in unit_points]
+    return [[l + w * u for l, w, u in zip(lo, widths, p)] for p in unit_points]
+
+
+def _mc_sums(f, lo, widths, scalar, vectorized, m, draw) -> Tuple[float, float]:
+    """(sum, sum of squares) of f at m uniform points drawn with `draw`, in blocks."""
+    d = len(lo)
+    total = total_sq = 0.0
+    done = 0
+    while done < m:
+        size = min(INTEGRATION_BLOCK_SIZE, m - done)
+        unit = [[draw() for _ in range(d)] for _ in range(size)]
+        values = _evaluate(f, _to_domain(unit, lo, widths, scalar), vectorized)
+        total += math.fsum(values)
+        total_sq += math.fsum(v * v for v in values)
+        done += size
+    return total, total_sq
+
+
+def _mc_chunk(f, lo, widths, scalar, vectorized, m, chunk_seed) -> Tuple[float, float]:
+    return _mc_sums(f, lo, widths, scalar, vectorized, m, random.Random(chunk_seed).random)
+
+
+def _qmc_mean(f, method, lo, widths, scalar, vectorized, m, engine_seed) -> float:
+    """Mean of f over the first m points of one Owen-scrambled sequence, or over one Latin hypercube."""
+    if method == "lhs":
+        points = _to_domain(latin_hypercube(m, len(lo), seed=engine_seed), lo, widths, scalar)
+        return math.fsum(_evaluate(f, points, vectorized)) / m
+    engine = (Sobol if method == "sobol" else Halton)(len(lo), scramble="owen", seed=engine_seed)
+    total = 0.0
+    done = 0
+    while done < m:
+        size = min(INTEGRATION_BLOCK_SIZE, m - done)
+        total += math.fsum(_evaluate(f, _to_domain(engine.random(size), lo, widths, scalar), vectorized))
+        done += size
+    return total / m
+
+
+def _adaptive_qmc(f, method, lo, widths, scalar, vectorized, volume, r, budget, seed,
+                  abs_tol, rel_tol, confidence) -> Dict[str, Any]:
+    """Randomized QMC that doubles the points of every scrambled sequence until the t-interval is narrow enough."""
+    seeder = random.Random(seed)
+    engines = [(Sobol if method == "sobol" else Halton)(len(lo), scramble="owen", seed=seeder.getrandbits(64))
+               for _ in range(r)]
+    t = t_critical_value(confidence, r - 1)
+    sums = [0.0] * r
+    count = 0
+    m = max(1, min(ADAPTIVE_QMC_START, budget // r))
+    while True:
+        for i, engine in enumerate(engines):
+            done = 0
+            while done < m:
+                size = min(INTEGRATION_BLOCK_SIZE, m - done)
+                sums[i] += math.fsum(_evaluate(f, _to_domain(engine.random(size), lo, widths, scalar), vectorized))
+                done += size
+        count += m
+        estimates = [volume * s / count for s in sums]
+        estimate = math.fsum(estimates) / r
+        std_error = math.sqrt(math.fsum((e - estimate) ** 2 for e in estimates) / (r - 1) / r)
+        half = t * std_error
+        converged = half <= target_half_width(estimate, abs_tol, rel_tol)
+        if converged or 2 * count * r > budget:
+            break
+        m = count
+    return {"estimate": estimate, "std_error": std_error, "half_width": half,
+            "n": count * r, "converged": converged}
+
+
+def integrate(
+    f: Callable,
+    a: Bound,
+    b: Bound,
+    n: int = 10000,
+    method: str = "mc",
+    vectorized: bool = False,
+    randomizations: int = DEFAULT_RANDOMIZATIONS,
+    seed: Optional[int] = None,
+    return_error: bool = False,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+    return_stats: bool = False,
+) -> Union[float, Tuple[float, float], Dict[str, Any]]:
     """
-    Compute ∫ₐᵇ f(x)dx using Monte Carlo integration.
+    Compute ∫ f over the interval [a, b] or the hyperrectangle Π [a_i, b_i]
+    using Monte Carlo or randomized quasi-Monte Carlo.
     Args:
-        f: Function to integrate
-        a: Lower bound
-        b: Upper bound
-        n: Number of samples
+        f: Function to integrate; takes a float for scalar bounds, a list of
+            coordinates otherwise. With vectorized=True it takes a list of
+            such points and returns a sequence of values.
+        a: Lower bound (float) or per-axis lower bounds
+        b: Upper bound (float) or per-axis upper bounds
+        n: Number of samples. For Halton and LHS it is split as evenly as
+            possible across the randomizations. For Sobol, each scrambled
+            sequence uses the largest power of two <= n / randomizations
+            points, which keeps its (t, m, s)-net balance, so fewer than n
+            points may be used (see return_stats).
+        method: "mc" (pseudo-random), "sobol" or "halton" (Owen-scrambled),
+            or "lhs" (independent Latin hypercube replicates)
+        vectorized: Whether f evaluates a batch of points per call
+        randomizations: Independent scramblings/replicates for QMC and LHS (>= 2 for an error estimate)
+        seed: Optional RNG seed; None uses the global random module for "mc"
+        return_error: Also return the standard error of the estimate
+        workers: Processes for MC chunks or QMC randomizations (f must be
+            picklable when > 1); with a seed the result does not depend on it
+        chunk_size: MC samples per independently seeded chunk
+        abs_tol, rel_tol: Adaptive mode: sample until the confidence-interval
+            half-width is at most abs_tol or rel_tol * |estimate|, with n
+            as the sample budget (single process; not available for "lhs")
+        confidence: Confidence level for the adaptive stopping rule
+        return_stats: Return a dict with "estimate", "std_error" and "n"
+            (points actually evaluated) instead
+    Returns:
+        The estimate, or (estimate, standard_error) if return_error.
+        MC error is the sample standard deviation / sqrt(n); QMC error is
+        the spread of the per-randomization estimates / sqrt(randomizations).
+        In adaptive mode, a dict with "estimate", "std_error", "half_width",
+        "n" (samples used) and "converged".
+    Raises:
+        ValueError: for empty or inverted bounds, an unknown method or n < 1,
+            or adaptive mode with workers > 1
     """
-    if b <= a:
-        raise ValueError("b must be greater than a")
-    
-    total = 0.0
-    for _ in range(n):
-        x = random.uniform(a, b)
-        total += f(x)
-    
-    return (b - a) * total / n
+    if method not in INTEGRATION_METHODS:
+        raise ValueError(f"method must be one of {INTEGRATION_METHODS}")
+    if n < 1:
+        raise ValueError("n must be positive")
+    lo, hi, scalar = normalize_bounds(a, b)
+    widths = [h - l for l, h in zip(lo, hi)]
+    volume = math.prod(widths)
+    if abs_tol is not None or rel_tol is not None:
+        check_tolerances(abs_tol, rel_tol)
+        if workers != 1:
+            raise ValueError("adaptive mode runs in a single process")
+        if method == "lhs":
+            raise ValueError("adaptive mode supports 'mc', 'sobol' and 'halton'")
+        if method != "mc":
+            r = max(2, randomizations)
+            return _adaptive_qmc(f, method, lo, widths, scalar, vectorized, volume, r, n, seed,
+                                 abs_tol, rel_tol, confidence)
+        draw = random.random if seed is None else random.Random(seed).random
+        d = len(lo)
+
+        def sample_batch(m: int) -> List[float]:
+            unit = [[draw() for _ in range(d)] for _ in range(m)]
+            return [volume * v for v in _evaluate(f, _to_domain(unit, lo, widths, scalar), vectorized)]
+
+        return adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                             batch_size=max(2, min(DEFAULT_BATCH_SIZE, n)), max_samples=max(2, n))
+    if method == "mc":
+        if workers == 1 and seed is None:
+            total, total_sq = _mc_sums(f, lo, widths, scalar, vectorized, n, random.random)
+            mean = total / n
+            var = max(total_sq / n - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+            std_error = math.sqrt(var / n)
+        else:
+            stats = parallel_mean(_mc_chunk, n, args=(f, lo, widths, scalar, vectorized),
+                                  workers=workers, chunk_size=chunk_size, seed=seed)
+            mean, std_error = stats["estimate"], stats["std_error"]
+        estimate, error = volume * mean, volume * std_error
+        used = n
+    else:
+        r = max(1, min(randomizations, n))
+        if method == "sobol":
+            sizes = [1 << ((n // r).bit_length() - 1)] * r
+        else:
+            sizes = [n // r + (i < n % r) for i in range(r)]
+        used = sum(sizes)
+        seeder = random.Random(seed)
+        args = [(f, method, lo, widths, scalar, vectorized, m, seeder.getrandbits(64)) for m in sizes]
+        means, _ = run_parallel(_qmc_mean, args, workers)
+        estimates = [volume * mu for mu in means]
+        estimate = math.fsum(estimates) / r
+        if r > 1:
+            var = math.fsum((e - estimate) ** 2 for e in estimates) / (r - 1)
+            error = math.sqrt(var / r)
+        else:
+            error = math.nan
+    if return_stats:
+        return {"estimate": estimate, "std_error": error, "n": used}
+    return (estimate, error) if return_error else estimate
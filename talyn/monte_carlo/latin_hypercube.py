@@ -0,0 +1,35 @@
+"""
+Talyn Monte Carlo: Latin hypercube sampling.
+"""
+import random
+from typing import List, Optional
+
+
+def latin_hypercube(n: int, d: int, seed: Optional[int] = None, centered: bool = False) -> List[List[float]]:
+    """
+    n points in [0,1)^d such that every axis, cut into n equal slices, has
+    exactly one point per slice (McKay, Beckman & Conover, 1979). Each
+    one-dimensional margin is thus stratified, which removes the additive
+    part of the integrand's variance.
+    Args:
+        n: int, number of points
+        d: int, dimension
+        seed: Optional[int], RNG seed (default: global random module)
+        centered: bool, place points at slice centres instead of uniformly within slices
+    Returns:
+        List of n points, each a list of d floats
+    Raises:
+        ValueError: if n or d is negative
+    """
+    if n < 0 or d < 0:
+        raise ValueError("n and d must be non-negative")
+    rng = random if seed is None else random.Random(seed)
+    columns = []
+    for _ in range(d):
+        perm = list(range(n))
+        rng.shuffle(perm)
+        if centered:
+            columns.append([(k + 0.5) / n for k in perm])
+        else:
+            columns.append([(k + rng.random()) / n for k in perm])
+    return [list(p) for p in zip(*columns)] if d else [[] for _ in range(n)]
@@ -0,0 +1,115 @@
+"""
+Talyn Monte Carlo: MISER recursive stratified sampling (Press & Farrar, 1990).
+"""
+import math
+import random
+from typing import Any, Callable, Dict, List, Optional
+from .bounds import Bound, normalize_bounds
+
+# Fraction of a region's points spent on the pilot that chooses the bisection.
+MISER_PILOT_FRACTION = 0.1
+# Minimum pilot points, and the smallest budget that is still bisected.
+MISER_MIN_POINTS = 15
+MISER_MIN_BISECT = 60
+# Random jitter of the bisection point, as a fraction of the region width.
+MISER_DITHER = 0.05
+
+
+def miser(
+    f: Callable[[List[float]], float],
+    a: Bound,
+    b: Bound,
+    n: int = 10000,
+    seed: Optional[int] = None,
+    dither: float = MISER_DITHER,
+) -> Dict[str, Any]:
+    """
+    Integrate f over a hyperrectangle by recursive stratified sampling.
+    Each region spends a small pilot sample to find the axis whose
+    bisection best separates the integrand's spread, then splits its
+    remaining budget between the halves in proportion to their estimated
+    spread (Neyman allocation with a (max - min)^(2/3) proxy for the
+    standard deviation), recursing until the budget is too small to bisect.
+    Args:
+        f: Function to integrate; takes a list of coordinates (a float for scalar bounds)
+        a: Lower bound (float) or per-axis lower bounds
+        b: Upper bound (float) or per-axis upper bounds
+        n: Total number of function evaluations
+        seed: Optional RNG seed (default: global random module)
+        dither: Relative jitter of the bisection point, breaking symmetry
+    Returns:
+        Dict with "estimate", "std_error" and "n" (function evaluations)
+    Raises:
+        ValueError: for invalid bounds or n < 2
+    """
+    if n < 2:
+        raise ValueError("n must be at least 2")
+    lo, hi, scalar = normalize_bounds(a, b)
+    rand = random.random if seed is None else random.Random(seed).random
+    evaluations = [0]
+    d = len(lo)
+
+    def point(region_lo, region_hi):
+        return [l + (h - l) * rand() for l, h in zip(region_lo, region_hi)]
+
+    def call(x):
+        evaluations[0] += 1
+        return f(x[0] if scalar else x)
+
+    def plain(region_lo, region_hi, npts):
+        total = total_sq = 0.0
+        for _ in range(npts):
+            y = call(point(region_lo, region_hi))
+            total += y
+            total_sq += y * y
+        mean = total / npts
+        var = max(total_sq / npts - mean * mean, 0.0)
+        return mean, var / max(npts - 1, 1)
+
+    def recurse(region_lo, region_hi, npts):
+        """Mean of f over the region and the variance of that mean."""
+        if npts < MISER_MIN_BISECT:
+            return plain(region_lo, region_hi, npts)
+        npre = max(int(npts * MISER_PILOT_FRACTION), MISER_MIN_POINTS)
+        mids = [l + (h - l) * (0.5 + dither * (2 * rand() - 1)) for l, h in zip(region_lo, region_hi)]
+        inf = math.inf
+        fminl, fmaxl = [inf] * d, [-inf] * d
+        fminr, fmaxr = [inf] * d, [-inf] * d
+        for _ in range(npre):
+            x = point(region_lo, region_hi)
+            y = call(x)
+            for j in range(d):
+                if x[j] <= mids[j]:
+                    fminl[j] = min(fminl[j], y)
+                    fmaxl[j] = max(fmaxl[j], y)
+                else:
+                    fminr[j] = min(fminr[j], y)
+                    fmaxr[j] = max(fmaxr[j], y)
+        best, best_sum, sigl, sigr = 0, inf, 0.0, 0.0
+        for j in range(d):
+            if fmaxl[j] >= fminl[j] and fmaxr[j] >= fminr[j]:
+                sl = (fmaxl[j] - fminl[j]) ** (2.0 / 3.0)
+                sr = (fmaxr[j] - fminr[j]) ** (2.0 / 3.0)
+                if sl + sr < best_sum:
+                    best, best_sum, sigl, sigr = j, sl + sr, sl, sr
+        if best_sum == inf:
+            best = int(rand() * d) % d
+        left_hi = list(region_hi)
+        right_lo = list(region_lo)
+        left_hi[best] = right_lo[best] = mids[best]
+        width = region_hi[best] - region_lo[best]
+        frac_vol = (mids[best] - region_lo[best]) / width
+        remaining = npts - npre
+        # Press & Farrar: N_l / N ∝ V_l σ_l for the dithered sub-volumes V_l = frac_vol, V_r = 1 - frac_vol.
+        weighted = frac_vol * sigl + (1 - frac_vol) * sigr
+        frac = frac_vol * sigl / weighted if weighted > 0 else frac_vol
+        nptl = MISER_MIN_POINTS + int((remaining - 2 * MISER_MIN_POINTS) * frac)
+        nptr = remaining - nptl
+        meanl, varl = recurse(region_lo, left_hi, nptl)
+        meanr, varr = recurse(right_lo, region_hi, nptr)
+        return (frac_vol * meanl + (1 - frac_vol) * meanr,
+                frac_vol ** 2 * varl + (1 - frac_vol) ** 2 * varr)
+
+    mean, var = recurse(lo, hi, n)
+    volume = math.prod(h - l for l, h in zip(lo, hi))
+    return {"estimate": volume * mean, "std_error": volume * math.sqrt(var), "n": evaluations[0]}
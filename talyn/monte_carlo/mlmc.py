@@ -0,0 +1,229 @@
+"""
+Talyn Monte Carlo: multilevel Monte Carlo (Giles, 2008).
+
+E[P_L] is written as the telescoping sum E[P_0] + Σ_l E[P_l - P_{l-1}],
+where P_l is the quantity of interest computed on a grid refined l times.
+Each correction is sampled from a fine and a coarse path driven by the
+same Brownian increments, so its variance shrinks with l and few of the
+expensive fine samples are needed. For Euler-discretized SDEs this brings
+the cost of root-mean-square error eps from O(eps^-3) down to
+O(eps^-2 log(eps)^2).
+"""
+import math
+import random
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+MLMC_INITIAL_SAMPLES = 1000
+MLMC_MIN_LEVELS = 2
+MLMC_MAX_LEVELS = 10
+# Share of the mean squared error allowed for sampling variance; the rest is bias.
+MLMC_VARIANCE_SHARE = 0.5
+
+LevelSampler = Callable[[int, int, random.Random], Tuple[float, float]]
+
+
+def _slope(ys: Sequence[float]) -> float:
+    """Least-squares slope of ys against 1, 2, ..., len(ys)."""
+    n = len(ys)
+    xbar = (n + 1) / 2.0
+    ybar = math.fsum(ys) / n
+    num = math.fsum((i + 1 - xbar) * (y - ybar) for i, y in enumerate(ys))
+    den = math.fsum((i + 1 - xbar) ** 2 for i in range(n))
+    return num / den
+
+
+def _log2(x: float) -> float:
+    return math.log2(x) if x > 0 else -math.inf
+
+
+def euler_maruyama_levels(
+    drift: Callable[[float, float], float],
+    diffusion: Callable[[float, float], float],
+    x0: float,
+    T: float,
+    payoff: Callable[[List[float]], float],
+    base_steps: int = 1,
+    refinement: int = 2,
+) -> LevelSampler:
+    """
+    Level sampler for mlmc() from the scalar SDE dX = a(t, X) dt + b(t, X) dW.
+    Level l uses base_steps * refinement^l Euler-Maruyama steps; its coarse
+    partner uses refinement times fewer steps, each driven by the sum of the
+    fine Brownian increments it spans.
+    Args:
+        drift: a(t, x)
+        diffusion: b(t, x)
+        x0: Initial value
+        T: Time horizon
+        payoff: Function of the discretized path [X_0, ..., X_T] (path-dependent payoffs allowed)
+        base_steps: Time steps on level 0
+        refinement: Refinement factor between levels
+    Returns:
+        Callable (level, n, rng) -> (Σ Y, Σ Y^2) over n samples of
+        Y = P_l - P_{l-1} (Y = P_0 on level 0)
+    """
+    if base_steps < 1 or refinement < 2:
+        raise ValueError("base_steps must be >= 1 and refinement >= 2")
+
+    def sample(level: int, n: int, rng: random.Random) -> Tuple[float, float]:
+        nf = base_steps * refinement ** level
+        hf = T / nf
+        sqrt_hf = math.sqrt(hf)
+        hc = hf * refinement
+        # Fine steps per coarse step; level 0 has no coarse path.
+        sub = refinement if level > 0 else 1
+        gauss = rng.gauss
+        total = total_sq = 0.0
+        for _ in range(n):
+            xf = xc = x0
+            fine = [xf]
+            coarse = [xc]
+            t = 0.0
+            for _ in range(nf // sub):
+                tc = t
+                dwc = 0.0
+                for _ in range(sub):
+                    dw = sqrt_hf * gauss(0.0, 1.0)
+                    xf += drift(t, xf) * hf + diffusion(t, xf) * dw
+                    t += hf
+                    fine.append(xf)
+                    dwc += dw
+                if level > 0:
+                    xc += drift(tc, xc) * hc + diffusion(tc, xc) * dwc
+                    coarse.append(xc)
+            y = payoff(fine) - (payoff(coarse) if level > 0 else 0.0)
+            total += y
+            total_sq += y * y
+        return total, total_sq
+
+    return sample
+
+
+def mlmc(
+    level_sampler: LevelSampler,
+    eps: float,
+    n_initial: int = MLMC_INITIAL_SAMPLES,
+    min_levels: int = MLMC_MIN_LEVELS,
+    max_levels: int = MLMC_MAX_LEVELS,
+    refinement: int = 2,
+    gamma: float = 1.0,
+    alpha: Optional[float] = None,
+    beta: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Estimate E[P] to root-mean-square error eps by multilevel Monte Carlo.
+    Per-level means and variances are estimated from the samples drawn so
+    far; sample counts follow the optimal allocation
+    N_l ∝ sqrt(V_l / C_l), and levels are added until the estimated bias
+    |E[Y_L]| / (refinement^alpha - 1) is within tolerance.
+    Args:
+        level_sampler: Callable (level, n, rng) -> (Σ Y, Σ Y^2) for n
+            coupled samples of Y_l = P_l - P_{l-1}; see euler_maruyama_levels
+        eps: Target root-mean-square error
+        n_initial: Pilot samples on each new level
+        min_levels: Levels (beyond level 0) used from the start; at least
+            one is always used, since the bias is estimated from level l >= 1
+        max_levels: Finest level allowed (at least 1)
+        refinement: Refinement factor between levels (for the cost and bias models)
+        gamma: Cost of one level-l sample is refinement^(gamma * l) level-0 samples
+            (plus its coarse partner on l > 0)
+        alpha, beta: Weak-error and variance decay rates (per level, in
+            log_refinement units); estimated by regression when None
+        seed: Optional RNG seed (default: global random module)
+    Returns:
+        Dict with "estimate", "std_error", "bias" (estimated), "converged",
+        "cost" (in level-0 samples), "mc_cost" (estimated cost of plain MC
+        on the finest level at the same error), "alpha", "beta" and
+        "levels": per-level dicts with "level", "n", "mean", "variance",
+        "cost_per_sample" and "cost"
+    Raises:
+        ValueError: for eps <= 0 or invalid level settings
+    """
+    if eps <= 0:
+        raise ValueError("eps must be positive")
+    if not 0 <= min_levels <= max_levels or max_levels < 1 or n_initial < 2:
+        raise ValueError("need 0 <= min_levels <= max_levels, max_levels >= 1 and n_initial >= 2")
+    rng = random if seed is None else random.Random(seed)
+    theta = MLMC_VARIANCE_SHARE
+
+    def unit_cost(level: int) -> float:
+        fine = refinement ** (gamma * level)
+        return fine + (refinement ** (gamma * (level - 1)) if level > 0 else 0.0)
+
+    n_levels = max(min_levels, 1) + 1
+    counts = [0] * n_levels
+    sums = [0.0] * n_levels
+    sqs = [0.0] * n_levels
+    todo = [n_initial] * n_levels
+    a = b = 1.0
+    converged = False
+    while True:
+        for level in range(n_levels):
+            if todo[level] > 0:
+                s1, s2 = level_sampler(level, todo[level], rng)
+                sums[level] += s1
+                sqs[level] += s2
+                counts[level] += todo[level]
+                todo[level] = 0
+        means = [abs(sums[l] / counts[l]) for l in range(n_levels)]
+        variances = [max(sqs[l] / counts[l] - (sums[l] / counts[l]) ** 2, 0.0) for l in range(n_levels)]
+        # Floor the estimates on fine levels so a lucky tiny sample cannot stall the scheme.
+        for l in range(2, n_levels):
+            means[l] = max(means[l], 0.5 * means[l - 1] / refinement ** a)
+            variances[l] = max(variances[l], 0.5 * variances[l - 1] / refinement ** b)
+        if n_levels > 2:
+            log_r = math.log2(refinement)
+            a = alpha if alpha is not None else max(0.5, -_slope([_log2(m) for m in means[1:]]) / log_r)
+            b = beta if beta is not None else max(0.5, -_slope([_log2(v) for v in variances[1:]]) / log_r)
+            if not math.isfinite(a):
+                a = 0.5
+            if not math.isfinite(b):
+                b = 0.5
+        else:
+            a = alpha if alpha is not None else a
+            b = beta if beta is not None else b
+        costs = [unit_cost(l) for l in range(n_levels)]
+        scale = math.fsum(math.sqrt(v * c) for v, c in zip(variances, costs)) / ((1.0 - theta) * eps * eps)
+        optimal = [math.ceil(math.sqrt(v / c) * scale) for v, c in zip(variances, costs)]
+        todo = [max(0, o - n) for o, n in zip(optimal, counts)]
+        if any(t > 0.01 * n for t, n in zip(todo, counts)):
+            continue
+        # Variance target met; check the bias on the finest levels (all l >= 1).
+        tail = min(3, n_levels - 1)
+        bias = max(means[n_levels - 1 - i] / refinement ** (i * a) for i in range(tail)) / (refinement ** a - 1.0)
+        if bias <= math.sqrt(theta) * eps:
+            converged = True
+            break
+        if n_levels - 1 >= max_levels:
+            break
+        n_levels += 1
+        counts.append(0)
+        sums.append(0.0)
+        sqs.append(0.0)
+        todo.append(n_initial)
+
+    level_stats = []
+    for l in range(n_levels):
+        mean = sums[l] / counts[l]
+        level_stats.append({
+            "level": l,
+            "n": counts[l],
+            "mean": mean,
+            "variance": max(sqs[l] / counts[l] - mean * mean, 0.0),
+            "cost_per_sample": unit_cost(l),
+            "cost": counts[l] * unit_cost(l),
+        })
+    std_error = math.sqrt(math.fsum(s["variance"] / s["n"] for s in level_stats))
+    finest_cost = refinement ** (gamma * (n_levels - 1))
+    return {
+        "estimate": math.fsum(s["mean"] for s in level_stats),
+        "std_error": std_error,
+        "bias": bias,
+        "converged": converged,
+        "cost": math.fsum(s["cost"] for s in level_stats),
+        "mc_cost": level_stats[0]["variance"] * finest_cost / ((1.0 - theta) * eps * eps),
+        "alpha": a,
+        "beta": b,
+        "levels": level_stats,
+    }
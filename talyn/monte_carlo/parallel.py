@@ -0,0 +1,123 @@
+"""
+Talyn Monte Carlo: chunked and multi-process execution of estimators.
+
+The sample budget is cut into fixed chunks and chunk i always draws from a
+generator seeded by (seed, i), so for a given seed the combined estimate is
+bit-identical whether the chunks run in one process or in a pool of workers.
+Tasks and integrands must be picklable (module-level functions) when
+workers > 1.
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def chunk_seeds(seed: Optional[int], count: int) -> List[int]:
+    """
+    64-bit seeds for `count` chunk generators, decorrelated by SplitMix64.
+    seed=None draws the base seed from the global random module.
+    """
+    x = (random.getrandbits(64) if seed is None else seed) & _MASK64
+    seeds = []
+    for _ in range(count):
+        x = (x + 0x9E3779B97F4A7C15) & _MASK64
+        z = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        seeds.append(z ^ (z >> 31))
+    return seeds
+
+
+def split_budget(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+    """
+    Split n samples into chunks of chunk_size (the last one may be smaller).
+    Raises:
+        ValueError: if n is negative or chunk_size is not positive
+    """
+    if n < 0 or chunk_size <= 0:
+        raise ValueError("n must be non-negative and chunk_size positive")
+    return [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+
+
+def _timed_call(task: Callable, args: Tuple) -> Tuple[Any, int, float]:
+    t0 = time.perf_counter()
+    result = task(*args)
+    return result, os.getpid(), time.perf_counter() - t0
+
+
+def run_parallel(
+    task: Callable,
+    arg_list: Sequence[Tuple],
+    workers: int = 1,
+) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """
+    Evaluate task(*args) for every tuple in arg_list, in order, on up to
+    `workers` processes (workers=1 runs in the calling process).
+    Returns:
+        (results in input order, per-worker timings as dicts with keys
+        "worker" (pid), "chunks" and "seconds")
+    Raises:
+        ValueError: if workers < 1
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers == 1 or len(arg_list) <= 1:
+        outputs = [_timed_call(task, args) for args in arg_list]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_timed_call, [task] * len(arg_list), arg_list))
+    timings: Dict[int, Dict[str, Any]] = {}
+    for _, pid, seconds in outputs:
+        entry = timings.setdefault(pid, {"worker": pid, "chunks": 0, "seconds": 0.0})
+        entry["chunks"] += 1
+        entry["seconds"] += seconds
+    return [out[0] for out in outputs], list(timings.values())
+
+
+def parallel_mean(
+    task: Callable,
+    n: int,
+    args: Tuple = (),
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo mean of i.i.d. samples produced in chunks.
+    Args:
+        task: task(*args, m, chunk_seed) returning (sum, sum_of_squares) of m samples
+        n: int, total number of samples
+        args: leading arguments passed to task
+        workers: int, number of processes
+        chunk_size: int, samples per chunk
+        seed: Optional[int], base seed for the chunk generators
+    Returns:
+        Dict with "estimate", "std_error", "n", "elapsed" (wall seconds) and
+        "workers" (per-worker timings)
+    Raises:
+        ValueError: if n < 1
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    sizes = split_budget(n, chunk_size)
+    seeds = chunk_seeds(seed, len(sizes))
+    t0 = time.perf_counter()
+    results, timings = run_parallel(task, [tuple(args) + (m, s) for m, s in zip(sizes, seeds)], workers)
+    elapsed = time.perf_counter() - t0
+    total = math.fsum(r[0] for r in results)
+    total_sq = math.fsum(r[1] for r in results)
+    mean = total / n
+    var = max(total_sq / n - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+    return {
+        "estimate": mean,
+        "std_error": math.sqrt(var / n),
+        "n": n,
+        "elapsed": elapsed,
+        "workers": timings,
+    }
@@ -0,0 +1,264 @@
+"""
+Talyn Monte Carlo: quasi-random (low-discrepancy) point sets.
+
+Sobol and Halton sequences fill [0,1)^d far more evenly than pseudo-random
+points, so integration error falls close to O(n^-1) for smooth integrands
+instead of O(n^-1/2). Scrambling randomizes a point set while keeping that
+structure, which makes the estimate unbiased and lets independent
+scramblings provide an error estimate (randomized QMC).
+"""
+import math
+import random
+from typing import List, Optional
+from .sobol_directions import SOBOL_DIRECTION_DATA
+
+# Bits of precision per Sobol coordinate; at most 2**SOBOL_BITS points.
+SOBOL_BITS = 32
+SOBOL_MAX_DIM = 1024
+SCRAMBLE_METHODS = (None, "shift", "owen")
+# Halton digits are scrambled down to double precision.
+HALTON_PRECISION_BITS = 53
+
+_SOBOL_SCALE = 1.0 / (1 << SOBOL_BITS)
+_sobol_columns: List[List[int]] = []
+_primes: List[int] = []
+
+
+def _check_scramble(scramble: Optional[str]) -> None:
+    if scramble not in SCRAMBLE_METHODS:
+        raise ValueError(f"scramble must be one of {SCRAMBLE_METHODS}")
+
+
+def _sobol_direction_columns(d: int) -> List[List[int]]:
+    """
+    Direction numbers v_1..v_SOBOL_BITS (as SOBOL_BITS-bit integers) for the
+    first d dimensions, built on first use from the Joe-Kuo table with the
+    Bratley-Fox recurrence.
+    """
+    if len(_sobol_columns) >= d:
+        return _sobol_columns[:d]
+    bits = SOBOL_BITS
+    if not _sobol_columns:
+        _sobol_columns.append([1 << (bits - k) for k in range(1, bits + 1)])
+    lines = SOBOL_DIRECTION_DATA.split("\n")
+    for line in lines[len(_sobol_columns) - 1:d - 1]:
+        fields = [int(x) for x in line.split()]
+        poly, m = fields[0], fields[1:]
+        s = poly.bit_length() - 1
+        v = [m[k] << (bits - 1 - k) for k in range(min(s, bits))]
+        for k in range(s, bits):
+            x = v[k - s] ^ (v[k - s] >> s)
+            for j in range(1, s):
+                if (poly >> (s - j)) & 1:
+                    x ^= v[k - j]
+            v.append(x)
+        _sobol_columns.append(v)
+    return _sobol_columns[:d]
+
+
+def _linear_matrix_scramble(column: List[int], rng: random.Random) -> List[int]:
+    """
+    Multiply each direction number by a random lower-triangular binary
+    matrix with unit diagonal (Matousek's linear scrambling), digit 1 being
+    the most significant bit.
+    """
+    bits = SOBOL_BITS
+    rows = [(1 << (bits - 1 - i)) | (rng.getrandbits(i) << (bits - i) if i else 0) for i in range(bits)]
+    out = []
+    for v in column:
+        x = 0
+        for i, row in enumerate(rows):
+            if bin(v & row).count("1") & 1:
+                x |= 1 << (bits - 1 - i)
+        out.append(x)
+    return out
+
+
+class Sobol:
+    """
+    Sobol sequence in up to SOBOL_MAX_DIM dimensions (Joe-Kuo direction
+    numbers), generated in Gray-code order with one XOR per coordinate.
+    Args:
+        d: int, dimension (1..SOBOL_MAX_DIM)
+        scramble: Optional[str], None, "shift" (Cranley-Patterson random
+            shift modulo 1) or "owen" (linear matrix scrambling plus random
+            digital shift, the usual affine approximation of Owen scrambling)
+        seed: Optional[int], seed for the scrambling
+    Raises:
+        ValueError: if d is out of range or scramble is unknown
+    """
+    def __init__(self, d: int, scramble: Optional[str] = None, seed: Optional[int] = None):
+        if not 1 <= d <= SOBOL_MAX_DIM:
+            raise ValueError(f"d must be in [1, {SOBOL_MAX_DIM}]")
+        _check_scramble(scramble)
+        self.d = d
+        self.scramble = scramble
+        rng = random.Random(seed)
+        columns = _sobol_direction_columns(d)
+        self._digital_shift = [0] * d
+        self._shift = [0.0] * d
+        if scramble == "owen":
+            columns = [_linear_matrix_scramble(c, rng) for c in columns]
+            self._digital_shift = [rng.getrandbits(SOBOL_BITS) for _ in range(d)]
+        elif scramble == "shift":
+            self._shift = [rng.random() for _ in range(d)]
+        # _v[k] holds direction number k of every dimension, for the Gray-code update.
+        self._v = [list(row) for row in zip(*columns)]
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart the sequence at its first point."""
+        self.index = 0
+        self._x = list(self._digital_shift)
+
+    def fast_forward(self, k: int) -> None:
+        """
+        Skip k points in O(SOBOL_BITS * d).
+        Raises:
+            ValueError: if k is negative or the sequence would be exhausted
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        i = self.index + k
+        if i > 1 << SOBOL_BITS:
+            raise ValueError("Sobol sequence exhausted")
+        gray = i ^ (i >> 1)
+        x = list(self._digital_shift)
+        bit = 0
+        while gray:
+            if gray & 1:
+                x = [a ^ b for a, b in zip(x, self._v[bit])]
+            gray >>= 1
+            bit += 1
+        self.index = i
+        self._x = x
+
+    def random(self, n: int) -> List[List[float]]:
+        """
+        Next n points as a list of d-element lists of floats in [0,1).
+        Raises:
+            ValueError: if n is negative or the sequence would be exhausted
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if self.index + n > 1 << SOBOL_BITS:
+            raise ValueError("Sobol sequence exhausted")
+        scale, v, x, i = _SOBOL_SCALE, self._v, self._x, self.index
+        shift = self._shift if self.scramble == "shift" else None
+        points = []
+        for _ in range(n):
+            if shift is None:
+                points.append([xj * scale for xj in x])
+            else:
+                points.append([(xj * scale + s) % 1.0 for xj, s in zip(x, shift)])
+            i += 1
+            # Gray code: the next point flips direction number ctz(i).
+            if i < 1 << SOBOL_BITS:
+                x = [a ^ b for a, b in zip(x, v[(i & -i).bit_length() - 1])]
+        self.index, self._x = i, x
+        return points
+
+
+def first_primes(d: int) -> List[int]:
+    """The first d primes, cached."""
+    candidate = _primes[-1] + 1 if _primes else 2
+    while len(_primes) < d:
+        if all(candidate % p for p in _primes if p * p <= candidate):
+            _primes.append(candidate)
+        candidate += 1
+    return _primes[:d]
+
+
+class Halton:
+    """
+    Halton sequence: coordinate j is the radical inverse of the index in the
+    j-th prime base.
+    Args:
+        d: int, dimension (>= 1)
+        scramble: Optional[str], None, "shift" (Cranley-Patterson random
+            shift modulo 1) or "owen" (an independent random digit permutation
+            for every base and digit position, applied to the implicit
+            leading zeros as well)
+        seed: Optional[int], seed for the scrambling
+    Raises:
+        ValueError: if d < 1 or scramble is unknown
+    """
+    def __init__(self, d: int, scramble: Optional[str] = None, seed: Optional[int] = None):
+        if d < 1:
+            raise ValueError("d must be positive")
+        _check_scramble(scramble)
+        self.d = d
+        self.scramble = scramble
+        self.bases = first_primes(d)
+        rng = random.Random(seed)
+        self._shift = [rng.random() for _ in range(d)] if scramble == "shift" else None
+        self._perms: Optional[List[List[List[int]]]] = None
+        self._tails: Optional[List[List[float]]] = None
+        if scramble == "owen":
+            self._perms, self._tails = [], []
+            for b in self.bases:
+                depth = max(1, math.ceil(HALTON_PRECISION_BITS / math.log2(b)))
+                perms = []
+                for _ in range(depth):
+                    perm = list(range(b))
+                    rng.shuffle(perm)
+                    perms.append(perm)
+                # tails[k]: contribution of permuted zero digits at positions >= k.
+                tails = [0.0] * (depth + 1)
+                for k in range(depth - 1, -1, -1):
+                    tails[k] = tails[k + 1] + perms[k][0] / b ** (k + 1)
+                self._perms.append(perms)
+                self._tails.append(tails)
+        self.index = 0
+
+    def reset(self) -> None:
+        """Restart the sequence at its first point."""
+        self.index = 0
+
+    def fast_forward(self, k: int) -> None:
+        """
+        Skip k points in O(1).
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.index += k
+
+    def _coordinate(self, j: int, i: int) -> float:
+        b = self.bases[j]
+        inv_b = 1.0 / b
+        value, scale = 0.0, inv_b
+        if self._perms is None:
+            while i:
+                i, digit = divmod(i, b)
+                value += digit * scale
+                scale *= inv_b
+            return value
+        perms, tails = self._perms[j], self._tails[j]
+        depth = len(perms)
+        k = 0
+        while i and k < depth:
+            i, digit = divmod(i, b)
+            value += perms[k][digit] * scale
+            scale *= inv_b
+            k += 1
+        return value + tails[k]
+
+    def random(self, n: int) -> List[List[float]]:
+        """
+        Next n points as a list of d-element lists of floats in [0,1).
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        d, shift, coord = self.d, self._shift, self._coordinate
+        points = []
+        for i in range(self.index, self.index + n):
+            point = [coord(j, i) for j in range(d)]
+            if shift is not None:
+                point = [(x + s) % 1.0 for x, s in zip(point, shift)]
+            points.append(point)
+        self.index += n
+        return points
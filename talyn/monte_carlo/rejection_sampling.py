@@ -1,16 +1,35 @@
 """
 Talyn Monte Carlo: rejection sampling implementation.
 """
+import math
 import random
-from typing import Callable, List
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# Block sizes for batched proposals: the first block, and bounds on later ones.
+REJECTION_MIN_BLOCK = 64
+REJECTION_MAX_BLOCK = 1 << 16
+# Oversizing factor applied to the block predicted from the acceptance rate.
+REJECTION_BLOCK_SLACK = 1.2
+
+
+def _next_block(remaining: int, accepted: int, proposed: int) -> int:
+    """Proposals expected to yield the remaining samples at the observed acceptance rate."""
+    rate = (accepted + 1) / (proposed + 2)  # Laplace-smoothed, never 0
+    m = math.ceil(REJECTION_BLOCK_SLACK * remaining / rate)
+    return min(max(m, REJECTION_MIN_BLOCK), REJECTION_MAX_BLOCK)
+
 
 def rejection_sampling(
-    target_pdf: Callable[[float], float], 
+    target_pdf: Callable[[float], float],
     proposal_pdf: Callable[[float], float],
     proposal_sampler: Callable[[], float],
     M: float,
-    n_samples: int = 1000
-) -> List[float]:
+    n_samples: int = 1000,
+    batched: bool = False,
+    vectorized: bool = False,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+) -> Union[List[float], Dict[str, Any]]:
     """
     Generate samples from target distribution using rejection sampling.
     Args:
@@ -19,13 +38,50 @@ def rejection_sampling(
         proposal_sampler: Function to sample from proposal distribution
         M: Upper bound on target_pdf(x)/(proposal_pdf(x))
         n_samples: Number of desired samples
+        batched: Propose in blocks and accept by mask; each block is sized
+            from the acceptance rate observed so far to finish in one step
+        vectorized: Implies batched; proposal_sampler(m) returns m points and
+            target_pdf/proposal_pdf map a list of points to a list of densities
+        seed: Optional RNG seed for the acceptance uniforms (default: global random module)
+        return_stats: Return a dict with "samples", "proposals" and "acceptance_rate"
     Returns:
         List of accepted samples
+    Raises:
+        ValueError: if M is not positive
     """
+    if M <= 0:
+        raise ValueError("M must be positive")
+    rand = random.random if seed is None else random.Random(seed).random
     samples = []
-    while len(samples) < n_samples:
-        x = proposal_sampler()
-        u = random.random()
-        if u * M * proposal_pdf(x) <= target_pdf(x):
-            samples.append(x)
-    return samples
+    proposed = 0
+    if not (batched or vectorized):
+        while len(samples) < n_samples:
+            x = proposal_sampler()
+            u = rand()
+            proposed += 1
+            if u * M * proposal_pdf(x) <= target_pdf(x):
+                samples.append(x)
+        accepted = len(samples)
+    else:
+        while len(samples) < n_samples:
+            m = _next_block(n_samples - len(samples), len(samples), proposed)
+            if vectorized:
+                xs = list(proposal_sampler(m))
+                fx = target_pdf(xs)
+                gx = proposal_pdf(xs)
+            else:
+                xs = [proposal_sampler() for _ in range(m)]
+                fx = [target_pdf(x) for x in xs]
+                gx = [proposal_pdf(x) for x in xs]
+            proposed += m
+            samples.extend(x for x, f, g in zip(xs, fx, gx) if rand() * M * g <= f)
+        accepted = len(samples)
+        # Trailing accepted points beyond n_samples are dropped; the kept ones stay i.i.d.
+        del samples[n_samples:]
+    if not return_stats:
+        return samples
+    return {
+        "samples": samples,
+        "proposals": proposed,
+        "acceptance_rate": accepted / proposed if proposed else 0.0,
+    }
@@ -1,28 +1,161 @@
 """
 Talyn Monte Carlo: stratified sampling variance reduction.
 """
+import math
 import random
-from typing import Callable
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .adaptive import DEFAULT_BATCH_SIZE, DEFAULT_CONFIDENCE, adaptive_mean, check_tolerances
+from .parallel import chunk_seeds, run_parallel
+
+STRATIFIED_ALLOCATIONS = ("equal", "neyman")
+# Share of the budget spent on the pilot pass of Neyman allocation.
+NEYMAN_PILOT_FRACTION = 0.1
+NEYMAN_MIN_PILOT = 2
+
+
+def _stratum_chunk(f: Callable[[float], float], a: float, b: float, m: int, chunk_seed: int) -> Tuple[float, float]:
+    """(sum, sum of squares) of f at m uniform points of [a, b) from the stratum's own stream."""
+    rand = random.Random(chunk_seed).random
+    width = b - a
+    total = total_sq = 0.0
+    for _ in range(m):
+        y = f(a + width * rand())
+        total += y
+        total_sq += y * y
+    return total, total_sq
+
+
+def _neyman_counts(sds, budget: int):
+    """Split budget across strata in proportion to their standard deviations (largest remainder)."""
+    total = math.fsum(sds)
+    if total <= 0:
+        shares = [budget / len(sds)] * len(sds)
+    else:
+        shares = [budget * s / total for s in sds]
+    counts = [int(x) for x in shares]
+    order = sorted(range(len(sds)), key=lambda i: shares[i] - counts[i], reverse=True)
+    for i in order[:budget - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _neyman_stratified(f, strata, budget, seed):
+    """Pilot pass, then Neyman allocation of the remaining budget; pilot samples are kept."""
+    rand = random.random if seed is None else random.Random(seed).random
+    pilot = max(NEYMAN_MIN_PILOT, int(budget * NEYMAN_PILOT_FRACTION / strata))
+    sums = [0.0] * strata
+    sqs = [0.0] * strata
+    counts = [0] * strata
+
+    def draw(i, m):
+        a = i / strata
+        for _ in range(m):
+            y = f(a + rand() / strata)
+            sums[i] += y
+            sqs[i] += y * y
+        counts[i] += m
+
+    def sd(i):
+        m = counts[i]
+        mean = sums[i] / m
+        return math.sqrt(max(sqs[i] / m - mean * mean, 0.0) * m / (m - 1))
+
+    for i in range(strata):
+        draw(i, pilot)
+    extra = _neyman_counts([sd(i) for i in range(strata)], max(budget - pilot * strata, 0))
+    for i in range(strata):
+        draw(i, extra[i])
+    estimate = math.fsum(sums[i] / counts[i] for i in range(strata)) / strata
+    var = math.fsum(sd(i) ** 2 / counts[i] for i in range(strata)) / (strata * strata)
+    return estimate, math.sqrt(var), sum(counts)
+
 
 def stratified_sampling(
     f: Callable[[float], float], 
     strata: int = 10,
-    samples_per_stratum: int = 100
-) -> float:
+    samples_per_stratum: int = 100,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+    allocation: str = "equal",
+    abs_tol: Optional[float] = None,
+    rel_tol: Optional[float] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Union[float, Dict[str, Any]]:
     """
     Estimate E[f(X)] using stratified sampling.
     Args:
-        f: Function to estimate expectation of
+        f: Function to estimate expectation of (picklable when workers > 1)
         strata: Number of strata (0,1] is divided into
         samples_per_stratum: Samples per stratum
+        workers: Processes to split the strata across (default 1)
+        seed: Optional base seed; with a seed the result does not depend on workers
+        return_stats: Return a dict with "estimate", "std_error", "n",
+            "elapsed" and per-worker timings under "workers" instead of a float
+        allocation: "equal" (samples_per_stratum everywhere) or "neyman": a
+            pilot pass estimates each stratum's standard deviation and the
+            rest of the strata * samples_per_stratum budget is allocated in
+            proportion to it (single process)
+        abs_tol, rel_tol: Adaptive mode: draw replicates of one point per
+            stratum until the confidence half-width meets either tolerance,
+            with strata * samples_per_stratum evaluations as the budget;
+            returns the adaptive_mean dict with "n" counting evaluations
+        confidence: Confidence level for the adaptive stopping rule
     Returns:
         Estimated expectation
+    Raises:
+        ValueError: for an unknown allocation, "neyman" with workers > 1, or
+            adaptive mode with workers > 1 or "neyman"
     """
-    total = 0.0
-    for i in range(strata):
-        a = i / strata
-        b = (i + 1) / strata
-        for _ in range(samples_per_stratum):
-            x = random.uniform(a, b)
-            total += f(x)
-    return total / (strata * samples_per_stratum)
+    if allocation not in STRATIFIED_ALLOCATIONS:
+        raise ValueError(f"allocation must be one of {STRATIFIED_ALLOCATIONS}")
+    if abs_tol is not None or rel_tol is not None:
+        check_tolerances(abs_tol, rel_tol)
+        if workers != 1 or allocation != "equal":
+            raise ValueError("adaptive mode runs in a single process with equal allocation")
+        rand = random.random if seed is None else random.Random(seed).random
+
+        def sample_batch(m: int) -> List[float]:
+            # Each replicate averages one uniform point per stratum, so replicates are i.i.d.
+            return [math.fsum(f((i + rand()) / strata) for i in range(strata)) / strata for _ in range(m)]
+
+        result = adaptive_mean(sample_batch, abs_tol, rel_tol, confidence,
+                               batch_size=max(2, min(DEFAULT_BATCH_SIZE, samples_per_stratum)),
+                               max_samples=max(2, samples_per_stratum))
+        result["n"] *= strata
+        return result
+    if allocation == "neyman":
+        if workers != 1:
+            raise ValueError("neyman allocation runs in a single process")
+        t0 = time.perf_counter()
+        estimate, std_error, n = _neyman_stratified(f, strata, strata * samples_per_stratum, seed)
+        stats = {"estimate": estimate, "std_error": std_error, "n": n,
+                 "elapsed": time.perf_counter() - t0, "workers": []}
+        return stats if return_stats else estimate
+    if workers == 1 and seed is None and not return_stats:
+        total = 0.0
+        for i in range(strata):
+            a = i / strata
+            b = (i + 1) / strata
+            for _ in range(samples_per_stratum):
+                x = random.uniform(a, b)
+                total += f(x)
+        return total / (strata * samples_per_stratum)
+    m = samples_per_stratum
+    seeds = chunk_seeds(seed, strata)
+    t0 = time.perf_counter()
+    sums, timings = run_parallel(
+        _stratum_chunk, [(f, i / strata, (i + 1) / strata, m, seeds[i]) for i in range(strata)], workers)
+    elapsed = time.perf_counter() - t0
+    estimate = math.fsum(s for s, _ in sums) / (strata * m)
+    # Var = sum_h (1/H)^2 s_h^2 / m with the within-stratum sample variances s_h^2.
+    var = 0.0
+    if m > 1:
+        for s, sq in sums:
+            mean = s / m
+            var += max(sq / m - mean * mean, 0.0) * m / (m - 1) / m
+        var /= strata * strata
+    stats = {"estimate": estimate, "std_error": math.sqrt(var), "n": strata * m,
+             "elapsed": elapsed, "workers": timings}
+    return stats if return_stats else estimate
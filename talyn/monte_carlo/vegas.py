@@ -0,0 +1,153 @@
+"""
+Talyn Monte Carlo: VEGAS adaptive importance sampling (Lepage, 1978).
+"""
+import math
+import random
+from typing import Any, Callable, Dict, List, Optional
+from .bounds import Bound, normalize_bounds
+
+VEGAS_BINS = 50
+# Grid damping exponent: 0 freezes the grid, larger values adapt faster.
+VEGAS_ALPHA = 1.5
+VEGAS_ITERATIONS = 10
+# Early iterations used only to train the grid, not in the final estimate.
+VEGAS_WARMUP = 2
+
+
+def _refine(edges: List[float], weights: List[float], alpha: float) -> List[float]:
+    """Move the grid edges so every new bin holds an equal share of the damped importance."""
+    nb = len(weights)
+    # Smooth with neighbours, as in Lepage's algorithm, to avoid erratic grids.
+    if nb > 1:
+        smooth = [(weights[0] + weights[1]) / 2]
+        smooth += [(weights[i - 1] + weights[i] + weights[i + 1]) / 3 for i in range(1, nb - 1)]
+        smooth.append((weights[-2] + weights[-1]) / 2)
+    else:
+        smooth = list(weights)
+    total = math.fsum(smooth)
+    if total <= 0:
+        return edges
+    r = []
+    for w in smooth:
+        frac = w / total
+        if frac <= 0.0:
+            r.append(0.0)
+        elif frac >= 1.0:
+            r.append(1.0)
+        else:
+            r.append(((frac - 1.0) / math.log(frac)) ** alpha)
+    per_bin = math.fsum(r) / nb
+    if per_bin <= 0:
+        return edges
+    new = [edges[0]]
+    acc = 0.0
+    i = 0
+    for _ in range(nb - 1):
+        target = per_bin
+        while acc < target:
+            acc += r[i]
+            i += 1
+        acc -= target
+        # Interpolate inside old bin i - 1, which overshot by acc.
+        lo, hi = edges[i - 1], edges[i]
+        new.append(hi - (hi - lo) * acc / r[i - 1])
+    new.append(edges[-1])
+    return new
+
+
+def vegas(
+    f: Callable[[List[float]], float],
+    a: Bound,
+    b: Bound,
+    n_per_iteration: int = 10000,
+    iterations: int = VEGAS_ITERATIONS,
+    warmup: int = VEGAS_WARMUP,
+    bins: int = VEGAS_BINS,
+    alpha: float = VEGAS_ALPHA,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Integrate f over a hyperrectangle with the VEGAS algorithm.
+    Each axis carries a piecewise-uniform sampling density on `bins`
+    intervals; after every iteration the intervals are resized so each
+    carries an equal share of (f * jacobian)^2, concentrating points where
+    |f| is large. Works best when f is roughly a product of 1-D peaks.
+    Args:
+        f: Function to integrate; takes a list of coordinates (a float for scalar bounds)
+        a: Lower bound (float) or per-axis lower bounds
+        b: Upper bound (float) or per-axis upper bounds
+        n_per_iteration: Function evaluations per iteration
+        iterations: Total iterations, including warmup
+        warmup: Leading iterations that only adapt the grid
+        bins: Grid intervals per axis
+        alpha: Grid damping exponent
+        seed: Optional RNG seed (default: global random module)
+    Returns:
+        Dict with "estimate", "std_error" (inverse-variance weighted over the
+        post-warmup iterations), "chi2_dof" (consistency of those iterations,
+        should be near 1), "n" (function evaluations) and "edges" (final grid, in [0,1] units)
+    Raises:
+        ValueError: for invalid bounds, n_per_iteration < 2 or warmup >= iterations
+    """
+    if n_per_iteration < 2:
+        raise ValueError("n_per_iteration must be at least 2")
+    if not 0 <= warmup < iterations:
+        raise ValueError("warmup must be in [0, iterations)")
+    lo, hi, scalar = normalize_bounds(a, b)
+    d = len(lo)
+    widths = [h - l for l, h in zip(lo, hi)]
+    volume = math.prod(widths)
+    rand = random.random if seed is None else random.Random(seed).random
+    edges = [[k / bins for k in range(bins + 1)] for _ in range(d)]
+    estimates, variances = [], []
+    for it in range(iterations):
+        importance = [[0.0] * bins for _ in range(d)]
+        total = total_sq = 0.0
+        for _ in range(n_per_iteration):
+            jac = volume
+            x = []
+            idx = []
+            for j in range(d):
+                y = rand() * bins
+                i = int(y)
+                if i >= bins:
+                    i = bins - 1
+                e = edges[j]
+                w = e[i + 1] - e[i]
+                x.append(lo[j] + widths[j] * (e[i] + w * (y - i)))
+                jac *= bins * w
+                idx.append(i)
+            val = f(x[0] if scalar else x) * jac
+            total += val
+            total_sq += val * val
+            v2 = val * val
+            for j in range(d):
+                importance[j][idx[j]] += v2
+        n = n_per_iteration
+        mean = total / n
+        var = max(total_sq / n - mean * mean, 0.0) / (n - 1)
+        if it >= warmup:
+            estimates.append(mean)
+            variances.append(var)
+        for j in range(d):
+            edges[j] = _refine(edges[j], importance[j], alpha)
+
+    if all(v > 0 for v in variances):
+        weights = [1.0 / v for v in variances]
+        wsum = math.fsum(weights)
+        estimate = math.fsum(w * e for w, e in zip(weights, estimates)) / wsum
+        std_error = math.sqrt(1.0 / wsum)
+        k = len(estimates)
+        chi2_dof = (math.fsum((e - estimate) ** 2 / v for e, v in zip(estimates, variances)) / (k - 1)
+                    if k > 1 else 0.0)
+    else:
+        # A zero-variance iteration is exact (e.g. a constant integrand).
+        estimate = math.fsum(estimates) / len(estimates)
+        std_error, chi2_dof = 0.0, 0.0
+    return {
+        "estimate": estimate,
+        "std_error": std_error,
+        "chi2_dof": chi2_dof,
+        "n": n_per_iteration * iterations,
+        "edges": edges,
+    }
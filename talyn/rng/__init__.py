@@ -4,13 +4,26 @@ Talyn RNG package.
 
 from .lcg import LCG
 from .xorshift import XORShift32
-from .stats import rng_histogram, print_ascii_histogram, chi_square_statistic, chi_square_degrees_of_freedom
+from .philox import Philox, philox4x32
+from .pcg import PCG64
+from .xoshiro import Xoshiro256, splitmix64
+from .stats import (
+    rng_histogram, print_ascii_histogram, chi_square_statistic, chi_square_degrees_of_freedom,
+    run_battery, print_battery_report,
+)
 
 __all__ = [
     "LCG",
     "XORShift32",
+    "Philox",
+    "philox4x32",
+    "PCG64",
+    "Xoshiro256",
+    "splitmix64",
     "rng_histogram",
     "print_ascii_histogram",
     "chi_square_statistic",
     "chi_square_degrees_of_freedom",
+    "run_battery",
+    "print_battery_report",
 ]
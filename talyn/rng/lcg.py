@@ -1,6 +1,8 @@
 """
 LCG pseudorandom number generator.
 """
+from array import array
+
 
 class LCG:
     """
@@ -19,3 +21,59 @@ class LCG:
         """
         self.state = (self.a * self.state + self.c) % self.m
         return self.state / self.m
+
+    def fill(self, n: int) -> array:
+        """
+        Advance n steps and return the raw states X_1..X_n as an array('Q').
+        Requires m <= 2**64.
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        a, c, m = self.a, self.c, self.m
+        x = self.state
+        out = array('Q', bytes(8 * n))
+        for i in range(n):
+            x = (a * x + c) % m
+            out[i] = x
+        self.state = x
+        return out
+
+    def random_block(self, n: int) -> array:
+        """
+        Generate n floats in [0,1) as an array('d'), identical to n calls of random().
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        a, c, m = self.a, self.c, self.m
+        x = self.state
+        out = array('d', bytes(8 * n))
+        for i in range(n):
+            x = (a * x + c) % m
+            out[i] = x / m
+        self.state = x
+        return out
+
+    def jump(self, k: int) -> None:
+        """
+        Advance the state by k steps in O(log k) by squaring the affine map
+        x -> a*x + c (mod m). Jumping a copy by k, 2k, ... gives
+        non-overlapping substreams of length k.
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        m = self.m
+        # (A, C) accumulates the composed map, (a, c) the current power-of-two step.
+        A, C = 1, 0
+        a, c = self.a % m, self.c % m
+        while k:
+            if k & 1:
+                A, C = (a * A) % m, (a * C + c) % m
+            a, c = (a * a) % m, (a * c + c) % m
+            k >>= 1
+        self.state = (A * self.state + C) % m
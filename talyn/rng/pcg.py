@@ -0,0 +1,100 @@
+"""
+PCG64 pseudorandom number generator (O'Neill, 2014).
+
+A 128-bit LCG whose output is permuted by the XSL-RR function (xor the two
+64-bit halves, rotate by the top 6 bits), which removes the weak low bits of
+the plain LCG. Period 2**128 per stream, 2**127 selectable streams.
+"""
+from array import array
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+MASK128 = (1 << 128) - 1
+PCG64_MULTIPLIER = 0x2360ED051FC65DA44385DF649FCCF645
+_TWO_POW_53 = 9007199254740992.0
+
+
+class PCG64:
+    """
+    PCG64 (XSL-RR 128/64) producing 64-bit integers and 53-bit floats in [0,1).
+    Seeding follows pcg_setseq_128_srandom_r.
+    Args:
+        seed: int, initial state (up to 128 bits)
+        stream: int, stream selector (up to 127 bits, default 0)
+    """
+    def __init__(self, seed: int, stream: int = 0):
+        self.inc = ((stream << 1) | 1) & MASK128
+        self.state = 0
+        self._step()
+        self.state = (self.state + seed) & MASK128
+        self._step()
+
+    def _step(self) -> None:
+        self.state = (self.state * PCG64_MULTIPLIER + self.inc) & MASK128
+
+    def next64(self) -> int:
+        """Advance one step and return the next 64-bit output."""
+        s = (self.state * PCG64_MULTIPLIER + self.inc) & MASK128
+        self.state = s
+        x = ((s >> 64) ^ s) & MASK64
+        rot = s >> 122
+        return ((x >> rot) | (x << (64 - rot))) & MASK64
+
+    def random(self) -> float:
+        """Generate next pseudorandom number as float in [0,1) with 53 random bits."""
+        return (self.next64() >> 11) / _TWO_POW_53
+
+    def fill(self, n: int) -> array:
+        """
+        Return the next n 64-bit outputs as an array('Q').
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        out = array('Q', bytes(8 * n))
+        s, inc, mult, m64, m128 = self.state, self.inc, PCG64_MULTIPLIER, MASK64, MASK128
+        for i in range(n):
+            s = (s * mult + inc) & m128
+            x = ((s >> 64) ^ s) & m64
+            rot = s >> 122
+            out[i] = ((x >> rot) | (x << (64 - rot))) & m64
+        self.state = s
+        return out
+
+    def random_block(self, n: int) -> array:
+        """
+        Generate n floats in [0,1) as an array('d'), identical to n calls of random().
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        out = array('d', bytes(8 * n))
+        s, inc, mult, m64, m128 = self.state, self.inc, PCG64_MULTIPLIER, MASK64, MASK128
+        for i in range(n):
+            s = (s * mult + inc) & m128
+            x = ((s >> 64) ^ s) & m64
+            rot = s >> 122
+            out[i] = ((((x >> rot) | (x << (64 - rot))) & m64) >> 11) / _TWO_POW_53
+        self.state = s
+        return out
+
+    def jump(self, k: int) -> None:
+        """
+        Advance the state by k steps in O(log k) (Brown's LCG jump-ahead).
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        acc_mult, acc_plus = 1, 0
+        cur_mult, cur_plus = PCG64_MULTIPLIER, self.inc
+        k &= MASK128
+        while k:
+            if k & 1:
+                acc_mult = (acc_mult * cur_mult) & MASK128
+                acc_plus = (acc_plus * cur_mult + cur_plus) & MASK128
+            cur_plus = ((cur_mult + 1) * cur_plus) & MASK128
+            cur_mult = (cur_mult * cur_mult) & MASK128
+            k >>= 1
+        self.state = (acc_mult * self.state + acc_plus) & MASK128
@@ -0,0 +1,169 @@
+"""
+Philox4x32-10 counter-based pseudorandom number generator.
+
+Output block i of stream s is a pure function of (seed, s, i), so any
+position can be reached in O(1) and independent streams need no jump
+tables: give each parallel task its own stream_id and results do not
+depend on how tasks are scheduled (Salmon et al., 2011).
+"""
+from array import array
+from typing import Tuple
+
+MASK32 = 0xFFFFFFFF
+MASK64 = 0xFFFFFFFFFFFFFFFF
+PHILOX_M0 = 0xD2511F53
+PHILOX_M1 = 0xCD9E8D57
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+PHILOX_ROUNDS = 10
+
+# Each 128-bit block yields two 53-bit floats.
+FLOATS_PER_BLOCK = 2
+_TWO_POW_53 = 9007199254740992.0
+
+
+def philox4x32(
+    counter: Tuple[int, int, int, int],
+    key: Tuple[int, int],
+    rounds: int = PHILOX_ROUNDS,
+) -> Tuple[int, int, int, int]:
+    """
+    The Philox4x32 bijection: encrypt a 4x32-bit counter under a 2x32-bit key.
+    Args:
+        counter: Tuple[int, int, int, int], 32-bit counter words
+        key: Tuple[int, int], 32-bit key words
+        rounds: int, number of rounds (10 is the standard, crush-resistant choice)
+    Returns:
+        Tuple[int, int, int, int]: four 32-bit output words
+    """
+    c0, c1, c2, c3 = counter
+    k0, k1 = key
+    for r in range(rounds):
+        p0 = PHILOX_M0 * c0
+        p1 = PHILOX_M1 * c2
+        c0, c1, c2, c3 = ((p1 >> 32) ^ c1 ^ k0, p1 & MASK32,
+                          (p0 >> 32) ^ c3 ^ k1, p0 & MASK32)
+        k0 = (k0 + PHILOX_W0) & MASK32
+        k1 = (k1 + PHILOX_W1) & MASK32
+    return c0, c1, c2, c3
+
+
+class Philox:
+    """
+    Philox4x32-10 generator producing 53-bit floats in [0,1), keyed by
+    (seed, stream_id). The 64-bit seed is the key; the stream_id fills the
+    upper half of the counter and the block index the lower half, so every
+    stream has 2**64 blocks of its own.
+    Args:
+        seed: int, 64-bit seed
+        stream_id: int, 64-bit stream identifier (default 0)
+    """
+    def __init__(self, seed: int, stream_id: int = 0):
+        self.seed = seed & MASK64
+        self.stream_id = stream_id & MASK64
+        self._key = (self.seed & MASK32, self.seed >> 32)
+        self.position = 0
+        # Last block computed, so consecutive random() calls share one block.
+        self._cached = (-1, (0, 0, 0, 0))
+
+    def spawn(self, stream_id: int) -> "Philox":
+        """Generator for another stream under the same seed, starting at position 0."""
+        return Philox(self.seed, stream_id)
+
+    def block(self, index: int) -> Tuple[int, int, int, int]:
+        """The four 32-bit output words of block `index` of this stream (random access)."""
+        s = self.stream_id
+        return philox4x32((index & MASK32, (index >> 32) & MASK32, s & MASK32, s >> 32), self._key)
+
+    def random_at(self, position: int) -> float:
+        """Float number `position` of this stream, without changing the generator state."""
+        index = position // FLOATS_PER_BLOCK
+        if self._cached[0] == index:
+            w = self._cached[1]
+        else:
+            w = self.block(index)
+            self._cached = (index, w)
+        j = 2 * (position % FLOATS_PER_BLOCK)
+        return ((w[j] >> 5) * 67108864 + (w[j + 1] >> 6)) / _TWO_POW_53
+
+    def random(self) -> float:
+        """Generate next pseudorandom number as float in [0,1)."""
+        x = self.random_at(self.position)
+        self.position += 1
+        return x
+
+    def seek(self, position: int) -> None:
+        """
+        Move to float number `position` of the stream in O(1).
+        Raises:
+            ValueError: if position is negative
+        """
+        if position < 0:
+            raise ValueError("position must be non-negative")
+        self.position = position
+
+    def jump(self, k: int) -> None:
+        """
+        Advance by k floats in O(1).
+        Raises:
+            ValueError: if k is negative
+        """
+        self.seek(self.position + k)
+
+    def fill(self, n: int) -> array:
+        """
+        Return the next n blocks as 4*n raw 32-bit words in an array('L').
+        Block-aligned: starts at the block holding the current position and
+        leaves the position at the start of the following block.
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        first = self.position // FLOATS_PER_BLOCK
+        out = array('L')
+        for b in range(first, first + n):
+            out.extend(self.block(b))
+        self.position = (first + n) * FLOATS_PER_BLOCK
+        return out
+
+    def random_block(self, n: int) -> array:
+        """
+        Generate n floats in [0,1) as an array('d'), identical to n calls of random().
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        out = array('d', bytes(8 * n))
+        pos = self.position
+        end = pos + n
+        i = 0
+        if pos % FLOATS_PER_BLOCK and n:
+            out[0] = self.random_at(pos)
+            pos += 1
+            i = 1
+        # Whole blocks, with the Philox rounds inlined for throughput.
+        k0, k1 = self._key
+        s0, s1 = self.stream_id & MASK32, self.stream_id >> 32
+        m0, m1, w0, w1, mask = PHILOX_M0, PHILOX_M1, PHILOX_W0, PHILOX_W1, MASK32
+        rounds = range(PHILOX_ROUNDS)
+        while end - pos >= FLOATS_PER_BLOCK:
+            index = pos // FLOATS_PER_BLOCK
+            c0, c1, c2, c3 = index & mask, (index >> 32) & mask, s0, s1
+            a0, a1 = k0, k1
+            for _ in rounds:
+                p0 = m0 * c0
+                p1 = m1 * c2
+                c0, c1, c2, c3 = (p1 >> 32) ^ c1 ^ a0, p1 & mask, (p0 >> 32) ^ c3 ^ a1, p0 & mask
+                a0 = (a0 + w0) & mask
+                a1 = (a1 + w1) & mask
+            out[i] = ((c0 >> 5) * 67108864 + (c1 >> 6)) / _TWO_POW_53
+            out[i + 1] = ((c2 >> 5) * 67108864 + (c3 >> 6)) / _TWO_POW_53
+            i += 2
+            pos += 2
+        if pos < end:
+            out[i] = self.random_at(pos)
+            pos += 1
+        self.position = pos
+        return out
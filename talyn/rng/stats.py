@@ -1,7 +1,13 @@
 """
-RNG benchmarking utilities: histogram test and chi-square statistic.
+RNG benchmarking utilities: histogram test, chi-square statistic and a
+streaming test battery with p-values and throughput.
 """
-from typing import Callable, List
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+from ..distributions.batch import uniform_block
+from ..distributions.special import gammaincc
 
 
 def rng_histogram(rng: Callable[[], float], n: int = 10000, bins: int = 10) -> List[int]:
@@ -50,3 +56,310 @@ def chi_square_degrees_of_freedom(counts: List[int]) -> int:
     Degrees of freedom for chi-square test = bins - 1.
     """
     return max(len(counts) - 1, 0)
+
+
+# ---------------------------------------------------------------------------
+# Streaming test battery
+# ---------------------------------------------------------------------------
+# Every test consumes the generator output block by block in O(1) memory and
+# reports a p-value; p-values very close to 0 (or 1, for chi-square tests that
+# fit "too well") flag a defective generator.
+
+BATTERY_BLOCK_SIZE = 1 << 16
+SERIAL_PAIR_DIVISIONS = 16
+SERIAL_TRIPLE_DIVISIONS = 8
+GAP_LOWER = 0.0
+GAP_UPPER = 0.5
+GAP_MAX_LENGTH = 10
+RUNS_MAX_LENGTH = 6
+BIRTHDAYS = 512
+BIRTHDAY_DAYS_LOG2 = 24
+BIRTHDAY_MAX_COUNT = 6
+
+
+def chi_square_p_value(statistic: float, df: int) -> float:
+    """Upper-tail p-value P(X >= statistic) for X ~ chi-square(df)."""
+    if df <= 0:
+        return 1.0
+    return gammaincc(df / 2.0, statistic / 2.0)
+
+
+def normal_p_value(z: float) -> float:
+    """Two-sided p-value P(|Z| >= |z|) for a standard normal Z."""
+    return math.erfc(abs(z) / math.sqrt(2.0))
+
+
+def _chi_square(counts: Sequence[int], probs: Sequence[float]) -> float:
+    """Pearson statistic of counts against cell probabilities."""
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    return sum((c - total * p) ** 2 / (total * p) for c, p in zip(counts, probs))
+
+
+def _result(name: str, statistic: float, p_value: float) -> Dict[str, Any]:
+    return {"name": name, "statistic": statistic, "p_value": p_value}
+
+
+class FrequencyTest:
+    """1-D equidistribution: chi-square of the histogram over `bins` cells."""
+    name = "frequency"
+
+    def __init__(self, bins: int = 100):
+        self.counts = [0] * bins
+
+    def update(self, block: Sequence[float]) -> None:
+        counts = self.counts
+        bins = len(counts)
+        last = bins - 1
+        for u in block:
+            i = int(u * bins)
+            counts[i if i < bins else last] += 1
+
+    def result(self) -> Dict[str, Any]:
+        stat = chi_square_statistic(self.counts)
+        return _result(self.name, stat, chi_square_p_value(stat, chi_square_degrees_of_freedom(self.counts)))
+
+
+class SerialTest:
+    """
+    Serial test: non-overlapping d-tuples binned into divisions**d cells must
+    be uniform; catches lattice structure that the 1-D histogram misses.
+    """
+    def __init__(self, dim: int = 2, divisions: int = SERIAL_PAIR_DIVISIONS):
+        self.name = {2: "serial_pairs", 3: "serial_triples"}.get(dim, f"serial_{dim}-tuples")
+        self.dim = dim
+        self.divisions = divisions
+        self.counts = [0] * divisions ** dim
+        self._carry: List[float] = []
+
+    def update(self, block: Sequence[float]) -> None:
+        data = self._carry + list(block) if self._carry else block
+        d, k = self.dim, self.divisions
+        usable = len(data) - len(data) % d
+        counts = self.counts
+        for start in range(0, usable, d):
+            cell = 0
+            for u in data[start:start + d]:
+                cell = cell * k + min(int(u * k), k - 1)
+            counts[cell] += 1
+        self._carry = list(data[usable:])
+
+    def result(self) -> Dict[str, Any]:
+        stat = chi_square_statistic(self.counts)
+        return _result(self.name, stat, chi_square_p_value(stat, len(self.counts) - 1))
+
+
+class GapTest:
+    """
+    Gap test (Knuth 3.3.2.D): lengths of the gaps between visits to
+    [lower, upper) are geometric with p = upper - lower.
+    """
+    name = "gap"
+
+    def __init__(self, lower: float = GAP_LOWER, upper: float = GAP_UPPER, max_length: int = GAP_MAX_LENGTH):
+        self.lower, self.upper = lower, upper
+        self.max_length = max_length
+        self.counts = [0] * (max_length + 1)
+        self._gap = 0
+
+    def update(self, block: Sequence[float]) -> None:
+        lower, upper, t, counts = self.lower, self.upper, self.max_length, self.counts
+        gap = self._gap
+        for u in block:
+            if lower <= u < upper:
+                counts[gap if gap < t else t] += 1
+                gap = 0
+            else:
+                gap += 1
+        self._gap = gap
+
+    def result(self) -> Dict[str, Any]:
+        p = self.upper - self.lower
+        t = self.max_length
+        probs = [p * (1 - p) ** r for r in range(t)] + [(1 - p) ** t]
+        stat = _chi_square(self.counts, probs)
+        return _result(self.name, stat, chi_square_p_value(stat, t))
+
+
+class RunsUpTest:
+    """
+    Runs-up test (Knuth 3.3.2.G, independent form): the element that breaks
+    an ascending run is discarded, so run lengths are i.i.d. with
+    P(length = r) = r / (r + 1)!.
+    """
+    name = "runs_up"
+
+    def __init__(self, max_length: int = RUNS_MAX_LENGTH):
+        self.max_length = max_length
+        self.counts = [0] * max_length
+        self._prev: Optional[float] = None
+        self._length = 0
+        self._skip = False
+
+    def update(self, block: Sequence[float]) -> None:
+        t, counts = self.max_length, self.counts
+        prev, length, skip = self._prev, self._length, self._skip
+        for u in block:
+            if skip:
+                skip = False
+            elif length == 0:
+                prev, length = u, 1
+            elif u > prev:
+                prev = u
+                length += 1
+            else:
+                counts[min(length, t) - 1] += 1
+                length = 0
+                skip = True
+        self._prev, self._length, self._skip = prev, length, skip
+
+    def result(self) -> Dict[str, Any]:
+        t = self.max_length
+        probs = [r / math.factorial(r + 1) for r in range(1, t)] + [1.0 / math.factorial(t)]
+        stat = _chi_square(self.counts, probs)
+        return _result(self.name, stat, chi_square_p_value(stat, t - 1))
+
+
+class BirthdaySpacingsTest:
+    """
+    Birthday spacings (Marsaglia): m birthdays in a year of 2**days_log2
+    days; the number of repeated spacings is approximately
+    Poisson(m**3 / (4 * 2**days_log2)). Uses the leading days_log2 bits.
+    """
+    name = "birthday_spacings"
+
+    def __init__(self, birthdays: int = BIRTHDAYS, days_log2: int = BIRTHDAY_DAYS_LOG2,
+                 max_count: int = BIRTHDAY_MAX_COUNT):
+        self.birthdays = birthdays
+        self.days = 1 << days_log2
+        self.max_count = max_count
+        self.lam = birthdays ** 3 / (4.0 * self.days)
+        self.counts = [0] * (max_count + 1)
+        self._sample: List[int] = []
+
+    def update(self, block: Sequence[float]) -> None:
+        m, days, sample = self.birthdays, self.days, self._sample
+        for u in block:
+            sample.append(int(u * days))
+            if len(sample) == m:
+                sample.sort()
+                spacings = sorted(b - a for a, b in zip(sample, sample[1:]))
+                repeats = sum(1 for a, b in zip(spacings, spacings[1:]) if a == b)
+                self.counts[min(repeats, self.max_count)] += 1
+                sample.clear()
+
+    def result(self) -> Dict[str, Any]:
+        lam, t = self.lam, self.max_count
+        probs = [math.exp(-lam) * lam ** j / math.factorial(j) for j in range(t)]
+        probs.append(1.0 - math.fsum(probs))
+        stat = _chi_square(self.counts, probs)
+        return _result(self.name, stat, chi_square_p_value(stat, t))
+
+
+class SerialCorrelationTest:
+    """
+    Lag-`lag` serial correlation coefficient (Knuth 3.3.2.K); under the null
+    it is approximately normal with mean -1/(n-1) and variance 1/n.
+    """
+    def __init__(self, lag: int = 1):
+        self.name = "serial_correlation" if lag == 1 else f"serial_correlation_lag{lag}"
+        self.lag = lag
+        self._window: Deque[float] = deque()
+        self.n = 0
+        self._sum = self._sum_sq = self._sum_cross = 0.0
+
+    def update(self, block: Sequence[float]) -> None:
+        window, lag = self._window, self.lag
+        s = sq = cross = 0.0
+        for u in block:
+            s += u
+            sq += u * u
+            if len(window) == lag:
+                cross += window.popleft() * u
+            window.append(u)
+        self.n += len(block)
+        self._sum += s
+        self._sum_sq += sq
+        self._sum_cross += cross
+
+    def result(self) -> Dict[str, Any]:
+        n = self.n
+        if n < 3:
+            return _result(self.name, 0.0, 1.0)
+        pairs = n - self.lag
+        mean = self._sum / n
+        var = self._sum_sq / n - mean * mean
+        r = (self._sum_cross / pairs - mean * mean) / var if var > 0 else 0.0
+        z = (r + 1.0 / (n - 1)) * math.sqrt(n)
+        return _result(self.name, r, normal_p_value(z))
+
+
+def default_battery() -> List[Any]:
+    """Fresh instances of every test in the battery."""
+    return [
+        FrequencyTest(),
+        SerialTest(2, SERIAL_PAIR_DIVISIONS),
+        SerialTest(3, SERIAL_TRIPLE_DIVISIONS),
+        GapTest(),
+        RunsUpTest(),
+        BirthdaySpacingsTest(),
+        SerialCorrelationTest(),
+    ]
+
+
+def run_battery(
+    rng: Callable[[], float],
+    n: int = 1_000_000,
+    block_size: int = BATTERY_BLOCK_SIZE,
+    tests: Optional[List[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Stream n uniforms from rng through the test battery in blocks.
+    Memory is O(block_size) regardless of n. Generators with random_block
+    (the talyn.rng classes) are drawn a block at a time.
+    Args:
+        rng: Callable[[], float], RNG function returning float in [0,1)
+        n: int, total number of uniforms
+        block_size: int, uniforms per block
+        tests: Optional list of test objects with update(block) and result() (default: default_battery())
+    Returns:
+        Dict with "results" (one dict per test: name, statistic, p_value),
+        "samples", "generation_seconds", "samples_per_second" (generation
+        throughput) and "total_seconds"
+    Raises:
+        ValueError: if n or block_size is not positive
+    """
+    if n <= 0 or block_size <= 0:
+        raise ValueError("n and block_size must be positive")
+    tests = default_battery() if tests is None else tests
+    gen_time = 0.0
+    t_start = time.perf_counter()
+    remaining = n
+    while remaining:
+        size = min(block_size, remaining)
+        t0 = time.perf_counter()
+        block = uniform_block(rng, size)
+        gen_time += time.perf_counter() - t0
+        for test in tests:
+            test.update(block)
+        remaining -= size
+    total_time = time.perf_counter() - t_start
+    return {
+        "results": [test.result() for test in tests],
+        "samples": n,
+        "generation_seconds": gen_time,
+        "samples_per_second": n / gen_time if gen_time > 0 else math.inf,
+        "total_seconds": total_time,
+    }
+
+
+def print_battery_report(report: Dict[str, Any], alpha: float = 0.001) -> None:
+    """
+    Print one line per test; p-values outside [alpha, 1 - alpha] are marked FAIL.
+    """
+    for res in report["results"]:
+        p = res["p_value"]
+        flag = "ok" if alpha <= p <= 1 - alpha else "FAIL"
+        print(f"{res['name']:<22} stat={res['statistic']:>12.4f}  p={p:.4f}  {flag}")
+    print(f"{report['samples']} samples, {report['samples_per_second']:,.0f} samples/s generated")
@@ -1,6 +1,43 @@
 """
 XORShift pseudorandom number generator.
 """
+from array import array
+from typing import List
+
+MASK32 = 0xFFFFFFFF
+
+
+def _xorshift_step(x: int) -> int:
+    """One xorshift32 transition."""
+    x ^= (x << 13) & MASK32
+    x ^= (x >> 17)
+    x ^= (x << 5) & MASK32
+    return x & MASK32
+
+
+def _gf2_apply(matrix: List[int], x: int) -> int:
+    """Multiply a GF(2) matrix, stored as 32 column bitmasks, by the bit vector x."""
+    r = 0
+    j = 0
+    while x:
+        if x & 1:
+            r ^= matrix[j]
+        x >>= 1
+        j += 1
+    return r
+
+
+# _JUMP_POWERS[i] is the transition matrix raised to 2**i, extended on demand.
+_JUMP_POWERS: List[List[int]] = [[_xorshift_step(1 << j) for j in range(32)]]
+
+
+def _jump_power(i: int) -> List[int]:
+    """Transition matrix to the power 2**i."""
+    while len(_JUMP_POWERS) <= i:
+        last = _JUMP_POWERS[-1]
+        _JUMP_POWERS.append([_gf2_apply(last, col) for col in last])
+    return _JUMP_POWERS[i]
+
 
 class XORShift32:
     """
@@ -18,3 +55,59 @@ class XORShift32:
         x ^= (x << 5) & 0xFFFFFFFF
         self.state = x & 0xFFFFFFFF
         return self.state / 2**32
+
+    def fill(self, n: int) -> array:
+        """
+        Advance n steps and return the raw 32-bit states as an array('L').
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        x = self.state
+        out = array('L', bytes(array('L').itemsize * n))
+        for i in range(n):
+            x ^= (x << 13) & MASK32
+            x ^= (x >> 17)
+            x ^= (x << 5) & MASK32
+            out[i] = x
+        self.state = x
+        return out
+
+    def random_block(self, n: int) -> array:
+        """
+        Generate n floats in [0,1) as an array('d'), identical to n calls of random().
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        x = self.state
+        out = array('d', bytes(8 * n))
+        scale = 1.0 / 2**32
+        for i in range(n):
+            x ^= (x << 13) & MASK32
+            x ^= (x >> 17)
+            x ^= (x << 5) & MASK32
+            out[i] = x * scale
+        self.state = x
+        return out
+
+    def jump(self, k: int) -> None:
+        """
+        Advance the state by k steps in O(log k): the transition is linear
+        over GF(2), so it is applied as a product of precomputed matrix
+        powers T**(2**i), one per set bit of k.
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        x = self.state
+        i = 0
+        while k:
+            if k & 1:
+                x = _gf2_apply(_jump_power(i), x)
+            k >>= 1
+            i += 1
+        self.state = x
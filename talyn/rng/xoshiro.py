@@ -0,0 +1,129 @@
+"""
+xoshiro256** pseudorandom number generator (Blackman & Vigna, 2018).
+
+256 bits of xor/shift/rotate state with a multiply-rotate-multiply
+scrambler; period 2**256 - 1. jump() and long_jump() advance by 2**128 and
+2**192 steps, splitting the period into non-overlapping substreams.
+"""
+from array import array
+from typing import Sequence
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+_TWO_POW_53 = 9007199254740992.0
+
+# Jump polynomials for 2**128 and 2**192 steps (from the reference implementation).
+XOSHIRO_JUMP = (0x180EC6D33CFD0ABA, 0xD5A61266F0C9392C, 0xA9582618E03FC9AA, 0x39ABDC4529B1661C)
+XOSHIRO_LONG_JUMP = (0x76E15D3EFEFDCBBF, 0xC5004E441C522FB3, 0x77710069854EE241, 0x39109BB02ACBE635)
+
+
+def splitmix64(x: int):
+    """
+    SplitMix64 step, used to expand an integer seed into generator state.
+    Returns:
+        Tuple[int, int]: (next state, 64-bit output)
+    """
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    z = x
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x, z ^ (z >> 31)
+
+
+class Xoshiro256:
+    """
+    xoshiro256** producing 64-bit integers and 53-bit floats in [0,1).
+    Args:
+        seed: int, seed expanded to 256 bits with SplitMix64
+        state: Optional[Sequence[int]], four 64-bit words used verbatim instead of seed
+    Raises:
+        ValueError: if the state is all zero
+    """
+    def __init__(self, seed: int = 0, state: Sequence[int] = None):
+        if state is None:
+            x = seed & MASK64
+            words = []
+            for _ in range(4):
+                x, z = splitmix64(x)
+                words.append(z)
+        else:
+            words = [w & MASK64 for w in state]
+            if len(words) != 4:
+                raise ValueError("state must have four 64-bit words")
+        if not any(words):
+            raise ValueError("state must not be all zero")
+        self.s = words
+
+    def next64(self) -> int:
+        """Advance one step and return the next 64-bit output."""
+        s0, s1, s2, s3 = self.s
+        r = (s1 * 5) & MASK64
+        r = (((r << 7) | (r >> 57)) * 9) & MASK64
+        t = (s1 << 17) & MASK64
+        s2 ^= s0
+        s3 ^= s1
+        s1 ^= s2
+        s0 ^= s3
+        s2 ^= t
+        s3 = ((s3 << 45) | (s3 >> 19)) & MASK64
+        self.s = [s0, s1, s2, s3]
+        return r
+
+    def random(self) -> float:
+        """Generate next pseudorandom number as float in [0,1) with 53 random bits."""
+        return (self.next64() >> 11) / _TWO_POW_53
+
+    def _block(self, n: int, floats: bool) -> array:
+        out = array('d' if floats else 'Q', bytes(8 * n))
+        s0, s1, s2, s3 = self.s
+        m = MASK64
+        for i in range(n):
+            r = (s1 * 5) & m
+            r = (((r << 7) | (r >> 57)) * 9) & m
+            t = (s1 << 17) & m
+            s2 ^= s0
+            s3 ^= s1
+            s1 ^= s2
+            s0 ^= s3
+            s2 ^= t
+            s3 = ((s3 << 45) | (s3 >> 19)) & m
+            out[i] = (r >> 11) / _TWO_POW_53 if floats else r
+        self.s = [s0, s1, s2, s3]
+        return out
+
+    def fill(self, n: int) -> array:
+        """
+        Return the next n 64-bit outputs as an array('Q').
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        return self._block(n, False)
+
+    def random_block(self, n: int) -> array:
+        """
+        Generate n floats in [0,1) as an array('d'), identical to n calls of random().
+        Raises:
+            ValueError: if n is negative
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        return self._block(n, True)
+
+    def _apply_jump(self, poly: Sequence[int]) -> None:
+        acc = [0, 0, 0, 0]
+        for word in poly:
+            for b in range(64):
+                if (word >> b) & 1:
+                    for j in range(4):
+                        acc[j] ^= self.s[j]
+                self.next64()
+        self.s = acc
+
+    def jump(self) -> None:
+        """Advance by 2**128 steps: up to 2**128 non-overlapping substreams."""
+        self._apply_jump(XOSHIRO_JUMP)
+
+    def long_jump(self) -> None:
+        """Advance by 2**192 steps: up to 2**64 starting points, each with 2**64 jump() substreams."""
+        self._apply_jump(XOSHIRO_LONG_JUMP)
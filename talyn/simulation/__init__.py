@@ -16,12 +16,21 @@ from .importance_sampling import importance_sampling
 from .empirical_distribution import EmpiricalDistribution
 from .processes import brownian_motion, brownian_bridge
 from .gibbs_sampler import GibbsSampler
-from .metropolis_hastings import metropolis_hastings
+from .markov_chain import metropolis_hastings, log_metropolis_hastings, adaptive_metropolis
 from .brownian_motion import brownian_motion
 from .brownian_bridge import brownian_bridge
+from .paths import brownian_paths, brownian_bridge_paths, random_walk_paths, stream_paths
+from .sde import SDE, GBM, OrnsteinUhlenbeck, CIR, simulate_sde, iter_sde
+from .sinks import OnlineMoments, RingBuffer, ColumnarWriter, load_columns
+from .mcmc_convergence import gelman_rubin, split_rhat, ess_bulk, ess_tail
+from .multichain import run_chains
 
 __all__ = [
-    "MarkovChain", "GibbsSampler", "metropolis_hastings",
+    "MarkovChain", "GibbsSampler", "metropolis_hastings", "log_metropolis_hastings", "adaptive_metropolis",
     "random_walk", "biased_random_walk",
-    "brownian_motion", "brownian_bridge"
+    "brownian_motion", "brownian_bridge",
+    "brownian_paths", "brownian_bridge_paths", "random_walk_paths", "stream_paths",
+    "SDE", "GBM", "OrnsteinUhlenbeck", "CIR", "simulate_sde", "iter_sde",
+    "OnlineMoments", "RingBuffer", "ColumnarWriter", "load_columns",
+    "gelman_rubin", "split_rhat", "ess_bulk", "ess_tail", "run_chains",
 ]
@@ -1,22 +1,212 @@
 """
 Talyn simulation: Autocorrelation function computation.
+
+Many lags are computed at once in O(n log n) by the Wiener-Khinchin route:
+zero-pad the centred series to a power of two at least n + lag_max, take
+|FFT|^2, and transform back. NumPy's FFT is used when NumPy is installed;
+otherwise a pure-Python radix-2 FFT does the work, and a few short lags are
+summed directly in O(n * lag_max) instead. Integrated autocorrelation times
+and effective sample sizes for MCMC output are built on top.
 """
-from typing import List
+import cmath
+import math
+from itertools import islice
+from operator import mul
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    _np = None
+
+IAT_METHODS = ("geyer", "sokal")
+# Window constant c of Sokal's automatic windowing: smallest M with M >= c * tau(M).
+SOKAL_WINDOW = 5.0
+
+
+def _twiddles(n: int, count: int) -> List[complex]:
+    """exp(-2πik/n) for k = 0..count-1."""
+    return [cmath.exp(-2j * math.pi * k / n) for k in range(count)]
+
+
+def _fft(values: Sequence[complex], table: Optional[List[complex]] = None) -> List[complex]:
+    """
+    Radix-2 decimation-in-time FFT of a sequence whose length is a power of two.
+    Sub-transforms of length L are stored one after another; every stage
+    merges the two halves of the list with whole-list comprehensions, so
+    the Python-level loop count per stage is at most sqrt(n).
+    table, if given, must be _twiddles(n, n // 2).
+    """
+    n = len(values)
+    data = list(values)
+    # Stage twiddles exp(-iπk/L) are every (n / 2L)-th entry of this table.
+    if table is None:
+        table = _twiddles(n, n // 2)
+    length = 1
+    while length < n:
+        half = n // 2
+        count = half // length  # merged transforms after this stage
+        twiddles = table[::n // (2 * length)] * count
+        odd = [w * o for w, o in zip(twiddles, data[half:])]
+        low = [e + t for e, t in zip(data, odd)]
+        high = [e - t for e, t in zip(data, odd)]
+        merged = [0j] * n
+        step = 2 * length
+        if length <= count:
+            for k in range(length):
+                merged[k::step] = low[k::length]
+                merged[length + k::step] = high[k::length]
+        else:
+            for j in range(count):
+                merged[j * step:j * step + length] = low[j * length:(j + 1) * length]
+                merged[j * step + length:(j + 1) * step] = high[j * length:(j + 1) * length]
+        data = merged
+        length = step
+    return data
+
+
+def _real_fft(values: Sequence[float], table: Optional[List[complex]] = None) -> List[complex]:
+    """
+    Bins 0..n/2 of the FFT of a real sequence (n a power of two >= 2), via one
+    complex FFT of size n/2. table, if given, must be _twiddles(n, n // 2 + 1);
+    its even entries serve the half-size FFT too.
+    """
+    n = len(values)
+    m = n // 2
+    if table is None:
+        table = _twiddles(n, m + 1)
+    z = _fft([complex(a, b) for a, b in zip(values[0::2], values[1::2])], table[:m:2])
+    # Bin k needs z[k] and conj(z[m - k]), both taken modulo m.
+    forward = z + z[:1]
+    mirrored = [c.conjugate() for c in z[:1] + z[:0:-1] + z[:1]]
+    return [0.5 * (a + b) - 0.5j * w * (a - b) for a, b, w in zip(forward, mirrored, table)]
+
+
+def _fft_size(n: int, lag_max: int) -> int:
+    """Smallest power of two >= max(2, n + lag_max); zero padding to it keeps lags up to lag_max free of wrap-around."""
+    size = 2
+    while size < n + lag_max:
+        size *= 2
+    return size
+
+
+def _autocovariance_sums(data: Sequence[float], lag_max: int) -> List[float]:
+    """S_k = Σ_i (x_i - mean)(x_{i+k} - mean) for k = 0..lag_max."""
+    n = len(data)
+    mean = math.fsum(data) / n
+    size = _fft_size(n, lag_max)
+    if _np is not None:
+        centred = _np.asarray(data, dtype=float) - mean
+        spectrum = _np.fft.rfft(centred, size)
+        sums = _np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, size)
+        return sums[:lag_max + 1].tolist()
+    if lag_max + 1 < 2 * math.log2(size):
+        # Few lags: direct sums beat the two pure-Python FFTs.
+        centred = [x - mean for x in data]
+        return [math.fsum(map(mul, centred, islice(centred, k, None))) for k in range(lag_max + 1)]
+    padded = [x - mean for x in data] + [0.0] * (size - n)
+    table = _twiddles(size, size // 2 + 1)
+    half = _real_fft(padded, table)
+    power = [abs(c) ** 2 for c in half]
+    # The power spectrum is real and even, so its inverse FFT is a forward real FFT divided by size.
+    power += power[-2:0:-1]
+    sums = _real_fft(power, table)
+    # lag_max <= size - n <= size / 2, so every lag is among the returned bins.
+    return [sums[k].real / size for k in range(lag_max + 1)]
+
 
 def autocorrelation(data: List[float], lag_max: int = None) -> List[float]:
     """
     Compute autocorrelation for lags up to lag_max (default n-1).
+    Lag k uses the mean of the n - k products at that lag, divided by the
+    variance (normalized by n), in O(n log n) for all lags together.
     """
     n = len(data)
     if n == 0:
         return []
     if lag_max is None or lag_max >= n:
         lag_max = n - 1
-    mean = sum(data) / n
-    # variance
-    var = sum((x - mean)**2 for x in data) / n
-    result: List[float] = []
-    for lag in range(lag_max + 1):
-        cov = sum((data[i] - mean) * (data[i + lag] - mean) for i in range(n - lag)) / (n - lag)
-        result.append(cov / var if var > 0 else 0.0)
-    return result
+    sums = _autocovariance_sums(data, lag_max)
+    var = sums[0] / n
+    if var <= 0:
+        return [0.0] * (lag_max + 1)
+    return [sums[lag] / (n - lag) / var for lag in range(lag_max + 1)]
+
+
+def autocovariance(data: Sequence[float], lag_max: Optional[int] = None) -> List[float]:
+    """
+    Biased (divided by n) autocovariances γ_0..γ_lag_max, the positive
+    definite estimator used for integrated autocorrelation times.
+    """
+    n = len(data)
+    if n == 0:
+        return []
+    if lag_max is None or lag_max >= n:
+        lag_max = n - 1
+    return [s / n for s in _autocovariance_sums(data, lag_max)]
+
+
+def _iat_from_rho(rho: List[float], n: int, method: str, c: float) -> Optional[float]:
+    """τ from autocorrelations ρ_0..ρ_L, or None if the estimator needs lags beyond L < n - 1."""
+    complete = len(rho) >= n
+    if method == "sokal":
+        tau = 1.0
+        for m in range(1, len(rho)):
+            tau += 2.0 * rho[m]
+            if m >= c * tau:
+                return max(tau, 1.0 / n)
+        return max(tau, 1.0 / n) if complete else None
+    total = 0.0
+    previous = math.inf
+    for k in range(len(rho) // 2):
+        pair = rho[2 * k] + rho[2 * k + 1]
+        if pair <= 0:
+            return max(-1.0 + 2.0 * total, 1.0 / n)
+        previous = min(previous, pair)
+        total += previous
+    return max(-1.0 + 2.0 * total, 1.0 / n) if complete else None
+
+
+def integrated_autocorrelation_time(data: Sequence[float], method: str = "geyer", c: float = SOKAL_WINDOW) -> float:
+    """
+    Integrated autocorrelation time τ = 1 + 2 Σ_{t>=1} ρ_t of a stationary series.
+    Lags are first taken from an FFT no larger than the one for the series
+    itself plus a 1/32 margin (about n/32 lags or more); all n - 1 lags are
+    computed only if the estimator has not stopped by then.
+    Args:
+        data: Series, e.g. one coordinate of an MCMC chain
+        method: "geyer" (initial monotone sequence estimator: sums of
+            adjacent-lag pairs, truncated at the first non-positive pair and
+            forced to be decreasing) or "sokal" (automatic window: the
+            smallest M with M >= c * τ(M))
+        c: Window constant for "sokal"
+    Returns:
+        τ (1 for independent draws); 1.0 for constant data
+    Raises:
+        ValueError: for an unknown method or fewer than 4 points
+    """
+    if method not in IAT_METHODS:
+        raise ValueError(f"method must be one of {IAT_METHODS}")
+    n = len(data)
+    if n < 4:
+        raise ValueError("need at least 4 points")
+    gamma = autocovariance(data, min(_fft_size(n, n // 32) - n, n - 1))
+    if gamma[0] <= 0:
+        return 1.0
+    tau = _iat_from_rho([g / gamma[0] for g in gamma], n, method, c)
+    if tau is None:
+        gamma = autocovariance(data)
+        tau = _iat_from_rho([g / gamma[0] for g in gamma], n, method, c)
+    return tau
+
+
+def effective_sample_size(data: Sequence[float], method: str = "geyer") -> float:
+    """
+    Effective sample size n / τ of a correlated series.
+    Args:
+        data: Series, e.g. one coordinate of an MCMC chain
+        method: "geyer" or "sokal" (see integrated_autocorrelation_time)
+    Returns:
+        ESS; it exceeds n for anticorrelated chains (τ < 1)
+    """
+    return len(data) / integrated_autocorrelation_time(data, method)
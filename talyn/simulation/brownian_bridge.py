@@ -1,9 +1,8 @@
 """
 Talyn simulation: Brownian bridge implementation.
 """
-import random
-import math
 from typing import List
+from .paths import brownian_bridge_paths
 
 def brownian_bridge(steps: int = 1000, start: float = 0.0, end: float = 0.0) -> List[float]:
     """
@@ -15,18 +14,4 @@ def brownian_bridge(steps: int = 1000, start: float = 0.0, end: float = 0.0) ->
     Returns:
         List of positions at each time step
     """
-    if steps < 2:
-        return [start, end]
-    
-    # First generate standard Brownian motion
-    W = [0.0]
-    for i in range(1, steps):
-        W.append(W[-1] + math.sqrt(1/steps) * random.gauss(0, 1))
-    
-    # Transform to Brownian bridge
-    bridge = []
-    for i in range(steps):
-        t = i / (steps - 1)
-        bridge.append(start * (1 - t) + end * t + W[i] - t * W[-1])
-    
-    return bridge
+    return brownian_bridge_paths(1, steps, start, end)[0]
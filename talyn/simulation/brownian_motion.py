@@ -1,9 +1,8 @@
 """
 Talyn simulation: Brownian motion implementation.
 """
-import random
-import math
 from typing import List
+from .paths import brownian_paths
 
 def brownian_motion(steps: int = 1000, delta: float = 0.1) -> List[float]:
     """
@@ -14,7 +13,4 @@ def brownian_motion(steps: int = 1000, delta: float = 0.1) -> List[float]:
     Returns:
         List of positions at each time step
     """
-    path = [0.0]
-    for _ in range(1, steps):
-        path.append(path[-1] + math.sqrt(delta) * random.gauss(0, 1))
-    return path
+    return brownian_paths(1, steps, delta)[0]
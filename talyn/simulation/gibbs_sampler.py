@@ -1,32 +1,130 @@
 """
 Talyn simulation: Gibbs sampling implementation.
 """
-from typing import Callable, Dict, List, Tuple
-import random
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .sinks import close_sinks
+
+
+class _ColumnStore:
+    """
+    Recorded draws stored column-wise in array('d'); with a capacity the
+    columns are circular buffers holding the most recent draws.
+    """
+    def __init__(self, names: List[str], capacity: Optional[int]):
+        self.names = names
+        self.capacity = capacity
+        self.columns = {name: array("d") for name in names}
+        self.count = 0  # draws ever recorded
+
+    def append(self, state: Dict[str, float]) -> None:
+        cap = self.capacity
+        if cap is None or self.count < cap:
+            for name in self.names:
+                self.columns[name].append(state[name])
+        elif cap > 0:
+            slot = self.count % cap
+            for name in self.names:
+                self.columns[name][slot] = state[name]
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count if self.capacity is None else min(self.count, self.capacity)
+
+    def column(self, name: str) -> array:
+        """Stored values of one parameter, oldest first."""
+        col = self.columns[name]
+        cap = self.capacity
+        if cap is None or self.count <= cap or cap == 0:
+            return array("d", col)
+        slot = self.count % cap
+        return col[slot:] + col[:slot]
+
 
 class GibbsSampler:
     """
     Gibbs sampler for multivariate distributions.
+    The state dict is updated in place; recorded draws (after burn_in,
+    every thin-th sweep) go to column-wise array('d') storage, bounded by
+    keep_last, and to any sinks.
     """
-    def __init__(self, initial_state: Dict[str, float], full_conditionals: Dict[str, Callable[[Dict[str, float]], float]]):
+    def __init__(
+        self,
+        initial_state: Dict[str, float],
+        full_conditionals: Dict[str, Callable[[Dict[str, float]], float]],
+        thin: int = 1,
+        burn_in: int = 0,
+        keep_last: Optional[int] = None,
+        sinks: Sequence[Any] = (),
+    ):
         """
         Args:
             initial_state: Dictionary of initial parameter values
             full_conditionals: Dictionary of full conditional sampling functions for each parameter
+            thin: Record every thin-th sweep after burn-in
+            burn_in: Number of initial sweeps not recorded (the initial state is recorded only when 0)
+            keep_last: Keep only the last keep_last recorded draws (None: all, 0: none)
+            sinks: Objects with push(state), e.g. OnlineMoments, RingBuffer, ColumnarWriter
         """
+        if thin < 1 or burn_in < 0 or (keep_last is not None and keep_last < 0):
+            raise ValueError("thin must be >= 1, burn_in >= 0 and keep_last >= 0")
         self.state = initial_state.copy()
         self.conditionals = full_conditionals
-        self.history = [initial_state.copy()]
-    
+        self.thin = thin
+        self.burn_in = burn_in
+        self.sinks = list(sinks)
+        self.steps = 0
+        self._store = _ColumnStore(list(self.state), keep_last)
+        if burn_in == 0:
+            self._record()
+
+    def _record(self) -> None:
+        self._store.append(self.state)
+        for sink in self.sinks:
+            sink.push(self.state)
+
+    def _sweep(self) -> bool:
+        """One Gibbs sweep; returns whether the new state was recorded."""
+        state = self.state
+        for param, sampler in self.conditionals.items():
+            state[param] = sampler(state)
+        self.steps += 1
+        due = self.steps > self.burn_in and (self.steps - self.burn_in) % self.thin == 0
+        if due:
+            self._record()
+        return due
+
     def step(self) -> Dict[str, float]:
         """Perform one Gibbs sampling iteration."""
-        for param, sampler in self.conditionals.items():
-            self.state[param] = sampler(self.state)
-        self.history.append(self.state.copy())
+        self._sweep()
         return self.state
-    
+
+    def run(self, n: int) -> None:
+        """Perform n sweeps, recording only into the column store and the sinks."""
+        for _ in range(n):
+            self._sweep()
+
     def sample(self, n: int) -> List[Dict[str, float]]:
-        """Run chain for n steps and return samples."""
+        """Run chain for n steps and return the draws recorded during them."""
+        names = self._store.names
+        columns = {name: array("d") for name in names}
         for _ in range(n):
-            self.step()
-        return self.history[-n:]
+            if self._sweep():
+                for name in names:
+                    columns[name].append(self.state[name])
+        return [dict(zip(names, values)) for values in zip(*(columns[name] for name in names))]
+
+    def trace(self, name: str) -> array:
+        """Stored draws of one parameter as array('d'), oldest first."""
+        return self._store.column(name)
+
+    @property
+    def history(self) -> List[Dict[str, float]]:
+        """Stored draws as a list of dicts (built on demand from the columns)."""
+        names = self._store.names
+        columns = [self._store.column(name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def close(self) -> None:
+        """Close the sinks that need it (e.g. flush a ColumnarWriter)."""
+        close_sinks(self.sinks)
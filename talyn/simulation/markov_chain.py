@@ -1,69 +1,332 @@
 """
 Talyn simulation: Markov Chain Monte Carlo implementation.
 """
-from typing import Callable, List, Tuple, Any
+from collections import deque
+from typing import Callable, Dict, List, Tuple, Any, Optional, Sequence, Union
 import random
 import math
+from .paths import Seed, _rng
+from .sinks import close_sinks
+
+# Acceptance rate adaptive_metropolis tunes towards (Roberts, Gelman & Gilks).
+AM_TARGET_ACCEPTANCE = 0.234
+AM_ADAPT_INTERVAL = 50
+# Ridge added to the adapted covariance to keep it positive definite.
+AM_EPSILON = 1e-8
 
 class MarkovChain:
     """
     Generic Markov Chain for MCMC sampling.
+    Recorded states (after burn_in, every thin-th step) are kept in
+    `history` and passed to every sink; keep_last bounds the history so
+    long chains run in constant memory.
     """
-    def __init__(self, initial_state: Any, transition_kernel: Callable[[Any], Any]):
+    def __init__(
+        self,
+        initial_state: Any,
+        transition_kernel: Callable[[Any], Any],
+        thin: int = 1,
+        burn_in: int = 0,
+        keep_last: Optional[int] = None,
+        sinks: Sequence[Any] = (),
+    ):
+        """
+        Args:
+            initial_state: Starting state (recorded only when burn_in is 0)
+            transition_kernel: Function mapping a state to the next state
+            thin: Record every thin-th state after burn-in
+            burn_in: Number of initial transitions not recorded
+            keep_last: Keep only the last keep_last recorded states in
+                history (None: keep all, 0: keep none)
+            sinks: Objects with push(state), e.g. OnlineMoments, RingBuffer, ColumnarWriter
+        """
+        if thin < 1 or burn_in < 0 or (keep_last is not None and keep_last < 0):
+            raise ValueError("thin must be >= 1, burn_in >= 0 and keep_last >= 0")
         self.state = initial_state
         self.transition = transition_kernel
-        self.history = [initial_state]
+        self.thin = thin
+        self.burn_in = burn_in
+        self.sinks = list(sinks)
+        self.steps = 0
+        self.history = [] if keep_last is None else deque(maxlen=keep_last)
+        if burn_in == 0:
+            self._record(initial_state)
+
+    def _record(self, state: Any) -> None:
+        self.history.append(state)
+        for sink in self.sinks:
+            sink.push(state)
+
+    def _advance(self) -> bool:
+        """One transition; returns whether the new state was recorded."""
+        self.state = self.transition(self.state)
+        self.steps += 1
+        due = self.steps > self.burn_in and (self.steps - self.burn_in) % self.thin == 0
+        if due:
+            self._record(self.state)
+        return due
 
     def step(self) -> Any:
         """Perform one MCMC transition."""
-        self.state = self.transition(self.state)
-        self.history.append(self.state)
+        self._advance()
         return self.state
 
+    def run(self, n: int) -> None:
+        """Perform n transitions, recording only into history and the sinks."""
+        for _ in range(n):
+            self._advance()
+
     def sample(self, n: int) -> List[Any]:
-        """Run chain for n steps and return samples."""
+        """Run chain for n steps and return the states recorded during them."""
+        recorded = []
         for _ in range(n):
-            self.step()
-        return self.history[-n:]  # Return only the new samples
+            if self._advance():
+                recorded.append(self.state)
+        return recorded
+
+    def close(self) -> None:
+        """Close the sinks that need it (e.g. flush a ColumnarWriter)."""
+        close_sinks(self.sinks)
 
 def metropolis_hastings(
     target_pdf: Callable[[Any], float], 
     proposal: Callable[[Any], Any],
-    proposal_pdf: Callable[[Any, Any], float],
+    proposal_pdf: Optional[Callable[[Any, Any], float]],
     initial_state: Any,
     n_samples: int = 1000,
-    burn_in: int = 100
-) -> List[Any]:
+    burn_in: int = 100,
+    symmetric: bool = False,
+    return_stats: bool = False,
+) -> Union[List[Any], Dict[str, Any]]:
     """
     Metropolis-Hastings MCMC sampler.
+    The target density of the current state is cached, so each iteration
+    evaluates target_pdf once; for work with unnormalized posteriors
+    prefer log_metropolis_hastings, which cannot underflow.
     Args:
         target_pdf: Target probability density function (up to constant)
         proposal: Function proposing new state given current state
-        proposal_pdf: q(x'|x) - proposal density
+        proposal_pdf: q(x'|x) - proposal density (unused, may be None, if symmetric)
         initial_state: Starting point for the chain
         n_samples: Number of samples to collect
         burn_in: Number of burn-in samples to discard
+        symmetric: q(x'|x) = q(x|x'), so the proposal densities cancel and are not evaluated
+        return_stats: Return a dict with "samples", "acceptance_rate" and "burn_in_acceptance_rate"
     Returns:
         List of samples from target distribution
     """
+    if not symmetric and proposal_pdf is None:
+        raise ValueError("proposal_pdf is required unless symmetric=True")
     current = initial_state
+    current_density = target_pdf(current)
     samples = []
-    
-    # Burn-in phase
-    for _ in range(burn_in):
+    accepted = [0, 0]  # during burn-in, during sampling
+    for i in range(burn_in + n_samples):
         candidate = proposal(current)
-        acceptance_ratio = (target_pdf(candidate) * proposal_pdf(current, candidate)) / \
-                          (target_pdf(current) * proposal_pdf(candidate, current))
-        if random.random() < min(1, acceptance_ratio):
-            current = candidate
-    
-    # Sampling phase
-    for _ in range(n_samples):
+        candidate_density = target_pdf(candidate)
+        numerator = candidate_density
+        denominator = current_density
+        if not symmetric:
+            numerator *= proposal_pdf(current, candidate)
+            denominator *= proposal_pdf(candidate, current)
+        if denominator <= 0:
+            # Only reachable from a zero-density start: move to any state with positive density.
+            accept = numerator > 0
+        else:
+            accept = random.random() < min(1, numerator / denominator)
+        if accept:
+            current, current_density = candidate, candidate_density
+            accepted[i >= burn_in] += 1
+        if i >= burn_in:
+            samples.append(current)
+    if not return_stats:
+        return samples
+    return _mh_stats(samples, accepted, burn_in, n_samples)
+
+
+def _mh_stats(samples: List[Any], accepted: List[int], burn_in: int, n_samples: int) -> Dict[str, Any]:
+    return {
+        "samples": samples,
+        "acceptance_rate": accepted[1] / n_samples if n_samples else 0.0,
+        "burn_in_acceptance_rate": accepted[0] / burn_in if burn_in else 0.0,
+    }
+
+
+def _log_accept(current_lp: float, candidate_lp: float, rand: Callable[[], float], log_correction: float = 0.0) -> bool:
+    """
+    Metropolis-Hastings test in log space: accept when
+    log u < candidate_lp - current_lp + log_correction (the log proposal
+    density ratio). From a state outside the support (current_lp = -inf)
+    any candidate inside it is accepted.
+    """
+    if current_lp > -math.inf:
+        delta = candidate_lp - current_lp + log_correction
+    else:
+        delta = math.inf if candidate_lp > -math.inf else -math.inf
+    return delta >= 0 or math.log(1.0 - rand()) < delta
+
+
+def log_metropolis_hastings(
+    log_target: Callable[[Any], float],
+    proposal: Callable[[Any], Any],
+    initial_state: Any,
+    n_samples: int = 1000,
+    burn_in: int = 100,
+    log_proposal_pdf: Optional[Callable[[Any, Any], float]] = None,
+    seed: Seed = None,
+    return_stats: bool = False,
+) -> Union[List[Any], Dict[str, Any]]:
+    """
+    Metropolis-Hastings in log space: accept when
+    log u < log p(x') - log p(x) + log q(x|x') - log q(x'|x), so
+    unnormalized posteriors far below the floating-point range work.
+    The current log density is cached (one target evaluation per
+    iteration), and with no log_proposal_pdf the proposal is taken to be
+    symmetric and its density is never evaluated.
+    Args:
+        log_target: Log target density, up to an additive constant (-inf outside the support)
+        proposal: Function proposing a new state given the current state
+        initial_state: Starting point for the chain
+        n_samples: Number of samples to collect
+        burn_in: Number of burn-in iterations to discard
+        log_proposal_pdf: log q(x'|x) as a function (x', x); None for a symmetric proposal
+        seed: Source of the acceptance uniforms: None (global random module),
+            an int seed, or a random.Random to draw from (e.g. the one the proposal uses)
+        return_stats: Return a dict with "samples", "acceptance_rate",
+            "burn_in_acceptance_rate" and "log_target" (per sample)
+    Returns:
+        List of samples
+    """
+    rand = _rng(seed).random
+    current = initial_state
+    current_lp = log_target(current)
+    samples = []
+    log_densities = []
+    accepted = [0, 0]
+    for i in range(burn_in + n_samples):
         candidate = proposal(current)
-        acceptance_ratio = (target_pdf(candidate) * proposal_pdf(current, candidate)) / \
-                          (target_pdf(current) * proposal_pdf(candidate, current))
-        if random.random() < min(1, acceptance_ratio):
-            current = candidate
-        samples.append(current)
-    
-    return samples
+        candidate_lp = log_target(candidate)
+        correction = 0.0
+        if log_proposal_pdf is not None:
+            correction = log_proposal_pdf(current, candidate) - log_proposal_pdf(candidate, current)
+        if _log_accept(current_lp, candidate_lp, rand, correction):
+            current, current_lp = candidate, candidate_lp
+            accepted[i >= burn_in] += 1
+        if i >= burn_in:
+            samples.append(current)
+            log_densities.append(current_lp)
+    if not return_stats:
+        return samples
+    stats = _mh_stats(samples, accepted, burn_in, n_samples)
+    stats["log_target"] = log_densities
+    return stats
+
+
+def _cholesky(matrix: List[List[float]]) -> List[List[float]]:
+    """Lower Cholesky factor of a symmetric positive definite matrix."""
+    d = len(matrix)
+    low = [[0.0] * d for _ in range(d)]
+    for i in range(d):
+        for j in range(i + 1):
+            acc = matrix[i][j] - math.fsum(low[i][k] * low[j][k] for k in range(j))
+            if i == j:
+                if acc <= 0:
+                    raise ValueError("matrix is not positive definite")
+                low[i][i] = math.sqrt(acc)
+            else:
+                low[i][j] = acc / low[j][j]
+    return low
+
+
+def adaptive_metropolis(
+    log_target: Callable[[List[float]], float],
+    initial_state: Union[float, Sequence[float]],
+    n_samples: int = 1000,
+    burn_in: int = 1000,
+    target_acceptance: float = AM_TARGET_ACCEPTANCE,
+    initial_scale: float = 0.1,
+    adapt_interval: int = AM_ADAPT_INTERVAL,
+    seed: Optional[int] = None,
+    return_stats: bool = False,
+) -> Union[List[Any], Dict[str, Any]]:
+    """
+    Adaptive Metropolis (Haario, Saksman & Tamminen, 2001) with a
+    Robbins-Monro scale (Andrieu & Thoms, 2008), in log space.
+    Gaussian random-walk proposals use covariance λ (Σ + ε I), where Σ is
+    the running covariance of the chain (its Cholesky factor refreshed
+    every adapt_interval iterations) and log λ is nudged after every
+    iteration by t^(-0.6) (accepted - target_acceptance). Adaptation
+    runs only during burn_in; the sampling phase uses the frozen proposal,
+    so the recorded chain is an ordinary Metropolis chain.
+    Args:
+        log_target: Log target density of a list of coordinates (a float for a scalar initial_state)
+        initial_state: Starting point (float or sequence of floats)
+        n_samples: Number of samples to collect
+        burn_in: Adaptation iterations (discarded)
+        target_acceptance: Acceptance rate the scale is tuned towards (0.234 is optimal for large d)
+        initial_scale: Standard deviation of the initial isotropic proposal
+        adapt_interval: Iterations between covariance refreshes
+        seed: Optional RNG seed (default: global random module)
+        return_stats: Return a dict with "samples", "acceptance_rate",
+            "burn_in_acceptance_rate", "scale" (final λ) and "covariance"
+            (final proposal covariance)
+    Returns:
+        List of samples
+    """
+    if not 0 < target_acceptance < 1:
+        raise ValueError("target_acceptance must be in (0, 1)")
+    rng = random if seed is None else random.Random(seed)
+    gauss, rand = rng.gauss, rng.random
+    scalar = isinstance(initial_state, (int, float))
+    current = [float(initial_state)] if scalar else [float(x) for x in initial_state]
+    d = len(current)
+    evaluate = (lambda x: log_target(x[0])) if scalar else log_target
+    current_lp = evaluate(current)
+    # λ starts at the Gelman-Roberts-Gilks optimum 2.38^2 / d; the first covariance is isotropic.
+    log_scale = math.log(2.38 ** 2 / d)
+    cov = [[(initial_scale ** 2 / math.exp(log_scale) if i == j else 0.0) for j in range(d)] for i in range(d)]
+    chol = _cholesky(cov)
+    mean = list(current)
+    comoment = [[0.0] * d for _ in range(d)]
+    seen = 1
+    samples = []
+    accepted = [0, 0]
+    for i in range(burn_in + n_samples):
+        adapting = i < burn_in
+        step = math.exp(0.5 * log_scale)
+        z = [gauss(0.0, 1.0) for _ in range(d)]
+        candidate = [c + step * math.fsum(row[k] * z[k] for k in range(j + 1))
+                     for j, (c, row) in enumerate(zip(current, chol))]
+        candidate_lp = evaluate(candidate)
+        accept = _log_accept(current_lp, candidate_lp, rand)
+        if accept:
+            current, current_lp = candidate, candidate_lp
+            accepted[not adapting] += 1
+        if adapting:
+            log_scale += (i + 1) ** -0.6 * ((1.0 if accept else 0.0) - target_acceptance)
+            # Welford update of the chain's mean and co-moment matrix.
+            seen += 1
+            diff = [x - m for x, m in zip(current, mean)]
+            mean = [m + dx / seen for m, dx in zip(mean, diff)]
+            after = [x - m for x, m in zip(current, mean)]
+            for r in range(d):
+                row, dr = comoment[r], diff[r]
+                for c in range(d):
+                    row[c] += dr * after[c]
+            if (i + 1) % adapt_interval == 0:
+                cov = [[comoment[r][c] / (seen - 1) + (AM_EPSILON if r == c else 0.0) for c in range(d)]
+                       for r in range(d)]
+                try:
+                    chol = _cholesky(cov)
+                except ValueError:
+                    pass  # keep the previous factor until the covariance is well conditioned
+        else:
+            samples.append(current[0] if scalar else list(current))
+    if not return_stats:
+        return samples
+    stats = _mh_stats(samples, accepted, burn_in, n_samples)
+    scale = math.exp(log_scale)
+    stats["scale"] = scale
+    stats["covariance"] = [[scale * math.fsum(chol[r][k] * chol[c][k] for k in range(d)) for c in range(d)]
+                           for r in range(d)]
+    return stats
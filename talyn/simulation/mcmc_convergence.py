@@ -1,7 +1,11 @@
 """
-Talyn simulation: MCMC convergence diagnostics (Gelman-Rubin R̂ statistic).
+Talyn simulation: MCMC convergence diagnostics (Gelman-Rubin R̂ statistic,
+split-R̂, and bulk/tail effective sample sizes).
 """
-from typing import List
+import math
+from statistics import NormalDist
+from typing import List, Sequence
+from .autocorrelation import autocovariance
 
 def mean(xs):
     return sum(xs) / len(xs)
@@ -33,3 +37,123 @@ def gelman_rubin(chains: List[List[float]]) -> float:
     R_hat = (var_hat / W) ** 0.5 if W > 0 else float('inf')
     return float(R_hat)
 
+
+def rhat_from_moments(counts: Sequence[int], means: Sequence[float], variances: Sequence[float]) -> float:
+    """
+    R̂ from per-chain sufficient statistics (count, mean, unbiased variance),
+    using the common length n = min(counts); lets R̂ be updated from running
+    moments without revisiting the draws.
+    """
+    m = len(means)
+    n = min(counts)
+    if m < 2 or n < 2:
+        raise ValueError("Need at least 2 chains with 2 samples each")
+    W = mean(variances)
+    if W <= 0:
+        return float('inf')
+    var_hat = ((n - 1) / n) * W + variance(means)
+    return math.sqrt(var_hat / W)
+
+
+def _split(chains: Sequence[Sequence[float]]) -> List[Sequence[float]]:
+    """Both halves of every chain (truncated to a common even length; a middle draw is dropped)."""
+    n = min(len(chain) for chain in chains)
+    half = n // 2
+    return [part for chain in chains for part in (chain[:half], chain[n - half:n])]
+
+
+def split_rhat(chains: Sequence[Sequence[float]]) -> float:
+    """
+    Split-R̂: the Gelman-Rubin statistic over the first and second halves of
+    every chain, so a drifting (non-stationary) chain is flagged too.
+    Args:
+        chains: List of chains (each a list of samples)
+    Returns:
+        R_hat value (float)
+    """
+    halves = _split(chains)
+    return rhat_from_moments([len(h) for h in halves], [mean(h) for h in halves], [variance(h) for h in halves])
+
+
+def _multichain_ess(chains: Sequence[Sequence[float]]) -> float:
+    """
+    ESS of equal-length chains from the combined autocorrelation
+    ρ_t = 1 - (W - mean_j γ_jt) / var⁺ (Vehtari et al., 2021), truncated by
+    Geyer's initial monotone sequence; nan if the draws are constant.
+    """
+    m = len(chains)
+    n = len(chains[0])
+    if n < 4:
+        raise ValueError("need at least 4 draws per (split) chain")
+    gammas = [autocovariance(chain) for chain in chains]
+    W = mean([g[0] * n / (n - 1) for g in gammas])
+    var_plus = W * (n - 1) / n + (variance([mean(chain) for chain in chains]) if m > 1 else 0.0)
+    if var_plus <= 0:
+        return math.nan
+    total = 0.0
+    previous = math.inf
+    for k in range(n // 2):
+        rho = [1.0 - (W - math.fsum(g[t] for g in gammas) / m) / var_plus for t in (2 * k, 2 * k + 1)]
+        pair = rho[1] + (1.0 if k == 0 else rho[0])
+        if pair <= 0:
+            break
+        previous = min(previous, pair)
+        total += previous
+    draws = m * n
+    tau = max(-1.0 + 2.0 * total, 1.0 / math.log10(draws))
+    return draws / tau
+
+
+def rank_normalize(chains: Sequence[Sequence[float]]) -> List[List[float]]:
+    """
+    Replace every draw by Φ⁻¹((r - 3/8) / (S + 1/4)), where r is its average
+    rank among all S pooled draws (Blom's offsets).
+    """
+    pooled = sorted((x, j, i) for j, chain in enumerate(chains) for i, x in enumerate(chain))
+    size = len(pooled)
+    inv_cdf = NormalDist().inv_cdf
+    out = [[0.0] * len(chain) for chain in chains]
+    start = 0
+    while start < size:
+        stop = start
+        while stop < size and pooled[stop][0] == pooled[start][0]:
+            stop += 1
+        z = inv_cdf(((start + stop + 1) / 2 - 0.375) / (size + 0.25))
+        for _, j, i in pooled[start:stop]:
+            out[j][i] = z
+        start = stop
+    return out
+
+
+def ess_bulk(chains: Sequence[Sequence[float]]) -> float:
+    """
+    Bulk effective sample size: the multi-chain ESS of the rank-normalized
+    split chains; it measures how well the centre of the distribution is
+    estimated and is robust to heavy tails.
+    Args:
+        chains: List of chains (each a list of samples)
+    Returns:
+        ESS (float; nan for constant draws)
+    """
+    return _multichain_ess(rank_normalize(_split(chains)))
+
+
+def ess_tail(chains: Sequence[Sequence[float]], prob: float = 0.05) -> float:
+    """
+    Tail effective sample size: the smaller multi-chain ESS of the split
+    chains of the indicators I(x <= q_prob) and I(x <= q_{1-prob}).
+    Args:
+        chains: List of chains (each a list of samples)
+        prob: Tail probability of the lower quantile
+    Returns:
+        ESS (float; nan if an indicator is constant)
+    """
+    halves = _split(chains)
+    pooled = sorted(x for h in halves for x in h)
+    result = math.inf
+    for p in (prob, 1.0 - prob):
+        q = pooled[min(int(p * len(pooled)), len(pooled) - 1)]
+        ess = _multichain_ess([[1.0 if x <= q else 0.0 for x in h] for h in halves])
+        if not ess >= result:
+            result = ess
+    return result
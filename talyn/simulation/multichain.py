@@ -0,0 +1,206 @@
+"""
+Talyn simulation: parallel multi-chain Metropolis with streaming convergence checks.
+
+K random-walk Metropolis chains advance in segments of `checkpoint`
+iterations; each segment of each chain is one task in a process pool that
+stays open for the whole run. Chain j draws from random.Random seeded by the
+j-th SplitMix64 seed (chunk_seeds), and its generator state travels with the
+task, so for a given seed the draws are identical for any number of workers.
+
+After every segment the parent folds each chain's new draws into per-block
+running moments, from which split-R̂ is updated without rescanning the
+chains. Bulk and tail ESS need ranks and autocorrelations of all draws, so
+they are only computed once split-R̂ is below its threshold; all chains stop
+together as soon as both criteria hold.
+"""
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from ..monte_carlo.adaptive import RunningStats
+from ..monte_carlo.parallel import chunk_seeds
+from .markov_chain import log_metropolis_hastings
+from .mcmc_convergence import ess_bulk, ess_tail, rhat_from_moments
+
+# Convergence thresholds of Vehtari et al. (2021).
+RHAT_THRESHOLD = 1.01
+MIN_ESS = 400
+DEFAULT_CHECKPOINT = 500
+
+
+def _advance_chain(
+    log_target: Callable,
+    scalar: bool,
+    current: List[float],
+    scales: List[float],
+    burn_in: int,
+    steps: int,
+    rng_state: Tuple,
+) -> Tuple[List[float], List[array], int, Tuple]:
+    """
+    Run burn_in discarded and then `steps` recorded random-walk Metropolis
+    iterations of one chain with log_metropolis_hastings, proposing and
+    accepting from the chain's own generator; returns (state, recorded
+    columns, accepted moves among the recorded iterations, generator state).
+    """
+    rng = random.Random()
+    rng.setstate(rng_state)
+    gauss = rng.gauss
+    if scalar:
+        step = scales[0]
+        proposal = lambda x: x + step * gauss(0.0, 1.0)
+        start = current[0]
+    else:
+        proposal = lambda x: [xi + s * gauss(0.0, 1.0) for xi, s in zip(x, scales)]
+        start = current
+    stats = log_metropolis_hastings(log_target, proposal, start, steps, burn_in, seed=rng, return_stats=True)
+    samples = stats["samples"]
+    if scalar:
+        columns = [array("d", samples)]
+        state = [samples[-1]]
+    else:
+        columns = [array("d", column) for column in zip(*samples)]
+        state = samples[-1]
+    accepted = round(stats["acceptance_rate"] * steps)
+    return state, columns, accepted, rng.getstate()
+
+
+def _range_moments(blocks: List[RunningStats], column: array, size: int, start: int, stop: int) -> RunningStats:
+    """Moments of column[start:stop], merged from whole blocks of `size` draws plus the leftover draws."""
+    stats = RunningStats()
+    first = -(-start // size)
+    last = stop // size
+    if first >= last:
+        stats.update(column[start:stop])
+        return stats
+    stats.update(column[start:first * size])
+    for block in blocks[first:last]:
+        stats.merge(block.n, block.mean, block.m2)
+    stats.update(column[last * size:stop])
+    return stats
+
+
+def _streaming_split_rhat(blocks: List[List[RunningStats]], columns: List[array], size: int) -> float:
+    """Split-R̂ of one coordinate from the chains' block moments."""
+    n = len(columns[0])
+    half = n // 2
+    halves = [_range_moments(b, c, size, lo, hi) for b, c in zip(blocks, columns) for lo, hi in ((0, half), (n - half, n))]
+    return rhat_from_moments([h.n for h in halves], [h.mean for h in halves], [h.variance for h in halves])
+
+
+def run_chains(
+    log_target: Callable[[Any], float],
+    initial_states: Sequence[Union[float, Sequence[float]]],
+    scale: Union[float, Sequence[float]] = 1.0,
+    burn_in: int = 1000,
+    checkpoint: int = DEFAULT_CHECKPOINT,
+    max_iterations: int = 100000,
+    rhat_threshold: float = RHAT_THRESHOLD,
+    min_ess: float = MIN_ESS,
+    workers: int = 1,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run one random-walk Metropolis chain per initial state until every
+    coordinate has split-R̂ < rhat_threshold and bulk and tail ESS >= min_ess,
+    checking after every `checkpoint` recorded iterations per chain.
+    Args:
+        log_target: Log target density of a list of coordinates (a float for
+            scalar initial states); must be picklable (module-level) when workers > 1
+        initial_states: One starting point per chain (at least 2), preferably overdispersed
+        scale: Standard deviation of the Gaussian proposal, shared or one per coordinate
+        burn_in: Iterations per chain discarded before recording
+        checkpoint: Recorded iterations per chain between convergence checks
+        max_iterations: Upper bound on recorded iterations per chain
+        rhat_threshold: Split-R̂ below which the chains count as mixed
+        min_ess: Bulk and tail ESS (over all chains) required to stop
+        workers: int, number of processes
+        seed: Optional[int], base seed for the chain generators
+    Returns:
+        Dict with "samples" (one list of draws per chain), "converged",
+        "iterations" (recorded per chain), "rhat", "ess_bulk" and "ess_tail"
+        (floats for scalar chains, else one per coordinate), "acceptance_rate",
+        "checkpoints" (per check: "iterations", "rhat" and, once R̂ passed,
+        "ess_bulk" and "ess_tail") and "elapsed" (wall seconds)
+    Raises:
+        ValueError: for fewer than 2 chains, mismatched dimensions or invalid sizes
+    """
+    if len(initial_states) < 2:
+        raise ValueError("need at least 2 chains")
+    if checkpoint < 4 or max_iterations < checkpoint or burn_in < 0 or workers < 1:
+        raise ValueError("checkpoint must be >= 4, max_iterations >= checkpoint, burn_in >= 0 and workers >= 1")
+    scalar = isinstance(initial_states[0], (int, float))
+    states = [[float(s)] if scalar else [float(x) for x in s] for s in initial_states]
+    d = len(states[0])
+    if any(len(s) != d for s in states):
+        raise ValueError("initial states must have the same dimension")
+    scales = [float(scale)] * d if isinstance(scale, (int, float)) else [float(s) for s in scale]
+    if len(scales) != d:
+        raise ValueError("scale must be a scalar or have one value per coordinate")
+    k = len(states)
+    rng_states = [random.Random(s).getstate() for s in chunk_seeds(seed, k)]
+    columns = [[array("d") for _ in range(d)] for _ in range(k)]
+    # blocks[j][c]: moments of each checkpoint segment of chain j, coordinate c.
+    blocks: List[List[List[RunningStats]]] = [[[] for _ in range(d)] for _ in range(k)]
+    accepted = 0
+    checkpoints: List[Dict[str, Any]] = []
+    converged = False
+    pool = ProcessPoolExecutor(max_workers=min(workers, k)) if workers > 1 else None
+    t0 = time.perf_counter()
+    try:
+        iterations = 0
+        while iterations < max_iterations and not converged:
+            steps = min(checkpoint, max_iterations - iterations)
+            args = [(log_target, scalar, states[j], scales,
+                     burn_in if iterations == 0 else 0, steps, rng_states[j]) for j in range(k)]
+            if pool is None:
+                results = [_advance_chain(*a) for a in args]
+            else:
+                results = list(pool.map(_advance_chain, *zip(*args)))
+            for j, (state, segment, acc, rng_state) in enumerate(results):
+                states[j], rng_states[j] = state, rng_state
+                accepted += acc
+                for c in range(d):
+                    columns[j][c].extend(segment[c])
+                    stats = RunningStats()
+                    stats.update(segment[c])
+                    blocks[j][c].append(stats)
+            iterations += steps
+            rhat = [_streaming_split_rhat([blocks[j][c] for j in range(k)], [columns[j][c] for j in range(k)], checkpoint)
+                    for c in range(d)]
+            check: Dict[str, Any] = {"iterations": iterations, "rhat": rhat}
+            if max(rhat) < rhat_threshold:
+                per_coordinate = [[columns[j][c] for j in range(k)] for c in range(d)]
+                check["ess_bulk"] = [ess_bulk(chains) for chains in per_coordinate]
+                if min(check["ess_bulk"]) >= min_ess:
+                    check["ess_tail"] = [ess_tail(chains) for chains in per_coordinate]
+                    converged = min(check["ess_tail"]) >= min_ess
+            checkpoints.append(check)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - t0
+    last = checkpoints[-1]
+    per_coordinate = [[columns[j][c] for j in range(k)] for c in range(d)]
+    bulk = last.get("ess_bulk") or [ess_bulk(chains) for chains in per_coordinate]
+    tail = last.get("ess_tail") or [ess_tail(chains) for chains in per_coordinate]
+
+    def unwrap(values: List[float]) -> Union[float, List[float]]:
+        return values[0] if scalar else values
+
+    if scalar:
+        samples = [list(chain[0]) for chain in columns]
+    else:
+        samples = [[list(x) for x in zip(*chain)] for chain in columns]
+    return {
+        "samples": samples,
+        "converged": converged,
+        "iterations": iterations,
+        "rhat": unwrap(last["rhat"]),
+        "ess_bulk": unwrap(bulk),
+        "ess_tail": unwrap(tail),
+        "acceptance_rate": accepted / (k * iterations),
+        "checkpoints": checkpoints,
+        "elapsed": elapsed,
+    }
@@ -0,0 +1,177 @@
+"""
+Talyn simulation: batched path generation for Brownian motion, Brownian bridges and random walks.
+
+Each path is built from a block of increments and a running sum
+(itertools.accumulate) instead of per-step appends. Gaussian increments
+come from NormalDist.inv_cdf over a block of uniforms; random-walk steps
+come from the bits of a single getrandbits call per path. Rows have the
+same layout as the single-path functions (brownian_motion, brownian_bridge,
+random_walk), and stream_paths yields them in bounded-memory chunks.
+"""
+import math
+import random
+from array import array
+from itertools import accumulate, chain
+from statistics import NormalDist
+from typing import Callable, Iterator, List, Union
+
+DEFAULT_PATH_CHUNK = 1024
+# Smallest uniform fed to inv_cdf in place of an exact 0.0 draw.
+_TINY = 1e-300
+# Step patterns of the 8 bits of a byte, least significant bit first.
+_BIT_SIGNS = [tuple(1.0 if (byte >> k) & 1 else -1.0 for k in range(8)) for byte in range(256)]
+
+Seed = Union[None, int, random.Random]
+Paths = List[List[float]]
+
+
+def _rng(seed: Seed):
+    """The random module itself for None, a passed-in generator as is, else a fresh seeded one."""
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def _normals(rng, inverse_cdf: Callable[[float], float], m: int) -> List[float]:
+    """m Gaussian draws by inverse transform of a block of uniforms."""
+    rnd = rng.random
+    return list(map(inverse_cdf, [rnd() or _TINY for _ in range(m)]))
+
+
+def _gaussian_walk(rng, inverse_cdf: Callable[[float], float], m: int) -> List[float]:
+    """0.0 followed by the partial sums of m Gaussian increments."""
+    return list(accumulate(_normals(rng, inverse_cdf, m), initial=0.0))
+
+
+def brownian_paths(n_paths: int, steps: int = 1000, delta: float = 0.1, seed: Seed = None) -> Paths:
+    """
+    Simulate independent 1D Brownian motion paths.
+    Args:
+        n_paths: Number of paths
+        steps: Points per path, including the start at 0
+        delta: Time increment between steps
+        seed: None (global random module), an int seed, or a random.Random to draw from
+    Returns:
+        n_paths lists of `steps` positions, each distributed like brownian_motion(steps, delta)
+    """
+    if n_paths < 0:
+        raise ValueError("n_paths must be >= 0")
+    rng = _rng(seed)
+    inverse_cdf = NormalDist(0.0, math.sqrt(delta)).inv_cdf
+    return [_gaussian_walk(rng, inverse_cdf, max(steps - 1, 0)) for _ in range(n_paths)]
+
+
+def brownian_bridge_paths(
+    n_paths: int,
+    steps: int = 1000,
+    start: float = 0.0,
+    end: float = 0.0,
+    seed: Seed = None,
+) -> Paths:
+    """
+    Simulate independent Brownian bridges from start to end.
+    Args:
+        n_paths: Number of paths
+        steps: Points per path (at least 2)
+        start: Starting value
+        end: Ending value
+        seed: None (global random module), an int seed, or a random.Random to draw from
+    Returns:
+        n_paths lists of `steps` positions, each distributed like brownian_bridge(steps, start, end)
+    """
+    if n_paths < 0:
+        raise ValueError("n_paths must be >= 0")
+    if steps < 2:
+        return [[start, end] for _ in range(n_paths)]
+    rng = _rng(seed)
+    inverse_cdf = NormalDist(0.0, math.sqrt(1 / steps)).inv_cdf
+    times = [i / (steps - 1) for i in range(steps)]
+    paths = []
+    for _ in range(n_paths):
+        w = _gaussian_walk(rng, inverse_cdf, steps - 1)
+        slope = end - start - w[-1]
+        paths.append([start + wi + slope * t for wi, t in zip(w, times)])
+    return paths
+
+
+def random_walk_paths(
+    n_paths: int,
+    steps: int = 1000,
+    step_size: float = 1.0,
+    p: float = 0.5,
+    seed: Seed = None,
+) -> Paths:
+    """
+    Simulate independent 1D random walks.
+    For p = 0.5 each step's sign is one bit of a single getrandbits
+    call per path; otherwise each step compares a 32-bit word of one getrandbits
+    call against p * 2^32 (p is resolved to 2^-32).
+    Args:
+        n_paths: Number of paths
+        steps: Number of steps (paths have steps + 1 positions)
+        step_size: Size of each step
+        p: Probability of stepping right (must be between 0 and 1)
+        seed: None (global random module), an int seed, or a random.Random to draw from
+    Returns:
+        n_paths lists of steps + 1 positions, each distributed like
+        random_walk(steps, step_size) or biased_random_walk(steps, step_size, p)
+    """
+    if not 0 <= p <= 1:
+        raise ValueError("Probability p must be between 0 and 1")
+    if n_paths < 0:
+        raise ValueError("n_paths must be >= 0")
+    steps = max(steps, 0)
+    rng = _rng(seed)
+    paths = []
+    if p == 0.5:
+        n_bytes = (steps + 7) // 8
+        for _ in range(n_paths):
+            data = rng.getrandbits(8 * n_bytes).to_bytes(n_bytes, "little") if n_bytes else b""
+            signs = chain.from_iterable(map(_BIT_SIGNS.__getitem__, data))
+            path = list(accumulate(signs, initial=0.0))[:steps + 1]
+            if step_size != 1.0:
+                path = [step_size * x for x in path]
+            paths.append(path)
+        return paths
+    threshold = round(p * 2 ** 32)
+    up, down = step_size, -step_size
+    for _ in range(n_paths):
+        words = array("I")
+        if words.itemsize != 4:
+            words = array("L")
+        if steps:
+            words.frombytes(rng.getrandbits(32 * steps).to_bytes(4 * steps, "little"))
+        paths.append(list(accumulate([up if u < threshold else down for u in words], initial=0.0)))
+    return paths
+
+
+def stream_paths(
+    generator: Callable[..., Paths],
+    n_paths: int,
+    chunk_size: int = DEFAULT_PATH_CHUNK,
+    seed: Seed = None,
+    **kwargs,
+) -> Iterator[Paths]:
+    """
+    Yield the paths of a batched generator in chunks, so memory stays
+    bounded by chunk_size paths. With the same seed the concatenated chunks
+    equal generator(n_paths, seed=seed, **kwargs).
+    Args:
+        generator: brownian_paths, brownian_bridge_paths or random_walk_paths
+        n_paths: Total number of paths
+        chunk_size: Paths per yielded chunk
+        seed: None (global random module), an int seed, or a random.Random to draw from
+        **kwargs: Passed on to the generator (steps, delta, ...)
+    Yields:
+        Lists of at most chunk_size paths
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    rng = _rng(seed)
+    done = 0
+    while done < n_paths:
+        m = min(chunk_size, n_paths - done)
+        yield generator(m, seed=rng, **kwargs)
+        done += m
@@ -1,8 +1,8 @@
 """
 Talyn simulation: Random walk implementation.
 """
-import random
 from typing import List
+from .paths import random_walk_paths
 
 def random_walk(steps: int = 1000, step_size: float = 1.0) -> List[float]:
     """
@@ -13,10 +13,7 @@ def random_walk(steps: int = 1000, step_size: float = 1.0) -> List[float]:
     Returns:
         List of positions at each time step
     """
-    path = [0.0]
-    for _ in range(steps):
-        path.append(path[-1] + random.choice([-step_size, step_size]))
-    return path
+    return random_walk_paths(1, steps, step_size)[0]
 
 def biased_random_walk(steps: int = 1000, step_size: float = 1.0, p: float = 0.5) -> List[float]:
     """
@@ -28,11 +25,4 @@ def biased_random_walk(steps: int = 1000, step_size: float = 1.0, p: float = 0.5
     Returns:
         List of positions at each time step
     """
-    if not 0 <= p <= 1:
-        raise ValueError("Probability p must be between 0 and 1")
-        
-    path = [0.0]
-    for _ in range(steps):
-        step = step_size if random.random() < p else -step_size
-        path.append(path[-1] + step)
-    return path
+    return random_walk_paths(1, steps, step_size, p)[0]
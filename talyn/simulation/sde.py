@@ -0,0 +1,250 @@
+"""
+Talyn simulation: stochastic differential equations dX = a(t, X) dt + b(t, X) dW.
+
+All paths are advanced together, one time step at a time: every step
+draws one block of Gaussian increments and updates the whole state list.
+Only the requested time slices are kept, so memory is O(n_paths) for
+streaming and O(n_paths * slices) for collected output.
+"""
+import math
+from statistics import NormalDist
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from .paths import Seed, _normals, _rng
+
+SDE_METHODS = ("euler", "milstein", "exact")
+# Relative step of the central difference for b'(x) in the Milstein scheme.
+SDE_DIFF_STEP = 1e-6
+
+_STANDARD_NORMAL = NormalDist().inv_cdf
+
+
+class SDE:
+    """
+    A scalar SDE dX = a(t, X) dt + b(t, X) dW given by its coefficient functions.
+    """
+    # Values reported for paths are clipped to this bound (None: no clipping).
+    lower_bound: Optional[float] = None
+    # Models with a known transition law override this with a method
+    # exact_step(xs, t, dt, zs) sampling X_{t+dt} given X_t = xs from standard normals zs.
+    exact_step: Optional[Callable[[List[float], float, float, List[float]], List[float]]] = None
+
+    def __init__(
+        self,
+        drift: Callable[[float, float], float],
+        diffusion: Callable[[float, float], float],
+        diffusion_dx: Optional[Callable[[float, float], float]] = None,
+    ):
+        """
+        Args:
+            drift: a(t, x)
+            diffusion: b(t, x)
+            diffusion_dx: ∂b/∂x (t, x) for the Milstein scheme; a central difference is used if omitted
+        """
+        self._drift = drift
+        self._diffusion = diffusion
+        self._diffusion_dx = diffusion_dx
+
+    def drift(self, t: float, x: float) -> float:
+        return self._drift(t, x)
+
+    def diffusion(self, t: float, x: float) -> float:
+        return self._diffusion(t, x)
+
+    def diffusion_dx(self, t: float, x: float) -> float:
+        if self._diffusion_dx is not None:
+            return self._diffusion_dx(t, x)
+        h = SDE_DIFF_STEP * max(1.0, abs(x))
+        return (self.diffusion(t, x + h) - self.diffusion(t, x - h)) / (2.0 * h)
+
+    def euler_step(self, xs: List[float], t: float, dt: float, dws: List[float]) -> List[float]:
+        a, b = self.drift, self.diffusion
+        return [x + a(t, x) * dt + b(t, x) * dw for x, dw in zip(xs, dws)]
+
+    def milstein_step(self, xs: List[float], t: float, dt: float, dws: List[float]) -> List[float]:
+        a, b, db = self.drift, self.diffusion, self.diffusion_dx
+        out = []
+        for x, dw in zip(xs, dws):
+            bx = b(t, x)
+            out.append(x + a(t, x) * dt + bx * dw + 0.5 * bx * db(t, x) * (dw * dw - dt))
+        return out
+
+
+class GBM(SDE):
+    """Geometric Brownian motion dX = mu X dt + sigma X dW."""
+
+    def __init__(self, mu: float, sigma: float):
+        self.mu = mu
+        self.sigma = sigma
+        super().__init__(lambda t, x: mu * x, lambda t, x: sigma * x, lambda t, x: sigma)
+
+    def exact_step(self, xs, t, dt, zs):
+        drift = (self.mu - 0.5 * self.sigma ** 2) * dt
+        vol = self.sigma * math.sqrt(dt)
+        exp = math.exp
+        return [x * exp(drift + vol * z) for x, z in zip(xs, zs)]
+
+    def euler_step(self, xs, t, dt, dws):
+        mu_dt, sigma = self.mu * dt, self.sigma
+        return [x * (1.0 + mu_dt + sigma * dw) for x, dw in zip(xs, dws)]
+
+    def milstein_step(self, xs, t, dt, dws):
+        mu_dt, sigma, half_s2 = self.mu * dt, self.sigma, 0.5 * self.sigma ** 2
+        return [x * (1.0 + mu_dt + sigma * dw + half_s2 * (dw * dw - dt)) for x, dw in zip(xs, dws)]
+
+
+class OrnsteinUhlenbeck(SDE):
+    """Ornstein-Uhlenbeck process dX = theta (mu - X) dt + sigma dW."""
+
+    def __init__(self, theta: float, mu: float, sigma: float):
+        if theta <= 0:
+            raise ValueError("theta must be positive")
+        self.theta = theta
+        self.mu = mu
+        self.sigma = sigma
+        super().__init__(lambda t, x: theta * (mu - x), lambda t, x: sigma, lambda t, x: 0.0)
+
+    def exact_step(self, xs, t, dt, zs):
+        decay = math.exp(-self.theta * dt)
+        mean_shift = self.mu * (1.0 - decay)
+        sd = self.sigma * math.sqrt(-math.expm1(-2.0 * self.theta * dt) / (2.0 * self.theta))
+        return [x * decay + mean_shift + sd * z for x, z in zip(xs, zs)]
+
+    def euler_step(self, xs, t, dt, dws):
+        k, mu_k, sigma = 1.0 - self.theta * dt, self.theta * self.mu * dt, self.sigma
+        return [x * k + mu_k + sigma * dw for x, dw in zip(xs, dws)]
+
+    # Additive noise: Milstein coincides with Euler-Maruyama.
+    milstein_step = euler_step
+
+
+class CIR(SDE):
+    """
+    Cox-Ingersoll-Ross process dX = kappa (theta - X) dt + sigma sqrt(X) dW,
+    discretized with full truncation (coefficients use max(X, 0)) and
+    reported clipped at 0.
+    """
+    lower_bound = 0.0
+
+    def __init__(self, kappa: float, theta: float, sigma: float):
+        self.kappa = kappa
+        self.theta = theta
+        self.sigma = sigma
+        super().__init__(lambda t, x: kappa * (theta - max(x, 0.0)),
+                         lambda t, x: sigma * math.sqrt(max(x, 0.0)))
+
+    def euler_step(self, xs, t, dt, dws):
+        kappa, theta, sigma, sqrt = self.kappa, self.theta, self.sigma, math.sqrt
+        out = []
+        for x, dw in zip(xs, dws):
+            xp = x if x > 0.0 else 0.0
+            out.append(x + kappa * (theta - xp) * dt + sigma * sqrt(xp) * dw)
+        return out
+
+    def milstein_step(self, xs, t, dt, dws):
+        # b b' = sigma^2 / 2 wherever X > 0.
+        kappa, theta, sigma, sqrt = self.kappa, self.theta, self.sigma, math.sqrt
+        quarter_s2 = 0.25 * sigma * sigma
+        out = []
+        for x, dw in zip(xs, dws):
+            if x > 0.0:
+                out.append(x + kappa * (theta - x) * dt + sigma * sqrt(x) * dw + quarter_s2 * (dw * dw - dt))
+            else:
+                out.append(x + kappa * theta * dt)
+        return out
+
+
+def _check_record_steps(record_steps: Optional[Sequence[int]], steps: int) -> List[int]:
+    if record_steps is None:
+        return list(range(steps + 1))
+    chosen = sorted(set(int(k) for k in record_steps))
+    if chosen and (chosen[0] < 0 or chosen[-1] > steps):
+        raise ValueError("record_steps must lie in [0, steps]")
+    return chosen
+
+
+def iter_sde(
+    model: SDE,
+    x0: Union[float, Sequence[float]],
+    T: float,
+    steps: int,
+    n_paths: int = 1,
+    method: str = "euler",
+    record_steps: Optional[Sequence[int]] = None,
+    seed: Seed = None,
+) -> Iterator[Tuple[float, List[float]]]:
+    """
+    Advance n_paths solutions of an SDE together and yield the requested time slices.
+    Args:
+        model: An SDE (e.g. GBM, OrnsteinUhlenbeck, CIR, or SDE(drift, diffusion))
+        x0: Initial value, shared or one per path
+        T: Time horizon
+        steps: Number of time steps of size T / steps
+        n_paths: Number of paths
+        method: "euler" (Euler-Maruyama), "milstein", or "exact" (sample the
+            transition law; GBM and OrnsteinUhlenbeck only)
+        record_steps: Step indices in [0, steps] to yield (default: all)
+        seed: None (global random module), an int seed, or a random.Random to draw from
+    Yields:
+        (t, values) with one value per path, for each recorded step
+    Raises:
+        ValueError: for an unknown method, invalid sizes, or "exact" on a model without a known transition
+    """
+    if method not in SDE_METHODS:
+        raise ValueError(f"method must be one of {SDE_METHODS}")
+    if steps < 1 or n_paths < 1 or T <= 0:
+        raise ValueError("steps and n_paths must be positive and T > 0")
+    if method == "exact" and model.exact_step is None:
+        raise ValueError(f"{type(model).__name__} has no exact transition; use 'euler' or 'milstein'")
+    xs = [float(x0)] * n_paths if isinstance(x0, (int, float)) else [float(x) for x in x0]
+    if len(xs) != n_paths:
+        raise ValueError("x0 must be a scalar or have one value per path")
+    wanted = _check_record_steps(record_steps, steps)
+    if not wanted:
+        return
+    rng = _rng(seed)
+    dt = T / steps
+    bound = model.lower_bound
+
+    def report(values: List[float]) -> List[float]:
+        return values if bound is None else [v if v > bound else bound for v in values]
+
+    if method == "exact":
+        advance, noise = model.exact_step, _STANDARD_NORMAL
+    else:
+        advance = model.euler_step if method == "euler" else model.milstein_step
+        noise = NormalDist(0.0, math.sqrt(dt)).inv_cdf
+    following = iter(wanted)
+    target = next(following)
+    if target == 0:
+        yield 0.0, report(list(xs))
+        target = next(following, None)
+    for k in range(1, wanted[-1] + 1):
+        xs = advance(xs, (k - 1) * dt, dt, _normals(rng, noise, n_paths))
+        if k == target:
+            yield k * dt, report(xs)
+            target = next(following, None)
+
+
+def simulate_sde(
+    model: SDE,
+    x0: Union[float, Sequence[float]],
+    T: float,
+    steps: int,
+    n_paths: int = 1,
+    method: str = "euler",
+    record_steps: Optional[Sequence[int]] = None,
+    seed: Seed = None,
+) -> Dict[str, List]:
+    """
+    Simulate n_paths solutions of an SDE and collect the requested time slices.
+    Args:
+        Same as iter_sde
+    Returns:
+        Dict with "times" (recorded times) and "values" (one list of
+        n_paths values per recorded time)
+    """
+    times, values = [], []
+    for t, xs in iter_sde(model, x0, T, steps, n_paths, method, record_steps, seed):
+        times.append(t)
+        values.append(xs)
+    return {"times": times, "values": values}
@@ -0,0 +1,150 @@
+"""
+Talyn simulation: sinks that consume recorded MCMC states with bounded memory.
+
+A sink is any object with a push(state) method (and optionally close());
+MarkovChain and GibbsSampler hand every recorded state to each sink. States
+may be numbers, sequences of numbers or dicts of name -> number; sinks that
+keep a state must copy it, since samplers may update it in place.
+"""
+import os
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from ..monte_carlo.adaptive import RunningStats
+
+# Values buffered per column before ColumnarWriter appends them to disk.
+COLUMN_FLUSH_SIZE = 4096
+COLUMN_SUFFIX = ".f64"
+
+
+def state_columns(state: Any) -> Tuple[List[str], List[float]]:
+    """Column names and values of a state: "x" for a number, "x0", "x1", ... for a sequence, keys for a dict."""
+    if isinstance(state, dict):
+        return list(state), [float(v) for v in state.values()]
+    if isinstance(state, (int, float)):
+        return ["x"], [float(state)]
+    values = [float(v) for v in state]
+    return [f"x{i}" for i in range(len(values))], values
+
+
+class OnlineMoments:
+    """
+    Running mean and variance of every coordinate (Welford), in O(columns) memory.
+    """
+    def __init__(self):
+        self.names: Optional[List[str]] = None
+        self._stats: List[RunningStats] = []
+
+    def push(self, state: Any) -> None:
+        names, values = state_columns(state)
+        if self.names is None:
+            self.names = names
+            self._stats = [RunningStats() for _ in names]
+        for stats, v in zip(self._stats, values):
+            stats.push(v)
+
+    @property
+    def n(self) -> int:
+        return self._stats[0].n if self._stats else 0
+
+    def mean(self) -> Dict[str, float]:
+        return {name: s.mean for name, s in zip(self.names or [], self._stats)}
+
+    def variance(self) -> Dict[str, float]:
+        return {name: s.variance for name, s in zip(self.names or [], self._stats)}
+
+
+class RingBuffer:
+    """
+    The last `capacity` recorded states (shallow copies of dict/list states).
+    """
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._items = deque(maxlen=capacity)
+
+    def push(self, state: Any) -> None:
+        self._items.append(state.copy() if isinstance(state, (dict, list)) else state)
+
+    def values(self) -> List[Any]:
+        """Recorded states, oldest first."""
+        return list(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ColumnarWriter:
+    """
+    Appends each coordinate of the recorded states to its own file of raw
+    float64 values (<directory>/<name>.f64), buffering COLUMN_FLUSH_SIZE
+    values per column in array('d'). Read back with load_columns.
+    Usable as a context manager; close() flushes the buffers.
+    """
+    def __init__(self, directory: str, flush_size: int = COLUMN_FLUSH_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_size = flush_size
+        self.names: Optional[List[str]] = None
+        self._buffers: List[array] = []
+
+    def push(self, state: Any) -> None:
+        names, values = state_columns(state)
+        if self.names is None:
+            self.names = names
+            self._buffers = [array("d") for _ in names]
+            for name in names:
+                # Start every column afresh.
+                open(self._path(name), "wb").close()
+        for buf, v in zip(self._buffers, values):
+            buf.append(v)
+        if len(self._buffers[0]) >= self.flush_size:
+            self.flush()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + COLUMN_SUFFIX)
+
+    def flush(self) -> None:
+        for name, buf in zip(self.names or [], self._buffers):
+            if buf:
+                with open(self._path(name), "ab") as fh:
+                    buf.tofile(fh)
+                del buf[:]
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_columns(directory: str, names: Optional[Sequence[str]] = None) -> Dict[str, array]:
+    """
+    Read the columns written by ColumnarWriter.
+    Args:
+        directory: Directory passed to ColumnarWriter
+        names: Columns to load (default: every *.f64 file)
+    Returns:
+        Dict of name -> array('d')
+    """
+    if names is None:
+        names = sorted(f[:-len(COLUMN_SUFFIX)] for f in os.listdir(directory) if f.endswith(COLUMN_SUFFIX))
+    columns = {}
+    for name in names:
+        path = os.path.join(directory, name + COLUMN_SUFFIX)
+        column = array("d")
+        with open(path, "rb") as fh:
+            column.frombytes(fh.read())
+        columns[name] = column
+    return columns
+
+
+def close_sinks(sinks: Sequence[Any]) -> None:
+    """Call close() on every sink that has one."""
+    for sink in sinks:
+        close = getattr(sink, "close", None)
+        if close is not None:
+            close()
@@ -3,6 +3,7 @@ Sampling utilities for Talyn: mathematically pure, dependency-free.
 """
 from typing import List, Any, Optional
 import random
+from ..distributions.alias import AliasTable
 
 # No magic numbers: all constants defined at top if needed
 
@@ -43,12 +44,9 @@ def weighted_sample(
     """
     if len(population) != len(weights):
         raise ValueError("Population and weights must be same length")
-    total = sum(weights)
-    if total == 0:
-        raise ValueError("Sum of weights must be positive")
-    norm_weights = [w / total for w in weights]
-    rng = random.Random(seed)
-    # Mathematical note: uses Python's built-in weighted sampling (replacement)
+    # Mathematical note: Vose alias table, O(n) setup then O(1) per draw
+    rng = random.random if seed is None else random.Random(seed).random
+    table = AliasTable(weights, rng_func=rng)
     if k == 1:
-        return rng.choices(population, weights=norm_weights, k=1)[0]
-    return rng.choices(population, weights=norm_weights, k=k)
+        return population[table.sample()]
+    return [population[i] for i in table.sample_n(k)]
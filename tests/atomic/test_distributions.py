@@ -3,12 +3,14 @@ Atomic tests for discrete and continuous distributions in Talyn.
 """
 import unittest
 from talyn.distributions.bernoulli import Bernoulli
-from talyn.distributions.binomial import Binomial
+from talyn.distributions.binomial import Binomial, _btpe_log_ratio, _stirling_tail
 from talyn.distributions.discrete_uniform import DiscreteUniform
 from talyn.distributions.geometric import Geometric
 from talyn.distributions.normal import Normal
 from talyn.distributions.exponential import Exponential
 from talyn.distributions.poisson import Poisson
+from talyn.distributions.continuous_uniform import ContinuousUniform
+from array import array
 import math
 
 class TestDistributions(unittest.TestCase):
@@ -25,6 +27,35 @@ class TestDistributions(unittest.TestCase):
         mean = sum(samples) / len(samples)
         self.assertAlmostEqual(mean, 10*0.4, delta=0.5)
 
+    def test_binomial_large_n(self):
+        b = Binomial(n=10 ** 9, p=0.3)
+        samples = b.sample_n(4000)
+        mean = sum(samples) / len(samples)
+        var = sum((x - mean) ** 2 for x in samples) / len(samples)
+        self.assertAlmostEqual(mean / (10 ** 9 * 0.3), 1.0, delta=1e-4)
+        self.assertAlmostEqual(var / (10 ** 9 * 0.21), 1.0, delta=0.1)
+
+    def test_binomial_edge_probabilities(self):
+        self.assertEqual(set(Binomial(n=50, p=0.0).sample_n(100)), {0})
+        self.assertEqual(set(Binomial(n=50, p=1.0).sample_n(100)), {50})
+        self.assertEqual(Binomial(n=0, p=0.5).sample(), 0)
+
+    def test_btpe_stirling_tail(self):
+        # The BTPE final test relies on lgamma(x) - ((x - 1/2) log x - x + log(2π)/2).
+        for x in (10.0, 50.0, 1000.0):
+            exact = math.lgamma(x) - ((x - 0.5) * math.log(x) - x + 0.5 * math.log(2 * math.pi))
+            self.assertAlmostEqual(_stirling_tail(x), exact, places=12)
+
+    def test_btpe_final_bound_matches_lgamma(self):
+        def log_pmf(n, p, k):
+            return (math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+                    + k * math.log(p) + (n - k) * math.log(1 - p))
+        for n, p, offset in ((1000, 0.4, 25), (1000, 0.4, -25), (200, 0.1, 8), (10 ** 6, 0.3, -600)):
+            m = int((n + 1) * p)
+            y = m + offset
+            exact = log_pmf(n, p, y) - log_pmf(n, p, m)
+            self.assertAlmostEqual(_btpe_log_ratio(n, p, m, y), exact, places=9)
+
     def test_discrete_uniform(self):
         d = DiscreteUniform(a=1, b=6)
         samples = [d.sample() for _ in range(1200)]
@@ -59,5 +90,107 @@ class TestDistributions(unittest.TestCase):
         mean = sum(samples) / len(samples)
         self.assertAlmostEqual(mean, 3, delta=0.2)
 
+    def test_poisson_large_lambda(self):
+        for lam in (800, 10 ** 6):
+            p = Poisson(lam=lam)
+            samples = list(p.sample_n(4000)) + [p.sample() for _ in range(1000)]
+            mean = sum(samples) / len(samples)
+            var = sum((x - mean) ** 2 for x in samples) / len(samples)
+            self.assertAlmostEqual(mean / lam, 1.0, delta=5 / math.sqrt(lam * len(samples)))
+            self.assertAlmostEqual(var / lam, 1.0, delta=0.1)
+
+    def test_log_pmf_matches_pmf(self):
+        for dist in (Binomial(n=20, p=0.3), Poisson(lam=3.5), Geometric(p=0.25), Bernoulli(p=0.3)):
+            ks = list(range(0, 15))
+            log_probs = dist.log_pmf(ks)
+            self.assertIsInstance(log_probs, array)
+            for k, lp in zip(ks, log_probs):
+                self.assertAlmostEqual(math.exp(lp), dist.pmf(k), places=12)
+                self.assertAlmostEqual(dist.log_pmf(k), lp)
+
+    def test_log_densities_stable_in_tails(self):
+        self.assertTrue(math.isfinite(Poisson(lam=10 ** 6).log_pmf(10 ** 6)))
+        self.assertTrue(math.isfinite(Binomial(n=10 ** 6, p=0.5).log_pmf(400000)))
+        self.assertAlmostEqual(Normal(mu=0, sigma=1).log_cdf(-40), -804.608442, places=5)
+        self.assertAlmostEqual(Exponential(lam=2).log_pdf(1000), math.log(2) - 2000)
+        self.assertEqual(Poisson(lam=3).log_pmf(-1), -math.inf)
+
+    def test_log_cdf_matches_summed_pmf(self):
+        b = Binomial(n=30, p=0.4)
+        for k in (0, 5, 12, 29):
+            self.assertAlmostEqual(math.exp(b.log_cdf(k)), sum(b.pmf(i) for i in range(k + 1)), places=12)
+
+    def test_closed_form_cdf_matches_summed_pmf(self):
+        b = Binomial(n=40, p=0.3)
+        p = Poisson(lam=7.5)
+        for k in range(0, 41):
+            self.assertAlmostEqual(b.cdf(k), sum(b.pmf(i) for i in range(k + 1)), places=12)
+            self.assertAlmostEqual(p.cdf(k), sum(p.pmf(i) for i in range(k + 1)), places=12)
+
+    def test_discrete_ppf_inverts_cdf(self):
+        for dist in (Binomial(n=40, p=0.7), Binomial(n=10 ** 7, p=0.2), Poisson(lam=3.5),
+                     Poisson(lam=10 ** 6), Geometric(p=0.25), DiscreteUniform(a=2, b=6), Bernoulli(p=0.3)):
+            for q in (1e-9, 0.05, 0.5, 0.95, 0.999):
+                k = dist.ppf(q)
+                self.assertGreaterEqual(dist.cdf(k), q)
+                self.assertLess(dist.cdf(k - 1), q)
+
+    def test_continuous_ppf_inverts_cdf(self):
+        for dist in (Normal(mu=1, sigma=2), Exponential(lam=2), ContinuousUniform(a=1, b=3)):
+            quantiles = dist.ppf([0.001, 0.25, 0.5, 0.9])
+            for q, x in zip((0.001, 0.25, 0.5, 0.9), quantiles):
+                self.assertAlmostEqual(dist.cdf(x), q, places=12)
+        with self.assertRaises(ValueError):
+            Normal(mu=0, sigma=1).ppf(1.5)
+
+    def test_ziggurat_normal_moments_and_tails(self):
+        samples = list(Normal(mu=0, sigma=1).sample_n(200000))
+        samples += [Normal(mu=0, sigma=1).sample() for _ in range(20000)]
+        n = len(samples)
+        self.assertAlmostEqual(sum(samples) / n, 0.0, delta=0.01)
+        self.assertAlmostEqual(sum(x * x for x in samples) / n, 1.0, delta=0.02)
+        self.assertAlmostEqual(sum(x ** 4 for x in samples) / n, 3.0, delta=0.1)
+        for c in (1.0, 2.5, 3.0):
+            tail = sum(1 for x in samples if abs(x) > c) / n
+            self.assertAlmostEqual(tail, math.erfc(c / math.sqrt(2)), delta=5 * math.sqrt(tail / n))
+
+    def test_ziggurat_exponential(self):
+        e = Exponential(lam=2, method="ziggurat")
+        samples = list(e.sample_n(100000)) + [e.sample() for _ in range(10000)]
+        n = len(samples)
+        self.assertAlmostEqual(sum(samples) / n, 0.5, delta=0.01)
+        self.assertAlmostEqual(sum(1 for x in samples if x > 3) / n, math.exp(-6), delta=0.001)
+        self.assertTrue(all(x >= 0 for x in samples))
+
+    def test_sampling_method_validation(self):
+        self.assertEqual(Normal(mu=0, sigma=1, method="box_muller").method, "box_muller")
+        with self.assertRaises(ValueError):
+            Normal(mu=0, sigma=1, method="polar")
+        with self.assertRaises(ValueError):
+            Exponential(lam=1, method="box_muller")
+
+    def test_batched_sample_means(self):
+        cases = [
+            (Bernoulli(p=0.7), 0.7, 0.05),
+            (Binomial(n=10, p=0.4), 4.0, 0.2),
+            (DiscreteUniform(a=1, b=6), 3.5, 0.1),
+            (Geometric(p=0.25), 3.0, 0.3),
+            (Poisson(lam=3), 3.0, 0.1),
+            (Exponential(lam=2), 0.5, 0.03),
+            (ContinuousUniform(a=1, b=3), 2.0, 0.05),
+            (Normal(mu=2, sigma=3), 2.0, 0.15),
+        ]
+        for dist, expected, delta in cases:
+            samples = dist.sample(size=5001)
+            self.assertIsInstance(samples, array)
+            self.assertEqual(len(samples), 5001)
+            self.assertEqual(len(dist.sample_n(0)), 0)
+            self.assertAlmostEqual(sum(samples) / len(samples), expected, delta=delta)
+
+    def test_batched_normal_variance(self):
+        samples = Normal(mu=0, sigma=2).sample_n(10000)
+        var = sum(x * x for x in samples) / len(samples)
+        self.assertAlmostEqual(var, 4, delta=0.25)
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,10 @@ import unittest
 import math
 from talyn.distributions.discrete_uniform import DiscreteUniform
 from talyn.distributions.normal import Normal
-from scipy.stats import chisquare, kstest
+from talyn.distributions.binomial import Binomial
+from talyn.distributions.poisson import Poisson
+from talyn.distributions.exponential import Exponential
+from scipy.stats import binom, chisquare, kstest, poisson
 
 class TestGoodnessOfFit(unittest.TestCase):
     def test_discrete_uniform_chi2(self):
@@ -22,5 +25,67 @@ class TestGoodnessOfFit(unittest.TestCase):
         d, p = kstest(samples, 'norm')
         self.assertGreater(p, 0.01)
 
+    def test_normal_methods_ks(self):
+        for method in ("ziggurat", "box_muller"):
+            n = Normal(mu=0, sigma=1, method=method)
+            d, p = kstest(list(n.sample_n(20000)), 'norm')
+            self.assertGreater(p, 0.001)
+
+    def test_exponential_ziggurat_ks(self):
+        e = Exponential(lam=1, method="ziggurat")
+        d, p = kstest(list(e.sample_n(20000)), 'expon')
+        self.assertGreater(p, 0.001)
+
+    def _binomial_chi2_pvalue(self, n, p, draws=20000):
+        samples = Binomial(n=n, p=p).sample_n(draws)
+        lo, hi = int(binom.ppf(0.001, n, p)), int(binom.ppf(0.999, n, p))
+        counts = [0] * (hi - lo + 3)
+        for x in samples:
+            counts[min(max(x - lo + 1, 0), len(counts) - 1)] += 1
+        probs = [binom.cdf(lo - 1, n, p)]
+        probs += [binom.pmf(k, n, p) for k in range(lo, hi + 1)]
+        probs.append(binom.sf(hi, n, p))
+        chi2, pval = chisquare(counts, [draws * q for q in probs])
+        return pval
+
+    def test_binomial_inversion_chi2(self):
+        self.assertGreater(self._binomial_chi2_pvalue(20, 0.3), 0.001)
+        self.assertGreater(self._binomial_chi2_pvalue(10 ** 9, 1e-8), 0.001)
+
+    def test_binomial_btpe_chi2(self):
+        self.assertGreater(self._binomial_chi2_pvalue(1000, 0.4), 0.001)
+        self.assertGreater(self._binomial_chi2_pvalue(500, 0.85), 0.001)
+
+    def test_binomial_btpe_ks(self):
+        n, p = 10 ** 6, 0.3
+        samples = Binomial(n=n, p=p).sample_n(5000)
+        d, _ = kstest(samples, binom(n, p).cdf)
+        self.assertLess(d, 0.03)
+
+    def test_poisson_ptrs_chi2(self):
+        for lam in (10, 50, 5000):
+            draws = 20000
+            samples = Poisson(lam=lam).sample_n(draws)
+            lo, hi = int(poisson.ppf(0.001, lam)), int(poisson.ppf(0.999, lam))
+            counts = [0] * (hi - lo + 3)
+            for x in samples:
+                counts[min(max(x - lo + 1, 0), len(counts) - 1)] += 1
+            probs = [poisson.cdf(lo - 1, lam)]
+            probs += [poisson.pmf(k, lam) for k in range(lo, hi + 1)]
+            probs.append(poisson.sf(hi, lam))
+            chi2, pval = chisquare(counts, [draws * q for q in probs])
+            self.assertGreater(pval, 0.001)
+
+    def test_cdf_and_ppf_match_scipy(self):
+        for n, p in ((40, 0.3), (10 ** 6, 0.45)):
+            b = Binomial(n=n, p=p)
+            for k in (int(n * p) - 3, int(n * p), int(n * p) + 5):
+                self.assertAlmostEqual(b.cdf(k), binom.cdf(k, n, p), places=10)
+            self.assertEqual(b.ppf(0.37), binom.ppf(0.37, n, p))
+        for lam in (3.5, 5000.0):
+            pois = Poisson(lam=lam)
+            self.assertAlmostEqual(pois.cdf(int(lam)), poisson.cdf(int(lam), lam), places=10)
+            self.assertEqual(pois.ppf(0.81), poisson.ppf(0.81, lam))
+
 if __name__ == "__main__":
     unittest.main()
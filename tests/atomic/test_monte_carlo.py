@@ -0,0 +1,276 @@
+"""
+Atomic tests for Monte Carlo estimators and quasi-random point sets.
+"""
+import math
+import random
+import unittest
+from talyn.monte_carlo import (
+    integrate, estimate_pi, antithetic_variates, stratified_sampling, control_variates,
+    latin_hypercube, miser, vegas, rejection_sampling, adaptive_rejection_sampling,
+    self_normalized_importance_sampling, mlmc, euler_maruyama_levels,
+)
+from talyn.monte_carlo.importance_sampling import pareto_k
+from talyn.monte_carlo.qmc import Sobol, Halton
+from talyn.monte_carlo.adaptive import RunningStats, adaptive_mean, t_critical_value
+
+
+class TestQuasiMonteCarlo(unittest.TestCase):
+    def test_sobol_first_points(self):
+        points = Sobol(3).random(4)
+        self.assertEqual(points, [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5],
+                                  [0.75, 0.25, 0.25], [0.25, 0.75, 0.75]])
+
+    def test_sobol_fast_forward_and_high_dimension(self):
+        a, b = Sobol(1024), Sobol(1024)
+        a.random(37)
+        b.fast_forward(37)
+        self.assertEqual(a.random(3), b.random(3))
+
+    def test_halton_radical_inverse(self):
+        self.assertEqual(Halton(2).random(4), [[0.0, 0.0], [0.5, 1 / 3], [0.25, 2 / 3], [0.75, 1 / 9]])
+
+    def test_scrambled_points_stay_in_unit_cube(self):
+        for cls in (Sobol, Halton):
+            for scramble in ("shift", "owen"):
+                points = cls(5, scramble=scramble, seed=3).random(256)
+                self.assertTrue(all(0.0 <= x < 1.0 for p in points for x in p))
+                self.assertAlmostEqual(sum(p[4] for p in points) / 256, 0.5, delta=0.02)
+
+
+class TestIntegrate(unittest.TestCase):
+    def test_one_dimensional_default(self):
+        self.assertAlmostEqual(integrate(lambda x: x * x, 0, 1, 20000), 1 / 3, delta=0.02)
+
+    def test_qmc_beats_mc_in_high_dimension(self):
+        f = lambda x: math.prod(1 + (xi - 0.5) / (i + 1) for i, xi in enumerate(x))
+        mc, mc_err = integrate(f, [0] * 20, [1] * 20, 4096, seed=1, return_error=True)
+        qmc, qmc_err = integrate(f, [0] * 20, [1] * 20, 4096, method="sobol", seed=1, return_error=True)
+        self.assertAlmostEqual(qmc, 1.0, delta=1e-3)
+        self.assertLess(qmc_err, mc_err / 10)
+
+    def test_vectorized_rectangle(self):
+        est = integrate(lambda pts: [p[0] + p[1] for p in pts], [0, 0], [2, 3], 1024,
+                        method="halton", vectorized=True, seed=2)
+        self.assertAlmostEqual(est, 15.0, delta=0.05)
+
+    def test_qmc_point_counts(self):
+        f = lambda x: x[0] * x[1]
+        sobol = integrate(f, [0, 0], [1, 1], 10000, method="sobol", seed=1, return_stats=True)
+        self.assertEqual(sobol["n"], 8 * 1024)
+        halton = integrate(f, [0, 0], [1, 1], 10003, method="halton", seed=1, return_stats=True)
+        self.assertEqual(halton["n"], 10003)
+        self.assertAlmostEqual(sobol["estimate"], 0.25, delta=5 * sobol["std_error"] + 1e-6)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            integrate(lambda x: x, 1, 0)
+        with self.assertRaises(ValueError):
+            integrate(lambda x: x, [0, 0], [1])
+
+
+
+class TestParallelEstimators(unittest.TestCase):
+    def test_estimate_pi_independent_of_worker_count(self):
+        serial = estimate_pi(40000, seed=11, chunk_size=10000, return_stats=True)
+        pooled = estimate_pi(40000, seed=11, chunk_size=10000, workers=2, return_stats=True)
+        self.assertEqual(serial["estimate"], pooled["estimate"])
+        self.assertAlmostEqual(serial["estimate"], math.pi, delta=5 * serial["std_error"])
+        self.assertEqual(sum(w["chunks"] for w in pooled["workers"]), 4)
+
+    def test_variance_reduced_estimators_report_errors(self):
+        anti = antithetic_variates(math.exp, 20000, seed=4, return_stats=True)
+        strat = stratified_sampling(math.exp, 20, 500, seed=4, return_stats=True)
+        for stats in (anti, strat):
+            self.assertAlmostEqual(stats["estimate"], math.e - 1, delta=5 * stats["std_error"])
+            self.assertLess(stats["std_error"], 0.01)
+
+
+class TestAdaptivePrecision(unittest.TestCase):
+    def test_running_stats_batches_match_pushes(self):
+        data = [math.sin(i) * 1e3 + 1e6 for i in range(1000)]
+        pushed, batched = RunningStats(), RunningStats()
+        for x in data:
+            pushed.push(x)
+        batched.update(data[:123])
+        batched.update(data[123:])
+        self.assertAlmostEqual(pushed.mean, batched.mean, places=6)
+        self.assertAlmostEqual(pushed.variance, batched.variance, delta=1e-6 * pushed.variance)
+
+    def test_t_critical_value(self):
+        self.assertAlmostEqual(t_critical_value(0.95, 7), 2.364624, places=5)
+
+    def test_stops_at_tolerance_or_budget(self):
+        res = estimate_pi(10 ** 7, abs_tol=0.02, seed=1)
+        self.assertTrue(res["converged"])
+        self.assertLessEqual(res["half_width"], 0.02)
+        self.assertLess(res["n"], 10 ** 6)
+        capped = adaptive_mean(lambda m: [float(i % 2) for i in range(m)], abs_tol=1e-9, max_samples=5000)
+        self.assertFalse(capped["converged"])
+        self.assertEqual(capped["n"], 5000)
+
+    def test_adaptive_integrate_modes(self):
+        res = integrate(math.exp, 0, 1, 10 ** 6, rel_tol=2e-3, seed=2)
+        self.assertTrue(res["converged"])
+        self.assertAlmostEqual(res["estimate"], math.e - 1, delta=5 * res["std_error"])
+        f = lambda x: math.prod(1 + (xi - 0.5) / (i + 1) for i, xi in enumerate(x))
+        qmc = integrate(f, [0] * 8, [1] * 8, 10 ** 5, method="sobol", abs_tol=1e-4, seed=1)
+        self.assertTrue(qmc["converged"])
+        self.assertAlmostEqual(qmc["estimate"], 1.0, delta=1e-3)
+
+    def test_adaptive_stratified_and_control_variates(self):
+        strat = stratified_sampling(math.exp, strata=10, samples_per_stratum=10 ** 5, seed=3, abs_tol=1e-3)
+        self.assertTrue(strat["converged"])
+        self.assertEqual(strat["n"] % 10, 0)
+        self.assertAlmostEqual(strat["estimate"], math.e - 1, delta=5 * strat["std_error"])
+        cv = control_variates(math.exp, lambda x: x, 0.5, 10 ** 6, seed=3, rel_tol=5e-4)
+        self.assertTrue(cv["converged"])
+        self.assertLess(cv["n"], 10 ** 5)
+        self.assertAlmostEqual(cv["estimate"], math.e - 1, delta=5 * cv["std_error"])
+        with self.assertRaises(ValueError):
+            stratified_sampling(math.exp, allocation="neyman", abs_tol=1e-3)
+
+    def test_adaptive_mode_rejects_workers(self):
+        # Adaptive mode is sequential in every estimator; asking for workers is an error, not a silent fallback.
+        calls = [
+            lambda: estimate_pi(10 ** 5, workers=2, abs_tol=0.01),
+            lambda: antithetic_variates(math.exp, 10 ** 5, workers=2, abs_tol=0.01),
+            lambda: stratified_sampling(math.exp, workers=2, abs_tol=0.01),
+            lambda: integrate(math.exp, 0, 1, 10 ** 5, workers=2, abs_tol=0.01),
+        ]
+        for call in calls:
+            with self.assertRaises(ValueError):
+                call()
+
+
+class TestControlVariates(unittest.TestCase):
+    def test_control_variates_multiple_controls(self):
+        est, remaining = control_variates(math.exp, lambda x: x, 0.5, 20000, seed=5)
+        self.assertAlmostEqual(est, math.e - 1, delta=0.005)
+        self.assertLess(remaining, 0.02)
+        stats = control_variates(math.exp, [lambda x: x, lambda x: x * x], [0.5, 1 / 3], 20000,
+                                 seed=5, return_stats=True)
+        self.assertAlmostEqual(stats["estimate"], math.e - 1, delta=5 * stats["std_error"])
+        self.assertLess(stats["variance_reduction"], remaining)
+        self.assertAlmostEqual(stats["r_squared"], 1.0 - stats["variance_reduction"])
+        self.assertEqual(len(stats["coefficients"]), 2)
+
+
+def _peak(x):
+    return math.prod(math.exp(-((xi - 0.5) / 0.1) ** 2) for xi in x) / (0.1 * math.sqrt(math.pi)) ** len(x)
+
+
+class TestAdaptiveStratification(unittest.TestCase):
+    def test_latin_hypercube_one_point_per_slice(self):
+        n = 50
+        points = latin_hypercube(n, 3, seed=4)
+        for j in range(3):
+            self.assertEqual(sorted(int(p[j] * n) for p in points), list(range(n)))
+        est, err = integrate(lambda x: x[0] + x[1] * x[2], [0] * 3, [1] * 3, 4000, method="lhs",
+                             seed=1, return_error=True)
+        self.assertAlmostEqual(est, 0.75, delta=5 * err)
+
+    def test_neyman_allocation_beats_equal(self):
+        f = lambda x: math.exp(-((x - 0.9) / 0.02) ** 2)
+        equal = stratified_sampling(f, 20, 200, seed=1, return_stats=True)
+        neyman = stratified_sampling(f, 20, 200, seed=1, return_stats=True, allocation="neyman")
+        exact = math.sqrt(math.pi) * 0.02 * (math.erf(5) + math.erf(45)) / 2
+        self.assertEqual(neyman["n"], 4000)
+        self.assertLess(neyman["std_error"], 0.5 * equal["std_error"])
+        self.assertAlmostEqual(neyman["estimate"], exact, delta=5 * neyman["std_error"])
+
+    def test_vegas_and_miser_on_peaked_integrand(self):
+        res = vegas(_peak, [0] * 4, [1] * 4, n_per_iteration=2000, iterations=6, seed=3)
+        self.assertAlmostEqual(res["estimate"], 1.0, delta=max(5 * res["std_error"], 0.02))
+        _, plain_err = integrate(_peak, [0] * 4, [1] * 4, 12000, seed=3, return_error=True)
+        self.assertLess(res["std_error"], 0.25 * plain_err)
+        m = miser(_peak, [0] * 4, [1] * 4, 12000, seed=3)
+        self.assertAlmostEqual(m["estimate"], 1.0, delta=5 * m["std_error"])
+
+
+class TestRejectionSampling(unittest.TestCase):
+    def test_batched_matches_target(self):
+        rng = random.Random(0)
+        res = rejection_sampling(lambda x: math.exp(-x * x / 2), lambda x: 0.05, lambda: rng.uniform(-10, 10),
+                                 20, 20000, batched=True, seed=1, return_stats=True)
+        samples = res["samples"]
+        self.assertEqual(len(samples), 20000)
+        self.assertAlmostEqual(res["acceptance_rate"], math.sqrt(2 * math.pi) / 20, delta=0.01)
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.0, delta=0.05)
+        self.assertAlmostEqual(sum(x * x for x in samples) / len(samples), 1.0, delta=0.05)
+
+    def test_ars_log_concave_targets(self):
+        res = adaptive_rejection_sampling(lambda x: -x * x / 2, 20000, seed=1, return_stats=True)
+        samples = res["samples"]
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.0, delta=0.05)
+        self.assertAlmostEqual(sum(x * x for x in samples) / len(samples), 1.0, delta=0.05)
+        self.assertGreater(res["acceptance_rate"], 0.99)
+        self.assertLess(res["evaluations"], 500)
+        gamma = adaptive_rejection_sampling(lambda x: 2 * math.log(x) - x, 20000, initial_points=(1, 5),
+                                            domain=(0, math.inf), seed=2)
+        self.assertAlmostEqual(sum(gamma) / len(gamma), 3.0, delta=0.1)
+        self.assertTrue(all(x > 0 for x in gamma))
+
+    def test_ars_rejects_bimodal(self):
+        bimodal = lambda x: math.log(math.exp(-(x - 3) ** 2) + math.exp(-(x + 3) ** 2))
+        with self.assertRaises(ValueError):
+            adaptive_rejection_sampling(bimodal, 100, seed=1)
+
+
+class TestSelfNormalizedImportanceSampling(unittest.TestCase):
+    def test_unnormalized_high_dimensional_target(self):
+        rng = random.Random(1)
+        d = 50
+        log_target = lambda x: -math.fsum(xi * xi for xi in x) / 2 - 2000.0  # exp underflows to 0
+        log_q = lambda x: -math.fsum(xi * xi for xi in x) / 2.88 - d * math.log(1.2 * math.sqrt(2 * math.pi))
+        res = self_normalized_importance_sampling(log_target, log_q, lambda: [rng.gauss(0, 1.2) for _ in range(d)],
+                                                  f=lambda x: x[0] ** 2, n_samples=5000)
+        self.assertAlmostEqual(res["estimate"], 1.0, delta=5 * res["std_error"])
+        self.assertAlmostEqual(res["log_normalizer"], -2000 + d / 2 * math.log(2 * math.pi), delta=0.5)
+        self.assertLess(res["pareto_k"], 0.7)
+        self.assertLess(res["ess"], 5000)
+        mean, err = res["sample"].expectation(lambda x: x[1], return_error=True)
+        self.assertAlmostEqual(mean, 0.0, delta=5 * err)
+
+    def test_mixture_proposal_on_bimodal_target(self):
+        rng = random.Random(2)
+        log_target = lambda x: math.log(math.exp(-(x - 4) ** 2 / 2) + math.exp(-(x + 4) ** 2 / 2))
+        comps = [lambda x, m=m: -(x - m) ** 2 / 2 - 0.5 * math.log(2 * math.pi) for m in (4, -4)]
+        samplers = [lambda m=m: rng.gauss(m, 1) for m in (4, -4)]
+        res = self_normalized_importance_sampling(log_target, comps, samplers, f=lambda x: x * x, n_samples=4000)
+        self.assertAlmostEqual(res["ess_fraction"], 1.0, places=6)
+        self.assertAlmostEqual(res["estimate"], 17.0, delta=5 * res["std_error"])
+
+    def test_pareto_k_flags_heavy_tails(self):
+        rng = random.Random(3)
+        self.assertLess(pareto_k([rng.gauss(0, 0.3) for _ in range(5000)]), 0.5)
+        self.assertGreater(pareto_k([math.log(rng.paretovariate(1.05)) for _ in range(5000)]), 0.7)
+
+
+class TestMultilevelMonteCarlo(unittest.TestCase):
+    def test_gbm_call_matches_black_scholes(self):
+        r, sigma, s0, strike = 0.05, 0.2, 100.0, 100.0
+        levels = euler_maruyama_levels(lambda t, x: r * x, lambda t, x: sigma * x, s0, 1.0,
+                                       lambda path: math.exp(-r) * max(path[-1] - strike, 0.0))
+        res = mlmc(levels, eps=0.1, seed=1)
+        d1 = (math.log(s0 / strike) + r + sigma ** 2 / 2) / sigma
+        cdf = lambda z: 0.5 * math.erfc(-z / math.sqrt(2))
+        exact = s0 * cdf(d1) - strike * math.exp(-r) * cdf(d1 - sigma)
+        self.assertTrue(res["converged"])
+        self.assertAlmostEqual(res["estimate"], exact, delta=3 * 0.1)
+        self.assertEqual(res["cost"], sum(level["cost"] for level in res["levels"]))
+        self.assertLess(res["cost"], res["mc_cost"])
+        # Coupled corrections have far smaller variance than the level-0 payoff.
+        self.assertLess(res["levels"][-1]["variance"], 0.05 * res["levels"][0]["variance"])
+
+    def test_bias_needs_a_correction_level(self):
+        # |E[P_0]| near 0 must not pass for a small bias: level 1 is always sampled.
+        levels = euler_maruyama_levels(lambda t, x: 0.0, lambda t, x: 0.1, 0.0, 1.0, lambda path: path[-1])
+        res = mlmc(levels, eps=0.05, min_levels=0, n_initial=200, seed=2)
+        self.assertTrue(res["converged"])
+        self.assertEqual(len(res["levels"]), 2)
+        with self.assertRaises(ValueError):
+            mlmc(levels, eps=0.05, min_levels=0, max_levels=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,10 @@ Atomic tests for RNGs (LCG, XORShift) and uniformity.
 import unittest
 from talyn.rng.lcg import LCG
 from talyn.rng.xorshift import XORShift32
+from talyn.rng.philox import Philox, philox4x32
+from talyn.rng.pcg import PCG64
+from talyn.rng.xoshiro import Xoshiro256
+from talyn.rng.stats import run_battery
 
 class TestRNGs(unittest.TestCase):
     def test_lcg_uniformity(self):
@@ -18,5 +22,76 @@ class TestRNGs(unittest.TestCase):
         self.assertAlmostEqual(sum(samples)/len(samples), 0.5, delta=0.02)
         self.assertTrue(all(0 <= x < 1 for x in samples))
 
+    def test_block_matches_scalar_stream(self):
+        for cls in (LCG, XORShift32):
+            a, b = cls(seed=789), cls(seed=789)
+            scalar = [a.random() for _ in range(500)]
+            self.assertEqual(list(b.random_block(500)), scalar)
+            self.assertEqual(b.state, a.state)
+            self.assertEqual(b.fill(3)[-1], b.state)
+
+    def test_jump_matches_stepping(self):
+        for cls in (LCG, XORShift32):
+            a, b = cls(seed=2024), cls(seed=2024)
+            for _ in range(1234):
+                a.random()
+            b.jump(1000)
+            b.jump(234)
+            self.assertEqual(b.state, a.state)
+
+    def test_philox_known_answers(self):
+        # Random123 known-answer vectors for Philox4x32-10.
+        self.assertEqual(philox4x32((0, 0, 0, 0), (0, 0)),
+                         (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8))
+        self.assertEqual(philox4x32((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344),
+                                    (0xa4093822, 0x299f31d0)),
+                         (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1))
+
+    def test_philox_streams_are_position_addressable(self):
+        a = Philox(seed=42, stream_id=3)
+        scalar = [a.random() for _ in range(101)]
+        b = Philox(seed=42, stream_id=3)
+        b.seek(7)
+        self.assertEqual(list(b.random_block(94)), scalar[7:])
+        c = Philox(seed=42, stream_id=3)
+        self.assertEqual(list(c.random_block(50)) + list(c.random_block(51)), scalar)
+        other = a.spawn(4)
+        self.assertNotEqual(other.random_block(10).tolist(), scalar[:10])
+        self.assertAlmostEqual(sum(scalar) / len(scalar), 0.5, delta=0.1)
+
+    def test_64bit_generators_known_answers(self):
+        # pcg64 demo (seed 42, stream 54) and xoshiro256** from state {1, 2, 3, 4}.
+        pcg = PCG64(42, 54)
+        self.assertEqual([pcg.next64() for _ in range(3)],
+                         [0x86b1da1d72062b68, 0x1304aa46c9853d39, 0xa3670e9e0dd50358])
+        xo = Xoshiro256(state=[1, 2, 3, 4])
+        self.assertEqual([xo.next64() for _ in range(4)], [11520, 0, 1509978240, 1215971899390074240])
+
+    def test_64bit_generators_blocks_and_jumps(self):
+        for make in (lambda: PCG64(7, 3), lambda: Xoshiro256(7)):
+            a, b = make(), make()
+            scalar = [a.random() for _ in range(300)]
+            self.assertEqual(list(b.random_block(300)), scalar)
+            self.assertTrue(all(0 <= x < 1 for x in scalar))
+        a, b = PCG64(11), PCG64(11)
+        for _ in range(999):
+            a.next64()
+        b.jump(999)
+        self.assertEqual(a.state, b.state)
+        x, y = Xoshiro256(5), Xoshiro256(5)
+        y.jump()
+        self.assertNotEqual(x.fill(4).tolist(), y.fill(4).tolist())
+
+    def test_battery_passes_good_and_flags_randu(self):
+        report = run_battery(PCG64(2024).random, n=200000, block_size=4096)
+        self.assertEqual(report["samples"], 200000)
+        self.assertGreater(report["samples_per_second"], 0)
+        for res in report["results"]:
+            self.assertGreater(res["p_value"], 1e-4, res["name"])
+        # RANDU's triples lie on 15 planes.
+        randu = LCG(seed=1, a=65539, c=0, m=2**31)
+        results = {r["name"]: r["p_value"] for r in run_battery(randu.random, n=200000)["results"]}
+        self.assertLess(results["serial_triples"], 1e-6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,9 +2,19 @@
 Performance and scaling benchmarks for Talyn.
 """
 import unittest
+import random
 import time
 from talyn.monte_carlo.estimate_pi import estimate_pi
-from talyn.simulation.mcmc_convergence import gelman_rubin
+from talyn.simulation.mcmc_convergence import gelman_rubin, split_rhat, ess_bulk, ess_tail
+from talyn.simulation.multichain import run_chains
+from talyn.simulation.autocorrelation import (
+    autocorrelation, integrated_autocorrelation_time, effective_sample_size,
+)
+from talyn.distributions.normal import Normal
+
+def _standard_normal_log_pdf(x):
+    return -0.5 * x * x
+
 
 class TestPerformance(unittest.TestCase):
     def test_monte_carlo_scaling(self):
@@ -19,5 +29,63 @@ class TestPerformance(unittest.TestCase):
         r_hat = gelman_rubin(chains)
         self.assertLess(r_hat, 1.1)
 
+    def test_split_rhat_and_multichain_runner(self):
+        rng = random.Random(5)
+        # A drifting chain passes plain R-hat but not split-R-hat.
+        drifting = [[i / 100 + rng.gauss(0, 1) for i in range(1000)] for _ in range(4)]
+        self.assertLess(gelman_rubin(drifting), 1.01)
+        self.assertGreater(split_rhat(drifting), 1.5)
+        iid = [[rng.gauss(0, 1) for _ in range(1000)] for _ in range(4)]
+        self.assertLess(split_rhat(iid), 1.01)
+        self.assertGreater(ess_bulk(iid), 2500)
+        self.assertGreater(ess_tail(iid), 2500)
+        result = run_chains(_standard_normal_log_pdf, [-5.0, -1.0, 1.0, 5.0], scale=2.4,
+                            burn_in=200, checkpoint=250, workers=2, seed=3)
+        self.assertTrue(result["converged"])
+        self.assertLess(result["iterations"], 100000)
+        self.assertLess(result["rhat"], 1.01)
+        self.assertGreaterEqual(min(result["ess_bulk"], result["ess_tail"]), 400)
+        self.assertAlmostEqual(result["rhat"], split_rhat(result["samples"]))
+        serial = run_chains(_standard_normal_log_pdf, [-5.0, -1.0, 1.0, 5.0], scale=2.4,
+                            burn_in=200, checkpoint=250, workers=1, seed=3)
+        self.assertEqual(serial["samples"], result["samples"])
+
+    def test_fft_autocorrelation_and_iat(self):
+        rng = random.Random(4)
+        data = [rng.gauss(0, 1) for _ in range(200)]
+        n, mean = len(data), sum(data) / len(data)
+        var = sum((x - mean) ** 2 for x in data) / n
+        for lag, value in enumerate(autocorrelation(data)):
+            direct = sum((data[i] - mean) * (data[i + lag] - mean) for i in range(n - lag)) / (n - lag) / var
+            self.assertAlmostEqual(value, direct, places=9)
+        # AR(1) with phi = 0.5 has tau = (1 + phi) / (1 - phi) = 3.
+        chain = [0.0]
+        for _ in range(99999):
+            chain.append(0.5 * chain[-1] + rng.gauss(0, 1))
+        t0 = time.perf_counter()
+        tau = integrated_autocorrelation_time(chain)
+        self.assertLess(time.perf_counter() - t0, 10.0)
+        self.assertAlmostEqual(tau, 3.0, delta=0.3)
+        self.assertAlmostEqual(integrated_autocorrelation_time(chain, method="sokal"), 3.0, delta=0.3)
+        self.assertAlmostEqual(effective_sample_size(chain), len(chain) / tau)
+
+    def test_batched_sampling_beats_scalar_loop(self):
+        dist = Normal(mu=0, sigma=1)
+        n = 200000
+        t0 = time.perf_counter()
+        [dist.sample() for _ in range(n)]
+        t_loop = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        dist.sample_n(n)
+        t_batch = time.perf_counter() - t0
+        self.assertLess(t_batch, t_loop)
+
+    def test_ziggurat_normal_throughput(self):
+        dist = Normal(mu=0, sigma=1, method="ziggurat")
+        t0 = time.time()
+        [dist.sample() for _ in range(100000)]
+        dist.sample_n(100000)
+        self.assertLess(time.time() - t0, 2.0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,22 @@
 """
 Random function contract tests for Talyn.
 """
+import math
+import tempfile
 import unittest
+import random
 from talyn.utils.sampling import weighted_sample
+from talyn.distributions import AliasTable
+from talyn.dirichlet.crp import crp
+from talyn.event_space import EventSpace
+from talyn.decision.mdp import MDP
+from talyn.simulation.paths import brownian_paths, brownian_bridge_paths, random_walk_paths, stream_paths
+from talyn.simulation.sde import simulate_sde, iter_sde, GBM, OrnsteinUhlenbeck, CIR
+from talyn.simulation.markov_chain import (
+    MarkovChain, metropolis_hastings, log_metropolis_hastings, adaptive_metropolis,
+)
+from talyn.simulation.gibbs_sampler import GibbsSampler
+from talyn.simulation.sinks import OnlineMoments, RingBuffer, ColumnarWriter, load_columns
 
 class TestRandomContract(unittest.TestCase):
     def test_weighted_sample_distribution(self):
@@ -18,5 +32,142 @@ class TestRandomContract(unittest.TestCase):
         s2 = [weighted_sample([1,2], [0.5,0.5], seed=2) for _ in range(1000)]
         self.assertNotEqual(s1, s2)
 
+    def test_alias_table_frequencies(self):
+        weights = [5, 0, 1, 3, 1]
+        table = AliasTable(weights, rng_func=random.Random(7).random)
+        samples = table.sample_n(50000)
+        for i, w in enumerate(weights):
+            self.assertAlmostEqual(list(samples).count(i) / 50000, w / 10, delta=0.01)
+        self.assertEqual(table.sample_n(0).tolist(), [])
+        with self.assertRaises(ValueError):
+            AliasTable([1, -1])
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+
+    def test_crp_table_count(self):
+        # Expected number of tables is sum_i alpha / (alpha + i).
+        random.seed(3)
+        alpha, n = 2.0, 200
+        expected = sum(alpha / (alpha + i) for i in range(n))
+        counts = [max(crp(alpha, n)) + 1 for _ in range(300)]
+        self.assertAlmostEqual(sum(counts) / len(counts), expected, delta=0.5)
+
+    def test_event_space_draw(self):
+        space = EventSpace(["a", "b", "c"], {"a": 0.2, "b": 0.5, "c": 0.3}, rng_func=random.Random(7).random)
+        first = space.draw()
+        self.assertIn(first, {"a", "b", "c"})
+        draws = space.draw(size=20000)
+        self.assertEqual(len(draws), 20000)
+        for outcome, p in space.prob_map.items():
+            self.assertAlmostEqual(draws.count(outcome) / len(draws), p, delta=0.015)
+
+    def test_mdp_next_state_reward(self):
+        random.seed(8)
+        mdp = MDP({("s", "go"): [("s", 0.25), ("t", 0.75)], ("t", "go"): [("t", 1.0)]},
+                  {("s", "go", "t"): 1.0})
+        outcomes = [mdp.next_state_reward("s", "go") for _ in range(8000)]
+        self.assertAlmostEqual(sum(s == "t" for s, _ in outcomes) / len(outcomes), 0.75, delta=0.02)
+        self.assertTrue(all(r == (1.0 if s == "t" else 0.0) for s, r in outcomes))
+        self.assertEqual(mdp.next_state_reward("t", "go"), ("t", 0.0))
+        # One alias table per visited (state, action), reused across calls.
+        self.assertEqual(set(mdp._samplers), {("s", "go"), ("t", "go")})
+
+    def test_batched_path_moments(self):
+        ends = [p[-1] for p in brownian_paths(2000, 101, delta=0.1, seed=1)]
+        self.assertAlmostEqual(sum(e * e for e in ends) / len(ends), 10.0, delta=1.0)
+        bridges = brownian_bridge_paths(50, 20, start=1.0, end=2.0, seed=2)
+        self.assertTrue(all(b[0] == 1.0 and abs(b[-1] - 2.0) < 1e-12 for b in bridges))
+        walks = random_walk_paths(2000, 100, p=0.3, seed=3)
+        self.assertTrue(all(len(w) == 101 for w in walks))
+        self.assertAlmostEqual(sum(w[-1] for w in walks) / len(walks), -40.0, delta=1.0)
+        steps = {abs(a - b) for w in random_walk_paths(20, 37, step_size=2.0, seed=4) for a, b in zip(w, w[1:])}
+        self.assertEqual(steps, {2.0})
+
+    def test_streamed_paths_match_batch(self):
+        chunks = list(stream_paths(random_walk_paths, 250, chunk_size=100, seed=5, steps=30))
+        self.assertEqual([len(c) for c in chunks], [100, 100, 50])
+        self.assertEqual([p for c in chunks for p in c], random_walk_paths(250, 30, seed=5))
+
+    def test_gbm_scheme_order(self):
+        # Same seed, same driving noise: compare each scheme against the exact GBM transition.
+        gbm = GBM(0.05, 0.4)
+        run = lambda method: simulate_sde(gbm, 1.0, 1.0, 32, 2000, method, record_steps=[32], seed=1)["values"][0]
+        exact, euler, milstein = run("exact"), run("euler"), run("milstein")
+        self.assertAlmostEqual(sum(exact) / len(exact), 1.0513, delta=0.03)
+        strong = lambda approx: sum(abs(a - b) for a, b in zip(exact, approx)) / len(exact)
+        self.assertLess(strong(milstein), 0.2 * strong(euler))
+
+    def test_ou_exact_moments(self):
+        ou = OrnsteinUhlenbeck(2.0, 1.0, 0.5)
+        slices = list(iter_sde(ou, 0.0, 5.0, 10, 5000, "exact", record_steps=[5, 10], seed=2))
+        self.assertEqual([t for t, _ in slices], [2.5, 5.0])
+        final = slices[-1][1]
+        mean = sum(final) / len(final)
+        self.assertAlmostEqual(mean, 1.0, delta=0.02)
+        self.assertAlmostEqual(sum((x - mean) ** 2 for x in final) / len(final), 0.0625, delta=0.006)
+
+    def test_cir_stays_non_negative(self):
+        cir = simulate_sde(CIR(1.5, 0.04, 0.3), 0.04, 2.0, 100, 2000, "euler", record_steps=[100], seed=3)
+        self.assertTrue(all(x >= 0.0 for x in cir["values"][0]))
+        with self.assertRaises(ValueError):
+            simulate_sde(CIR(1.5, 0.04, 0.3), 0.04, 1.0, 10, 10, "exact")
+
+    def test_chain_thinning_and_bounded_history(self):
+        chain = MarkovChain(0, lambda x: x + 1, thin=3, burn_in=2, keep_last=2)
+        self.assertEqual(chain.sample(12), [5, 8, 11])
+        self.assertEqual(list(chain.history), [8, 11])
+        self.assertEqual(MarkovChain(0, lambda x: x + 1).sample(3), [1, 2, 3])
+
+    def test_gibbs_columns_and_sinks(self):
+        rng = random.Random(6)
+        rho = 0.8
+        sd = math.sqrt(1 - rho ** 2)
+        conditionals = {"x": lambda s: rng.gauss(rho * s["y"], sd), "y": lambda s: rng.gauss(rho * s["x"], sd)}
+        moments, ring = OnlineMoments(), RingBuffer(3)
+        with tempfile.TemporaryDirectory() as directory:
+            with ColumnarWriter(directory, flush_size=100) as writer:
+                gibbs = GibbsSampler({"x": 0.0, "y": 0.0}, conditionals, thin=2, burn_in=50, keep_last=500,
+                                     sinks=[moments, ring, writer])
+                gibbs.run(20050)
+            columns = load_columns(directory)
+        self.assertEqual(moments.n, 10000)
+        self.assertEqual(len(columns["x"]), 10000)
+        self.assertEqual(list(columns["y"][-500:]), list(gibbs.trace("y")))
+        self.assertEqual(len(gibbs.history), 500)
+        self.assertEqual(ring.values()[-1], gibbs.state)
+        self.assertIsNot(ring.values()[-1], gibbs.state)
+        self.assertAlmostEqual(moments.variance()["x"], 1.0, delta=0.1)
+
+    def test_metropolis_variants(self):
+        calls = []
+        def density(x):
+            calls.append(x)
+            return math.exp(-x * x / 2)
+        rng = random.Random(7)
+        res = metropolis_hastings(density, lambda x: x + rng.gauss(0, 1), None, 0.0, 2000, 100,
+                                  symmetric=True, return_stats=True)
+        self.assertEqual(len(calls), 2101)  # one evaluation per iteration plus the start
+        self.assertTrue(0.5 < res["acceptance_rate"] < 0.9)
+        # exp(-5000) underflows in linear space; the log-space sampler is unaffected.
+        res = log_metropolis_hastings(lambda x: -x * x / 2 - 5000, lambda x: x + rng.gauss(0, 2.4), 3.0,
+                                      20000, 500, seed=8, return_stats=True)
+        samples = res["samples"]
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.0, delta=0.1)
+        self.assertAlmostEqual(sum(x * x for x in samples) / len(samples), 1.0, delta=0.15)
+        self.assertEqual(len(res["log_target"]), 20000)
+
+    def test_adaptive_metropolis_tunes_scale(self):
+        scales = [0.1, 1.0, 10.0]
+        log_target = lambda x: -0.5 * sum((xi / s) ** 2 for xi, s in zip(x, scales))
+        res = adaptive_metropolis(log_target, [0.0, 0.0, 0.0], 10000, 5000, seed=9, return_stats=True)
+        self.assertAlmostEqual(res["burn_in_acceptance_rate"], 0.234, delta=0.05)
+        self.assertAlmostEqual(res["acceptance_rate"], 0.234, delta=0.08)
+        # The adapted proposal is shaped like the target: sd ratios agree across axes.
+        ratios = [res["covariance"][j][j] ** 0.5 / s for j, s in enumerate(scales)]
+        self.assertLess(max(ratios) / min(ratios), 2.0)
+        for j, s in enumerate(scales):
+            column = [x[j] for x in res["samples"]]
+            self.assertAlmostEqual(math.sqrt(sum(v * v for v in column) / len(column)), s, delta=0.3 * s)
+
 if __name__ == "__main__":
     unittest.main()